@@ -0,0 +1,301 @@
+import ast
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Set
+import click
+from loguru import logger
+
+from benchmarks.synthetic import SyntheticRepository, SyntheticSourceTree
+from benchmarks.syscalls import count_syscalls
+from src import __version__
+from src.commands.generate_logged_messages_listing import FuncVisitor
+from src.generators.local_module_generator import LocalModuleGenerator
+from src.models.contributor_manager import ContributorManager
+from src.models.local_modules import LocalModule
+from src.models.module_data_provider import ModuleDataProvider
+
+MAIN_FILE = Path(__file__).resolve().parent.parent / "main.py"
+
+# name -> setup(workspace), the setup returns the function to time
+BENCHMARKS: Dict[str, Callable[[Path], Callable[[], None]]] = {}
+# the benchmarks whose filesystem system calls are counted too
+SYSCALL_BENCHMARKS: Set[str] = set()
+
+
+def benchmark(name: str, syscalls: bool = False):
+    """Register a benchmark.
+
+    The decorated function is called once with the workspace directory and returns the function to time, so the
+    preparation is not measured. With syscalls, the system calls of one more run are counted.
+    """
+
+    def register(setup: Callable[[Path], Callable[[], None]]):
+        BENCHMARKS[name] = setup
+        if syscalls:
+            SYSCALL_BENCHMARKS.add(name)
+        return setup
+
+    return register
+
+
+@benchmark("func_visitor")
+def bench_func_visitor(workspace: Path):
+    sources = [file.read_text() for file in sorted(Path(workspace, "src").rglob("*.py"))]
+    trees = [ast.parse(source) for source in sources]
+
+    def run():
+        for source, tree in zip(sources, trees):
+            FuncVisitor("logger", source_code=source).visit(tree)
+
+    return run
+
+
+@benchmark("local_module")
+def bench_local_module(workspace: Path):
+    files = sorted(Path(workspace, "src").rglob("*.py"))
+
+    def run():
+        for file in files:
+            LocalModule.from_path(file)
+
+    return run
+
+
+@benchmark("module_data_provider", syscalls=True)
+def bench_module_data_provider(workspace: Path):
+    provider = ModuleDataProvider()
+
+    return lambda: provider.serialize(Path(workspace, "src"))
+
+
+@benchmark("local_module_generator_deep")
+def bench_local_module_generator_deep(workspace: Path):
+    # thousands of small packages: the rendering is dominated by the cost of each table and of joining the sections
+    SyntheticSourceTree(depth=9, packages=2, modules=1, functions=2).write(workspace / "deep" / "src")
+    generator = LocalModuleGenerator(str(workspace / "deep" / "src"), str(workspace / "docs"), "modules")
+
+    def run():
+        generator._tables.clear()
+        generator._get_content()
+
+    return run
+
+
+@benchmark("contributor_manager")
+def bench_contributor_manager(workspace: Path):
+    # the constructor lists the contributors (ContributorManager._init_contributors)
+    return lambda: ContributorManager(workspace)
+
+
+def _command(*args: str):
+    def run():
+        # the whole command line is timed, the interpreter start up included
+        subprocess.run([sys.executable, str(MAIN_FILE), *args], check=True, capture_output=True, stdin=subprocess.DEVNULL)
+
+    return run
+
+
+@benchmark("cli_startup")
+def bench_cli_startup(workspace: Path):
+    # listing the commands must not import them
+    return _command("--help")
+
+
+@benchmark("cli_generate_logged_messages_listing")
+def bench_cli_generate_logged_messages_listing(workspace: Path):
+    return _command(
+        "generate-logged-messages-listing",
+        "--output_file=LOGGED_MESSAGES.md",
+        "--instance_name=logger",
+        "--source_dir=src",
+        "--url=https://example.com/blob/main",
+        "--no-cache",
+    )
+
+
+@benchmark("cli_generate_local_modules_listing")
+def bench_cli_generate_local_modules_listing(workspace: Path):
+    return _command("generate-local-modules-listing", "--source-dir=src", "--output-dir=docs", "--doc-type=md")
+
+
+@benchmark("cli_generate_mailmap")
+def bench_cli_generate_mailmap(workspace: Path):
+    return _command("generate-mailmap")
+
+
+@contextmanager
+def _chdir(path: Path):
+    previous = Path.cwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def _measure(run: Callable[[], None], repeat: int, syscalls: bool = False):
+    """Time a function, once to warm up then repeat times.
+
+    Returns:
+        dict: the best and median durations in seconds, and the number of system calls of a run if counted
+    """
+    run()
+    durations = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        durations.append(time.perf_counter() - start)
+
+    result = {"best": min(durations), "median": statistics.median(durations), "repeat": repeat}
+
+    if syscalls:
+        with count_syscalls() as counter:
+            run()
+        result["syscalls"] = sum(counter.values())
+        result["syscalls_by_function"] = dict(sorted(counter.items()))
+
+    return result
+
+
+def _compare(results: dict, baseline: dict, threshold: float):
+    """Compare the best durations with a baseline.
+
+    Returns:
+        List[str]: the benchmarks slower than the baseline by more than the threshold
+    """
+    if baseline.get("parameters") != results["parameters"]:
+        logger.warning("The baseline was recorded with other parameters: {}", baseline.get("parameters"))
+
+    regressions = []
+
+    for name, result in results["benchmarks"].items():
+        reference = baseline.get("benchmarks", {}).get(name)
+
+        if reference is None:
+            logger.info("{:<40} {:>10.4f}s (no baseline)", name, result["best"])
+            continue
+
+        ratio = result["best"] / reference["best"]
+        logger.info("{:<40} {:>10.4f}s {:>+8.1%}", name, result["best"], ratio - 1)
+
+        if ratio > 1 + threshold:
+            regressions.append(name)
+
+        if "syscalls" in result and "syscalls" in reference:
+            logger.info("{:<40} {:>10} syscalls (baseline {})", name, result["syscalls"], reference["syscalls"])
+
+            # the count does not depend on the machine, any increase is a regression
+            if result["syscalls"] > reference["syscalls"]:
+                regressions.append(f"{name} (syscalls)")
+
+    return regressions
+
+
+@click.command()
+@click.option("--seed", type=int, default=42, show_default=True, help="Seed of the synthetic inputs.")
+@click.option("--depth", type=click.IntRange(min=0), default=2, show_default=True, help="Levels of sub-packages.")
+@click.option("--packages", type=click.IntRange(min=0), default=3, show_default=True, help="Sub-packages per package.")
+@click.option("--modules", type=click.IntRange(min=0), default=5, show_default=True, help="Modules per package.")
+@click.option("--functions", type=click.IntRange(min=0), default=6, show_default=True, help="Functions per module.")
+@click.option(
+    "--log-density",
+    type=click.FloatRange(min=0, max=1),
+    default=0.3,
+    show_default=True,
+    help="Proportion of statements which are log calls.",
+)
+@click.option("--commits", type=click.IntRange(min=1), default=200, show_default=True, help="Commits in the repo.")
+@click.option("--authors", type=click.IntRange(min=1), default=5, show_default=True, help="Authors of the commits.")
+@click.option("-r", "--repeat", type=click.IntRange(min=1), default=5, show_default=True, help="Timed runs.")
+@click.option(
+    "-b",
+    "--benchmark",
+    "selected",
+    type=click.Choice(sorted(BENCHMARKS)),
+    multiple=True,
+    help="Benchmark to run, all of them by default.",
+)
+@click.option("-o", "--output", type=click.Path(dir_okay=False), help="Save the results, i.e. as a new baseline.")
+@click.option("--baseline", type=click.Path(exists=True, dir_okay=False), help="Results to compare with.")
+@click.option(
+    "--threshold",
+    type=click.FloatRange(min=0),
+    default=0.2,
+    show_default=True,
+    help="Fail when a benchmark is slower than the baseline by more than this ratio.",
+)
+def run_benchmarks(
+    seed: int,
+    depth: int,
+    packages: int,
+    modules: int,
+    functions: int,
+    log_density: float,
+    commits: int,
+    authors: int,
+    repeat: int,
+    selected: tuple,
+    output: str,
+    baseline: str,
+    threshold: float,
+):
+    """Time each component and command on synthetic inputs"""
+    parameters = {
+        "seed": seed,
+        "depth": depth,
+        "packages": packages,
+        "modules": modules,
+        "functions": functions,
+        "log_density": log_density,
+        "commits": commits,
+        "authors": authors,
+    }
+    results = {
+        "version": __version__,
+        "python": platform.python_version(),
+        "parameters": parameters,
+        "benchmarks": {},
+    }
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        workspace = Path(tmp_dir).resolve()
+        SyntheticRepository(seed, commits, authors).write(workspace)
+        files = SyntheticSourceTree(seed, depth, packages, modules, functions, log_density).write(workspace / "src")
+        Path(workspace, "docs").mkdir()
+        logger.info("Generated {} file(s) and {} commit(s) in {}", len(files), commits, workspace)
+
+        with _chdir(workspace):
+            for name in selected or BENCHMARKS:
+                # the components log a lot, this would be timed too
+                logger.disable("src")
+                run = BENCHMARKS[name](workspace)
+                results["benchmarks"][name] = _measure(run, repeat, name in SYSCALL_BENCHMARKS)
+                logger.enable("src")
+                logger.info("{:<40} {:>10.4f}s", name, results["benchmarks"][name]["best"])
+
+                if name in SYSCALL_BENCHMARKS:
+                    logger.info("{:<40} {:>10} syscalls", name, results["benchmarks"][name]["syscalls"])
+
+    if output:
+        Path(output).write_text(json.dumps(results, indent=4))
+        logger.info("Saved the results to {}", output)
+
+    if baseline:
+        regressions = _compare(results, json.loads(Path(baseline).read_text()), threshold)
+
+        if regressions:
+            logger.error("Slower than the baseline by more than {:.0%}: {}", threshold, ", ".join(regressions))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    run_benchmarks()
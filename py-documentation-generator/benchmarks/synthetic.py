@@ -0,0 +1,169 @@
+from datetime import datetime, timezone
+from pathlib import Path
+from random import Random
+from typing import List
+from git import Actor, Repo
+
+LOG_LEVELS = ["debug", "info", "warning", "error", "critical", "exception"]
+WORDS = [
+    "cache",
+    "request",
+    "user",
+    "payment",
+    "invoice",
+    "session",
+    "token",
+    "order",
+    "queue",
+    "worker",
+    "record",
+    "report",
+]
+
+
+class SyntheticSourceTree:
+    """Generate a deterministic package tree, the same seed always gives the same files.
+
+    Usage:
+        tree = SyntheticSourceTree(seed=42, depth=3, packages=2, modules=5, log_density=0.3)
+        modules = tree.write(Path("/tmp/bench/src"))
+    """
+
+    def __init__(
+        self,
+        seed: int = 42,
+        depth: int = 2,
+        packages: int = 3,
+        modules: int = 5,
+        functions: int = 6,
+        log_density: float = 0.3,
+    ):
+        """Constructor
+
+        Args:
+            seed (int): seed of the random generator
+            depth (int): number of levels of sub-packages under the root package
+            packages (int): number of sub-packages in each package
+            modules (int): number of modules in each package, besides __init__.py
+            functions (int): number of functions (or methods) in each module
+            log_density (float): proportion of statements which are log calls
+        """
+        self._seed = seed
+        self._depth = depth
+        self._packages = packages
+        self._modules = modules
+        self._functions = functions
+        self._log_density = log_density
+
+    def _word(self, random: Random) -> str:
+        return random.choice(WORDS)
+
+    def _statement(self, random: Random, index: int) -> str:
+        if random.random() >= self._log_density:
+            return f"value_{index} = {self._word(random)}_{index} * {random.randint(1, 100)}"
+
+        level = random.choice(LOG_LEVELS)
+        style = random.randint(0, 2)
+
+        if style == 0:
+            return f'logger.{level}("Processing {self._word(random)} {index}")'
+        if style == 1:
+            return f'logger.{level}(f"Processing {self._word(random)} {{value_{index}}}")'
+
+        return f'logger.{level}("Processing %s for %s", {self._word(random)}, value)'
+
+    def module_source(self, random: Random) -> str:
+        """Generate the source code of a module.
+
+        Args:
+            random (Random): the random generator
+
+        Returns:
+            str: the source code
+        """
+        lines = ["from loguru import logger", "", ""]
+
+        for function_index in range(self._functions):
+            name = f"{self._word(random)}_{function_index}"
+            if function_index % 3 == 2:
+                lines.extend([f"class {name.title().replace('_', '')}:", "    def run(self, value):"])
+                indent = "        "
+            else:
+                lines.append(f"def {name}(value):")
+                indent = "    "
+
+            for statement_index in range(8):
+                lines.append(f"{indent}{self._statement(random, statement_index)}")
+
+            lines.extend([f"{indent}return value", "", ""])
+
+        return "\n".join(lines)
+
+    def write(self, root: Path) -> List[Path]:
+        """Write the package tree.
+
+        Args:
+            root (Path): the directory of the root package, created if needed
+
+        Returns:
+            List[Path]: the modules written, __init__.py files included
+        """
+        random = Random(self._seed)
+        written = []
+        packages = [(Path(root), 0)]
+
+        while packages:
+            package, level = packages.pop(0)
+            package.mkdir(parents=True, exist_ok=True)
+
+            init_file = package / "__init__.py"
+            init_file.write_text(f'"""{package.name} package"""\n')
+            written.append(init_file)
+
+            for module_index in range(self._modules):
+                module = package / f"{self._word(random)}_{module_index}.py"
+                module.write_text(self.module_source(random))
+                written.append(module)
+
+            if level < self._depth:
+                packages.extend((package / f"package_{index}", level + 1) for index in range(self._packages))
+
+        return written
+
+
+class SyntheticRepository:
+    """Generate a deterministic git repository with commits spread across authors.
+
+    Usage:
+        SyntheticRepository(seed=42, commits=100, authors=5).write(Path("/tmp/bench/repo"))
+    """
+
+    def __init__(self, seed: int = 42, commits: int = 100, authors: int = 5):
+        self._seed = seed
+        self._commits = commits
+        self._authors = authors
+
+    def write(self, root: Path) -> Repo:
+        """Create the repository.
+
+        Args:
+            root (Path): the working tree directory, created if needed
+
+        Returns:
+            Repo: the repository
+        """
+        random = Random(self._seed)
+        Path(root).mkdir(parents=True, exist_ok=True)
+        repo = Repo.init(root)
+        authors = [Actor(f"Author {index}", f"author.{index}@example.com") for index in range(self._authors)]
+        timestamp = int(datetime(2024, 1, 1, tzinfo=timezone.utc).timestamp())
+
+        for index in range(self._commits):
+            author = authors[random.randrange(self._authors)]
+            file_path = Path(root, f"file_{index % 10}.txt")
+            file_path.write_text(f"{self._seed} {index} {random.random()}\n")
+            repo.index.add([str(file_path)])
+            date = f"{timestamp + index * 60} +0000"
+            repo.index.commit(f"Commit {index}", author=author, committer=author, author_date=date, commit_date=date)
+
+        return repo
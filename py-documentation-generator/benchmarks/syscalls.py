@@ -0,0 +1,102 @@
+import os
+from collections import Counter
+from contextlib import contextmanager
+from functools import wraps
+
+# the os functions getting the status of a file or listing a directory, with one system call each
+COUNTED_FUNCTIONS = ["stat", "lstat", "listdir", "scandir"]
+
+
+class _CountedEntry:
+    """os.DirEntry counting the system calls CPython issues on POSIX.
+
+    The type of an entry comes with the listing, except for symbolic links. stat() needs a system call on the first
+    call only, the result is cached by the entry.
+    """
+
+    def __init__(self, entry: os.DirEntry, counter: Counter):
+        self._entry = entry
+        self._counter = counter
+        self._stat_done = False
+
+    def __getattr__(self, name: str):
+        return getattr(self._entry, name)
+
+    def __fspath__(self):
+        return self._entry.path
+
+    def _count_stat(self):
+        if not self._stat_done:
+            self._stat_done = True
+            self._counter["DirEntry.stat"] += 1
+
+    def stat(self, *, follow_symlinks: bool = True):
+        self._count_stat()
+        return self._entry.stat(follow_symlinks=follow_symlinks)
+
+    def is_dir(self, *, follow_symlinks: bool = True):
+        if follow_symlinks and self._entry.is_symlink():
+            self._count_stat()
+        return self._entry.is_dir(follow_symlinks=follow_symlinks)
+
+    def is_file(self, *, follow_symlinks: bool = True):
+        if follow_symlinks and self._entry.is_symlink():
+            self._count_stat()
+        return self._entry.is_file(follow_symlinks=follow_symlinks)
+
+
+class _CountedScandir:
+    """os.scandir iterator returning _CountedEntry, the listing is counted once"""
+
+    def __init__(self, iterator, counter: Counter):
+        self._iterator = iterator
+        self._counter = counter
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return _CountedEntry(next(self._iterator), self._counter)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self._iterator.close()
+
+    def close(self):
+        self._iterator.close()
+
+
+@contextmanager
+def count_syscalls():
+    """Count the system calls getting the status of files and listing directories, by function.
+
+    Python has no portable way to count the actual system calls of a process, the os functions and the os.DirEntry
+    methods are counted instead, as CPython maps them to system calls on POSIX.
+
+    Usage:
+        with count_syscalls() as counter:
+            provider.serialize(root)
+        sum(counter.values())
+    """
+    counter = Counter()
+    originals = {name: getattr(os, name) for name in COUNTED_FUNCTIONS}
+
+    def counted(name, function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            counter[f"os.{name}"] += 1
+            result = function(*args, **kwargs)
+            return _CountedScandir(result, counter) if name == "scandir" else result
+
+        return wrapper
+
+    for name, function in originals.items():
+        setattr(os, name, counted(name, function))
+
+    try:
+        yield counter
+    finally:
+        for name, function in originals.items():
+            setattr(os, name, function)
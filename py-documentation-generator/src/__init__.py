@@ -0,0 +1,4 @@
+__version__ = "0.1.0"
+# format of the caches and indexes written next to the documentation (ParseCache, LogIndex, ModuleManifest), bumped
+# whenever what is stored in them changes (i.e. how the messages are rendered), the files of another format are ignored
+CACHE_FORMAT = 4
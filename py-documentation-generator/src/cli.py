@@ -0,0 +1,101 @@
+import importlib
+from typing import Dict, Tuple
+import click
+
+# command name -> ("module:function", short help); the short help is written here so that listing the commands
+# does not import them, tests/test_cli.py checks it matches the docstring of the command
+COMMANDS: Dict[str, Tuple[str, str]] = {
+    "generate-all": (
+        "src.commands.generate_all:generate_all",
+        "Write the modules and logged messages listings, reading each source file once.",
+    ),
+    "generate-local-modules-listing": (
+        "src.commands.generate_local_modules_listing:generate_local_modules_listing",
+        "Write the listing of the local modules as markdown and JSON.",
+    ),
+    "generate-logged-messages-listing": (
+        "src.commands.generate_logged_messages_listing:generate_logged_messages_listing",
+        "Write the logged messages to a markdown, JSON Lines or CSV file.",
+    ),
+    "generate-mailmap": (
+        "src.commands.generate_mailmap:generate_mailmap",
+        "Write the .mailmap file listing the contributors of the git repository.",
+    ),
+    "query": (
+        "src.commands.query:query",
+        "Print the log calls stored in the database matching the filters, without reading the source files.",
+    ),
+    "watch": (
+        "src.commands.watch:watch",
+        "Regenerate the modules and logged messages listings when source files change.",
+    ),
+}
+
+
+def _truncate(text: str, limit: int) -> str:
+    """Truncate a short help to a width, on a word boundary, the same as Click does for the imported commands.
+
+    Args:
+        text (str): the short help
+        limit (int): the maximum width
+
+    Returns:
+        str: the short help, ending with "..." when it was truncated
+    """
+    if len(text) <= limit:
+        return text
+
+    return text[: max(limit - 3, 0)].rsplit(" ", 1)[0].rstrip(" ,;:.") + "..."
+
+
+class LazyGroup(click.Group):
+    """Group importing the module of a command only when that command is run.
+
+    The commands pull in heavy dependencies (GitPython), `--help` and the other commands do not pay for them.
+
+    Usage:
+        @click.group(cls=LazyGroup, lazy_commands={"name": ("package.module:function", "Short help.")})
+        def main():
+            ...
+    """
+
+    def __init__(self, *args, lazy_commands: Dict[str, Tuple[str, str]] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_commands = lazy_commands or {}
+
+    def list_commands(self, ctx: click.Context):
+        return sorted({*super().list_commands(ctx), *self.lazy_commands})
+
+    def get_command(self, ctx: click.Context, cmd_name: str):
+        if cmd_name not in self.commands and cmd_name in self.lazy_commands:
+            module_name, function_name = self.lazy_commands[cmd_name][0].split(":")
+            self.add_command(getattr(importlib.import_module(module_name), function_name), cmd_name)
+
+        return super().get_command(ctx, cmd_name)
+
+    def format_commands(self, ctx: click.Context, formatter: click.HelpFormatter):
+        """Same as click.Group.format_commands, with the short help of the commands not imported yet."""
+        commands = self.list_commands(ctx)
+
+        if not commands:
+            return
+
+        limit = formatter.width - 6 - max(len(name) for name in commands)
+        rows = []
+
+        for name in commands:
+            if name in self.commands:
+                if self.commands[name].hidden:
+                    continue
+                rows.append((name, self.commands[name].get_short_help_str(limit)))
+            else:
+                rows.append((name, _truncate(self.lazy_commands[name][1], limit)))
+
+        if rows:
+            with formatter.section("Commands"):
+                formatter.write_dl(rows)
+
+
+@click.group(cls=LazyGroup, lazy_commands=COMMANDS)
+def main():
+    """Documentation Generator"""
@@ -0,0 +1,110 @@
+from pathlib import Path
+import sys
+import click
+from loguru import logger
+
+from src.commands.generate_logged_messages_listing import (
+    LOG_LEVEL_NANES,
+    DocumentationGenerator,
+    write_md_sections,
+)
+from src.commands.tracing import trace_options
+from src.generators.local_module_generator import LocalModuleGenerator
+from src.models.source_index import SourceIndex
+from src.models.tracer import tracer
+
+
+@click.command()
+@trace_options
+@click.option(
+    "-s",
+    "--source-dir",
+    default=Path("src"),
+    type=click.Path(exists=True, file_okay=False),
+    show_default=True,
+)
+@click.option(
+    "-o",
+    "--output-dir",
+    default=Path("docs"),
+    type=click.Path(exists=True, file_okay=False),
+    show_default=True,
+)
+@click.option(
+    "-i",
+    "--instance-name",
+    default="logger",
+    show_default=True,
+    help="Comma separated names or attributes of the logging instances.",
+)
+@click.option(
+    "-u",
+    "--url",
+    default="https://github.com/thoroc/py-documentation-generator",
+    show_default=True,
+    help="Url to the hosted repo.",
+)
+@click.option(
+    "-l",
+    "--logged-messages-file",
+    default="LOGGED_MESSAGES.md",
+    show_default=True,
+    help="Name of the logged messages listing, in the output directory.",
+)
+@click.option(
+    "--io-threads",
+    type=click.IntRange(min=0),
+    default=0,
+    show_default=True,
+    help="Number of files read at the same time ahead of the parser, for network filesystems. 0 to not read ahead.",
+)
+@click.option(
+    "-d",
+    "--debug",
+    is_flag=True,
+    help="Enable debug mode. Prints debug messages to the console.",
+)
+def generate_all(
+    source_dir: str,
+    output_dir: str,
+    instance_name: str,
+    url: str,
+    logged_messages_file: str,
+    io_threads: int,
+    debug: bool,
+):
+    """Write the modules and logged messages listings, reading each source file once."""
+    if not debug:
+        # default loguru level is DEBUG
+        logger.remove()
+        logger.add(sys.stderr, level="INFO")
+
+    # each file is dropped from the index once both listings have analysed it
+    source_index = SourceIndex(consumers=2)
+
+    logger.info("Generating the modules listing for {} (recursive)", source_dir)
+
+    modules = LocalModuleGenerator(
+        str(source_dir),
+        str(output_dir),
+        "modules",
+        source_index=source_index,
+        io_threads=io_threads,
+    )
+    modules.to_json()
+    modules.to_markdown()
+
+    logger.info("Generating the logged messages listing for {}", instance_name)
+
+    generator = DocumentationGenerator(str(source_dir), url, source_index=source_index)
+    levels = [level for level in LOG_LEVEL_NANES if generator.has_logged_messages(instance_name, level)]
+    output_path = Path(output_dir, logged_messages_file)
+
+    with tracer.span("write md"), output_path.open("w") as file_buffer:
+        write_md_sections(file_buffer, levels, lambda level: generator.write_md(file_buffer, instance_name, level))
+
+    logger.info("Done writing to {}, {} source file(s) parsed", output_dir, source_index.file_count)
+
+
+if __name__ == "__main__":
+    generate_all()
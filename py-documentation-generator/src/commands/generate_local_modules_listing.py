@@ -1,12 +1,17 @@
+import json
 from pathlib import Path
 import sys
+from typing import Tuple
 import click
 from loguru import logger
 
+from src.commands.tracing import trace_options
 from src.generators.local_module_generator import LocalModuleGenerator
+from src.models.package_selection import PackageSelection
 
 
 @click.command()
+@trace_options
 @click.option(
     "-s",
     "--source-dir",
@@ -23,14 +28,84 @@ from src.generators.local_module_generator import LocalModuleGenerator
     type=click.Path(exists=True),
     show_default=True,
 )
-@click.option("-t", "--doc-type", type=click.Choice(["json", "md"]), default="md")
+@click.option(
+    "-t",
+    "--doc-type",
+    type=click.Choice(["json", "md"]),
+    default="md",
+    help="json only writes the JSON listing, as the modules are analysed unless jobs, I/O threads or --incremental "
+    "are used. md writes both listings.",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=0),
+    default=1,
+    help="Number of processes used to analyse the modules, 0 to use all the CPUs.",
+    show_default=True,
+)
+@click.option(
+    "--io-threads",
+    type=click.IntRange(min=0),
+    default=0,
+    show_default=True,
+    help="Number of files read at the same time ahead of the parser, for network filesystems. 0 to not read ahead.",
+)
+@click.option(
+    "--incremental",
+    is_flag=True,
+    help="Only analyse the modules added or changed since the previous run, recorded in MODULES.manifest.json.",
+)
+@click.option(
+    "--diff",
+    "diff_file",
+    type=click.Path(dir_okay=False, writable=True),
+    help="Write the modules and symbols added, removed and changed since the previous run to this JSON file.",
+)
+@click.option("--compact", is_flag=True, help="Write the JSON listing without indent.")
+@click.option(
+    "--sharded",
+    is_flag=True,
+    help="Write one file per top-level package in MODULES/, only when it changed, and the listing as their index.",
+)
+@click.option(
+    "--include",
+    multiple=True,
+    help="Only list this package and its sub-packages, named from the source directory with dots, i.e. "
+    "models.payments. A glob, * does not cross dots. Can be repeated.",
+)
+@click.option(
+    "--exclude",
+    multiple=True,
+    help="Do not list this package and its sub-packages, even when included. A glob, can be repeated.",
+)
+@click.option(
+    "--max-depth",
+    type=click.IntRange(min=0),
+    help="Do not list the packages more than this number of levels below the source directory.",
+)
 @click.option(
     "-d",
     "--debug",
     is_flag=True,
     help="Enable debug mode. Prints debug messages to the console.",
 )
-def generate_local_modules_listing(source_dir: str, output_dir: str, doc_type: str, debug: bool):
+def generate_local_modules_listing(
+    source_dir: str,
+    output_dir: str,
+    doc_type: str,
+    jobs: int,
+    io_threads: int,
+    incremental: bool,
+    diff_file: str,
+    compact: bool,
+    sharded: bool,
+    include: Tuple[str, ...],
+    exclude: Tuple[str, ...],
+    max_depth: int,
+    debug: bool,
+):
+    """Write the listing of the local modules as markdown and JSON."""
     if not debug:
         # default loguru level is DEBUG
         logger.remove()
@@ -38,9 +113,34 @@ def generate_local_modules_listing(source_dir: str, output_dir: str, doc_type: s
 
     logger.info(f"Generating documentation for {source_dir} (recursive)")
 
-    generator = LocalModuleGenerator(source_dir, output_dir, "modules")
-    generator.to_json()
-    generator.to_markdown()
+    incremental = incremental or bool(diff_file)
+    selection = PackageSelection(include, exclude, max_depth) if include or exclude or max_depth is not None else None
+
+    if doc_type == "json" and jobs == 1 and io_threads == 0 and not incremental and not sharded:
+        LocalModuleGenerator.stream_json(source_dir, output_dir, "modules", compact=compact, selection=selection)
+        return
+
+    generator = LocalModuleGenerator(
+        source_dir,
+        output_dir,
+        "modules",
+        io_threads=io_threads,
+        jobs=jobs,
+        incremental=incremental,
+        selection=selection,
+    )
+
+    if sharded:
+        generator.to_shards(markdown=doc_type == "md", compact=compact)
+    else:
+        generator.to_json(compact=compact)
+
+        if doc_type == "md":
+            generator.to_markdown()
+
+    if diff_file and generator.diff is not None:
+        with Path(diff_file).open("w") as file_buffer:
+            json.dump(generator.diff, file_buffer, indent=4)
 
 
 if __name__ == "__main__":
@@ -1,33 +1,152 @@
 import ast
-import re
+import hashlib
+import io
 import logging
+import mmap
+import os
+import re
+from functools import lru_cache
+from itertools import repeat
 from pathlib import Path
 import sys
-import pandas as pd
-import astor
+from typing import Callable, Dict, FrozenSet, Iterable, List, NamedTuple, TextIO, Tuple, Union
 import click
 from loguru import logger
 
+from src.commands.tracing import trace_options
+from src.generators.markdown_table import MarkdownTableWriter
+from src.generators.record_writers import RECORD_WRITERS
+from src.models.file_prefetcher import FilePrefetcher
+from src.models.log_database import LogDatabase
+from src.models.log_index import LogIndex
+from src.models.message_catalog import MessageCatalog
+from src.models.message_renderer import MessageRenderer
+from src.models.parse_cache import ParseCache
+from src.models.source_index import SourceIndex
+from src.models.tracer import Tracer, tracer
+
 LOG_LEVEL_NANES = [*list(logging._nameToLevel.keys()), "EXCEPTION"]
+CATALOG_FORMAT = "catalog"
+CACHE_FILE = Path(".cache", "py-documentation-generator", "logged_messages.json")
+# files from this size are memory mapped instead of read for the prefilter
+MMAP_THRESHOLD = 1024 * 1024
+
+
+# pattern matching the names and attributes assigned from logging.getLogger(...) in each file
+BOUND_LOGGERS = "getLogger()"
+
+
+@lru_cache(maxsize=None)
+def _instance_patterns(instance_name: str) -> Tuple[FrozenSet[Tuple[str, ...]], bool]:
+    """Split the comma separated instance patterns.
+
+    Args:
+        instance_name (str): i.e. "logger,self.logger,getLogger()"
+
+    Returns:
+        tuple: the receivers as tuples of names (i.e. ("self", "logger")), and whether getLogger() is one of them
+    """
+    patterns = [pattern.strip() for pattern in instance_name.split(",") if pattern.strip()]
+    receivers = frozenset(tuple(pattern.split(".")) for pattern in patterns if pattern != BOUND_LOGGERS)
+
+    return receivers, BOUND_LOGGERS in patterns
+
+
+def _receiver(node: ast.expr) -> Union[Tuple[str, ...], None]:
+    """Get the names of a dotted chain, i.e. ("self", "logger") for `self.logger`; None for any other expression"""
+    names = []
+
+    while isinstance(node, ast.Attribute):
+        names.append(node.attr)
+        node = node.value
+
+    if not isinstance(node, ast.Name):
+        return None
+
+    names.append(node.id)
+
+    return tuple(reversed(names))
+
+
+def _is_get_logger(node: ast.expr) -> bool:
+    """Whether a node is a call of logging.getLogger(...) or getLogger(...)"""
+    if not isinstance(node, ast.Call):
+        return False
+
+    func = node.func
+
+    if isinstance(func, ast.Attribute):
+        return func.attr == "getLogger" and isinstance(func.value, ast.Name) and func.value.id == "logging"
+
+    return isinstance(func, ast.Name) and func.id == "getLogger"
 
 
 class FuncVisitor(ast.NodeVisitor):
     """Analyzes a Python AST tree and look for function calls
 
+    All the log levels and all the instance patterns are collected in a single walk, the results are keyed by level.
+    The instance name is a comma separated list of names and dotted attribute chains (i.e. "logger,self._log"),
+    "getLogger()" also matches whatever a logging.getLogger(...) call is assigned to in the file.
+
+    The messages are rendered from the source code when it is provided, from the AST otherwise.
+
     Usage:
-        tree = ast.parse(...)
-        visitor = FuncVisitor()
+        tree = ast.parse(source_code)
+        visitor = FuncVisitor("logger", source_code=source_code)
         visitor.visit(tree)
+        visitor.stats  # {"INFO": {12: "message"}, ...}
     """
 
     def __init__(
         self,
         instance_name: str,
-        log_level: str = logging._levelToName[logging.INFO],
+        log_levels: List[str] = None,
+        source_code: str = None,
     ):
         self.stats = {}
         self.instance_name = instance_name
-        self.log_level = log_level
+        self.renderer = MessageRenderer(source_code)
+        self.log_levels = LOG_LEVEL_NANES if log_levels is None else log_levels
+        # method name (i.e. "info") -> log level (i.e. "INFO")
+        self._methods = {level.lower(): level for level in self.log_levels if level in LOG_LEVEL_NANES}
+        receivers, self._bound_loggers = _instance_patterns(instance_name)
+        # the loggers bound in the file are added to a copy of the patterns
+        self._receivers = set(receivers)
+        # calls on other receivers, matched at the end of the walk once all the loggers bound in the file are known
+        self._candidates: List[Tuple[Tuple[str, ...], str, ast.Call]] = []
+
+    def visit_Module(self, node: ast.Module):  # pylint: disable=C0103
+        """Called when the visitor visits the whole file, the calls on bound loggers are resolved afterwards"""
+        self.generic_visit(node)
+
+        if not self._candidates:
+            return
+
+        for receiver, log_level, call in self._candidates:
+            if receiver in self._receivers:
+                self._record(log_level, call)
+
+        # keep the source order, the candidates were recorded after the other calls
+        self.stats = {level: dict(sorted(messages.items())) for level, messages in self.stats.items()}
+
+    def visit_Assign(self, node: ast.Assign):  # pylint: disable=C0103
+        """Called when the visitor visits an ast.Assign, to find the loggers bound from getLogger()"""
+        if self._bound_loggers and _is_get_logger(node.value):
+            for target in node.targets:
+                receiver = _receiver(target)
+                if receiver:
+                    self._receivers.add(receiver)
+
+        self.generic_visit(node)
+
+    def visit_AnnAssign(self, node: ast.AnnAssign):  # pylint: disable=C0103
+        """Called when the visitor visits an ast.AnnAssign, to find the loggers bound from getLogger()"""
+        if self._bound_loggers and node.value is not None and _is_get_logger(node.value):
+            receiver = _receiver(node.target)
+            if receiver:
+                self._receivers.add(receiver)
+
+        self.generic_visit(node)
 
     def visit_Call(self, node: ast.Call):  # pylint: disable=C0103
         """Called when the visitor visits an ast.Call
@@ -38,64 +157,222 @@ class FuncVisitor(ast.NodeVisitor):
         Returns:
             None
         """
-        # check for func is an ast.Attribute and value is an ast.Name
-        if isinstance(node.func, ast.Attribute) and isinstance(node.func.value, ast.Name):
-            i_object = node.func.value.id
-            i_method = node.func.attr
-            i_lineno = node.lineno
-
-            # ensuring the node is an instance_name of logger
-            if i_object == self.instance_name:
-                no_quotes_message = ""
-                i_args = []
-                # ensuring the method is valid and is the one we want
-                if self.log_level in LOG_LEVEL_NANES and i_method == self.log_level.lower():
-                    for arg in node.args:
-                        i_args.append(astor.to_source(arg))
-                    ast.NodeVisitor.generic_visit(self, node)
-                    # clean up i_args
-                    joined_message = " ".join(i_args)
-                    no_extra_spaces_message = re.sub(r"\s+", " ", joined_message.strip("\n\t"))
-                    no_leading_f_message = re.sub(r"^f", "", no_extra_spaces_message)
-                    no_quotes_message = re.sub(r"\"+", "", no_leading_f_message)
-
-                    self.stats[i_lineno] = no_quotes_message
+        # ensuring the method is valid and is one we want, before looking at the receiver
+        if not isinstance(node.func, ast.Attribute):
+            return
+
+        log_level = self._methods.get(node.func.attr)
+
+        if not log_level:
+            return
+
+        receiver = _receiver(node.func.value)
+
+        # ensuring the receiver is one of the instance patterns
+        if receiver in self._receivers:
+            ast.NodeVisitor.generic_visit(self, node)
+            self._record(log_level, node)
+        elif receiver and self._bound_loggers:
+            ast.NodeVisitor.generic_visit(self, node)
+            self._candidates.append((receiver, log_level, node))
+
+    def _record(self, log_level: str, node: ast.Call):
+        self.stats.setdefault(log_level, {})[node.lineno] = self.renderer.render(node.args)
+
+
+class ParseResult(NamedTuple):
+    """The outcome of parsing a source file"""
+
+    file: Path
+    stats: Union[dict, None]
+    error: Union[str, None] = None
+    content_hash: Union[str, None] = None
+    skipped: bool = False
+    # trace events recorded while parsing the file, when tracing is enabled
+    events: tuple = ()
+
+
+@lru_cache(maxsize=None)
+def _prefilter_pattern(instance_name: str):
+    """Get the pattern matching any call of a log method on the instances, in the raw bytes of a file.
+
+    Only the last name of the dotted chains is matched, any file assigning getLogger() matches with BOUND_LOGGERS.
+
+    Args:
+        instance_name (str): the instance name to filter the found logged messages
+
+    Returns:
+        re.Pattern: the compiled pattern
+    """
+    receivers, bound_loggers = _instance_patterns(instance_name)
+    methods = b"|".join(re.escape(level.lower().encode()) for level in LOG_LEVEL_NANES)
+    names = b"|".join(sorted({re.escape(receiver[-1].encode()) for receiver in receivers}))
+    # whitespaces, line continuations and a closing parenthesis are allowed around the dot
+    pattern = rb"\b(?:" + names + rb")[\s)\\]*\.[\s\\]*(?:" + methods + rb")\b"
+
+    if bound_loggers:
+        pattern = rb"\bgetLogger\b" if not receivers else pattern + rb"|\bgetLogger\b"
+
+    return re.compile(pattern)
+
+
+def _parse_file(file: Path, instance_name: str, known_hash: str = None, trace: bool = False):
+    """Read and parse a source file, called in the worker processes.
+
+    Files which do not contain any call of a log method on the instance are not parsed.
+
+    Args:
+        file (Path): the source file to parse
+        instance_name (str): the instance name to filter the found logged messages
+        known_hash (str): the content hash of the cached version of the file, the file is not parsed when it matches
+        trace (bool): whether or not to return the trace events of the file with the result
+
+    Returns:
+        ParseResult: the logged messages keyed by level, None when the content matches known_hash
+    """
+    file_tracer = Tracer(enabled=trace)
+
+    with file_tracer.span("file", "file", file=str(file)):
+        result = _read_and_parse_file(file, instance_name, known_hash, file_tracer)
+
+    return result._replace(events=tuple(file_tracer.events)) if trace else result
+
+
+def _read_and_parse_file(file: Path, instance_name: str, known_hash: str, file_tracer: Tracer):
+    """Body of _parse_file, each step is traced with file_tracer"""
+    with file_tracer.span("read"), open(file, "rb") as file_buffer:
+        size = os.fstat(file_buffer.fileno()).st_size
+
+        if size >= MMAP_THRESHOLD:
+            with mmap.mmap(file_buffer.fileno(), 0, access=mmap.ACCESS_READ) as file_content:
+                content_hash = hashlib.sha256(file_content).hexdigest()
+                match = content_hash != known_hash and _prefilter_pattern(instance_name).search(file_content)
+                source_code = file_content[:] if match else None
+        else:
+            source_code = file_buffer.read()
+            content_hash = hashlib.sha256(source_code).hexdigest()
+            match = content_hash != known_hash and _prefilter_pattern(instance_name).search(source_code)
+
+    return _parse_source(file, source_code, content_hash, match, known_hash, instance_name, file_tracer)
+
+
+def _parse_content(file: Path, content: bytes, instance_name: str, known_hash: str = None):
+    """Same as _parse_file, with the content of the file already read, i.e. by a FilePrefetcher.
+
+    Args:
+        file (Path): the source file
+        content (bytes): the content of the file
+        instance_name (str): the instance name to filter the found logged messages
+        known_hash (str): the content hash of the cached version of the file, the file is not parsed if it matches
+
+    Returns:
+        ParseResult: the logged messages keyed by level, None when the content matches known_hash
+    """
+    with tracer.span("file", "file", file=str(file)):
+        content_hash = hashlib.sha256(content).hexdigest()
+        match = content_hash != known_hash and _prefilter_pattern(instance_name).search(content)
+
+        return _parse_source(file, content, content_hash, match, known_hash, instance_name, tracer)
+
+
+def _parse_source(
+    file: Path,
+    source_code: bytes,
+    content_hash: str,
+    match: bool,
+    known_hash: str,
+    instance_name: str,
+    file_tracer: Tracer,
+):
+    """End of _parse_file and _parse_content, once the file is read and checked with the prefilter"""
+    if content_hash == known_hash:
+        return ParseResult(file, None, content_hash=content_hash)
+
+    if not match:
+        return ParseResult(file, {}, content_hash=content_hash, skipped=True)
+
+    try:
+        stats = DocumentationGenerator._parse_logs(source_code.decode("utf-8"), instance_name, file_tracer)
+    except (SyntaxError, ValueError) as exc_info:
+        return ParseResult(file, {}, str(exc_info))
+
+    return ParseResult(file, stats, content_hash=content_hash)
 
 
 class DocumentationGenerator:
     """Generate documentation for logged messages in a project's source code.
 
+    The source tree is parsed once per instance name, the tables for every level are rendered from that result.
+    When an index and a revision are given, only the files changed since that revision are parsed, the others are
+    taken from the index. With I/O threads and a single job, the next files are read while a file is parsed.
+
     Usage:
         instance_name = "logger"
         log_level = "INFO"
-        generator = DocumentationGenerator(source_dir="src", base_url="http://localhost:8000")
-        generator.generate(instance_name, log_level)
+        cache = ParseCache(Path(".cache", "py-documentation-generator", "logged_messages.json"))
+        generator = DocumentationGenerator(source_dir="src", base_url="http://localhost:8000", jobs=4, cache=cache)
+        generator.generate_md(instance_name, log_level)
     """
 
-    def __init__(self, source_dir: str, base_url: str):
+    def __init__(
+        self,
+        source_dir: str,
+        base_url: str,
+        jobs: int = 1,
+        cache: ParseCache = None,
+        index: LogIndex = None,
+        since: str = None,
+        source_index: SourceIndex = None,
+        io_threads: int = 0,
+    ):
         self.source_dir = source_dir
         self.base_url = base_url
         self.local_dir = Path(Path.cwd(), source_dir)
+        self.jobs = jobs if jobs > 0 else os.cpu_count()
+        self.cache = cache
+        self.index = index
+        self.since = since
+        self.source_index = source_index
+        self.io_threads = io_threads
+        self._logged_messages: Dict[str, dict] = {}
+        # the logged messages per file the tables are built from, kept to update them when files change
+        self._file_messages: Dict[str, Dict[Path, dict]] = {}
+        # the stat of the files when they were parsed, recorded in the index
+        self._file_stats: Dict[Path, os.stat_result] = {}
 
-    def _parse_logs(
-        self,
-        source_code: str,
-        instance_name: str,
-        log_level: str = LOG_LEVEL_NANES[0],
-    ):
+    @staticmethod
+    def _parse_logs(source_code: str, instance_name: str, file_tracer: Tracer = tracer):
         """Parse all logged messages in a source code.
 
         Args:
             source_code (str): the source code to search
             instance_name (str): the instance name to filter the found logged messages
-            log_level (str): the level to filter the found logged messages
+            file_tracer (Tracer): the tracer recording the parse and visit phases
 
         Returns:
-            dict: a dictionary of logged messages
+            dict: a dictionary of logged messages keyed by level
         """
-        tree = ast.parse(source_code)
-        visitor = FuncVisitor(instance_name, log_level)
-        visitor.visit(tree)
+        with file_tracer.span("ast.parse"):
+            tree = ast.parse(source_code)
+
+        return DocumentationGenerator._visit_logs(tree, source_code, instance_name, file_tracer)
+
+    @staticmethod
+    def _visit_logs(tree: ast.Module, source_code: str, instance_name: str, file_tracer: Tracer = tracer):
+        """Find all logged messages in a parsed source code.
+
+        Args:
+            tree (ast.Module): the parsed source code
+            source_code (str): the source code, to render the messages from
+            instance_name (str): the instance name to filter the found logged messages
+            file_tracer (Tracer): the tracer recording the visit
+
+        Returns:
+            dict: a dictionary of logged messages keyed by level
+        """
+        with file_tracer.span("visit"):
+            visitor = FuncVisitor(instance_name, source_code=source_code)
+            visitor.visit(tree)
 
         return visitor.stats
 
@@ -111,29 +388,342 @@ class DocumentationGenerator:
         relative_path = path.parent.relative_to(self.local_dir)
         return str(relative_path) if str(relative_path) != "." else "root"
 
-    def _extract_logged_message(self, instance_name: str, log_level: str):
+    def _extract_logged_message(self, instance_name: str):
         """Extract all logged messages from the project's source files.
 
+        Each file is read and parsed only once, whatever the number of levels.
+
         Args:
           instance_name (str): the instance name to filter the found logged messages
-          log_level (str): the level to filter the found logged messages
 
         Returns:
-          dict: object with key:value pairs of logged messages
+          dict: object with key:value pairs of logged messages per file, keyed by level
         """
-        logged_messages = {}
+        logger.info("Processing instance: {}", instance_name)
+
+        files = self._get_indexed_files(instance_name) if self.since else None
+
+        if files is None:
+            files = dict(self._parse_files(instance_name))
+
+        if self.index:
+            self.index.set(instance_name, files, self._file_stats)
+
+        files = {file: log_content for file, log_content in files.items() if log_content}
+        self._file_messages[instance_name] = files
+
+        return self._by_level(files)
+
+    @staticmethod
+    def _by_level(files: Dict[Path, dict]):
+        """Pivot the logged messages per file into logged messages per level.
 
-        logger.info("Processing level: {}", log_level)
+        Args:
+          files (Dict[Path, dict]): the logged messages keyed by level, for each file
+
+        Returns:
+          dict: object with key:value pairs of logged messages per file, keyed by level
+        """
+        logged_messages = {}
 
-        for file in self.local_dir.rglob("*.py"):
-            with open(file, "r") as file_buffer:
-                file_content = file_buffer.read()
-                log_content = self._parse_logs(file_content, instance_name, log_level)
-                if log_content:
-                    logged_messages[file] = log_content
+        for file, log_content in files.items():
+            for log_level, messages in log_content.items():
+                logged_messages.setdefault(log_level, {})[file] = messages
 
         return logged_messages
 
+    def update_files(self, instance_name: str, modified: List[Path], deleted: List[Path]):
+        """Parse the changed files again, the logged messages of the other files are kept from the previous parse.
+
+        Args:
+          instance_name (str): the instance name to filter the found logged messages
+          modified (List[Path]): the added and modified files, as absolute paths
+          deleted (List[Path]): the deleted files, as absolute paths
+
+        Returns:
+          Set[str]: the levels whose tables changed
+        """
+        if instance_name not in self._logged_messages:
+            self._logged_messages[instance_name] = self._extract_logged_message(instance_name)
+            return set(self._logged_messages[instance_name])
+
+        files = self._file_messages[instance_name]
+        # the changes are resolved paths, the files are relative to the source directory as given
+        local_dir = self.local_dir.resolve()
+        modified = [Path(self.local_dir, file.relative_to(local_dir)) for file in modified]
+        deleted = [Path(self.local_dir, file.relative_to(local_dir)) for file in deleted]
+        levels = set()
+
+        for file in [*deleted, *modified]:
+            levels.update(files.pop(file, {}))
+            self._file_stats.pop(file, None)
+
+        for file, log_content in self._parse_files(instance_name, [file for file in modified if file.is_file()]):
+            if log_content:
+                files[file] = log_content
+                levels.update(log_content)
+
+        files = dict(sorted(files.items()))
+
+        if self.index:
+            self.index.set(instance_name, files, self._file_stats)
+
+        self._file_messages[instance_name] = files
+        self._logged_messages[instance_name] = self._by_level(files)
+
+        return levels
+
+    def iter_records(self, instance_name: str):
+        """Generate one record per log call, as the source files are parsed.
+
+        Nothing is kept in memory once a file is processed, the index is not updated.
+
+        Args:
+          instance_name (str): the instance name to filter the found logged messages
+
+        Yields:
+          dict: file, path, line, level, instance and message of a log call
+        """
+        logger.info("Processing instance: {}", instance_name)
+
+        for file, log_content in self._parse_files(instance_name):
+            yield from self._file_records(file, log_content, instance_name)
+
+    def records(self, instance_name: str):
+        """Generate one record per log call, from the logged messages the tables are built from.
+
+        The source tree is only parsed if no table was generated for the instance name yet.
+
+        Args:
+          instance_name (str): the instance name to filter the found logged messages
+
+        Yields:
+          dict: file, path, line, level, instance and message of a log call
+        """
+        if instance_name not in self._logged_messages:
+            self._logged_messages[instance_name] = self._extract_logged_message(instance_name)
+
+        for file, log_content in self._file_messages[instance_name].items():
+            yield from self._file_records(file, log_content, instance_name)
+
+    def _file_records(self, file: Path, log_content: dict, instance_name: str):
+        """Generate the records of a file, sorted by line.
+
+        Args:
+          file (Path): the source file
+          log_content (dict): the logged messages of the file keyed by level
+          instance_name (str): the instance name the messages were filtered with
+
+        Yields:
+          dict: file, path, line, level, instance and message of a log call
+        """
+        calls = sorted(
+            (lineno, log_level, message)
+            for log_level, messages in log_content.items()
+            for lineno, message in messages.items()
+        )
+        path = file.relative_to(self.local_dir).as_posix()
+
+        for lineno, log_level, message in calls:
+            yield {
+                "file": file.name,
+                "path": path,
+                "line": lineno,
+                "level": log_level,
+                "instance": instance_name,
+                "message": message,
+            }
+
+    def _get_indexed_files(self, instance_name: str):
+        """Get the logged messages per file from the index, parsing only the files changed since the revision.
+
+        The indexed files whose stat changed since they were parsed are parsed again as well: a file edited then
+        restored to the revision is no longer reported by git.
+
+        Args:
+          instance_name (str): the instance name to filter the found logged messages
+
+        Returns:
+          dict|None: the logged messages keyed by level for each file, empty for the files without any, sorted by
+            file; None without a usable index
+        """
+        files = self.index.get(instance_name) if self.index else None
+
+        if files is None:
+            logger.warning("No index of the logged messages found, parsing all the files")
+            return None
+
+        # GitPython is only needed with --since
+        from src.models.source_changes import SourceChanges  # pylint: disable=import-outside-toplevel
+
+        with tracer.span("git diff"):
+            changes = SourceChanges.from_git(self.local_dir, self.since)
+        # git reports resolved paths, the index is relative to the source directory as given
+        local_dir = self.local_dir.resolve()
+        modified = {Path(self.local_dir, file.relative_to(local_dir)) for file in changes.modified}
+        deleted = [Path(self.local_dir, file.relative_to(local_dir)) for file in changes.deleted]
+        modified.update(self.index.changed(instance_name))
+
+        logger.info("Parsing {} file(s) changed since {} or since they were indexed", len(modified), self.since)
+
+        for file in [*deleted, *modified]:
+            files.pop(file, None)
+
+        for file, log_content in self._parse_files(instance_name, [file for file in modified if file.is_file()]):
+            files[file] = log_content
+
+        return dict(sorted(files.items()))
+
+    def _parse_files(self, instance_name: str, files: List[Path] = None):
+        """Parse the project's source files, spread across a process pool when more than one job is requested.
+
+        The files are sorted and the results are yielded in that order whatever the number of jobs. Files unchanged
+        since they were cached are neither read nor parsed.
+
+        Args:
+          instance_name (str): the instance name to filter the found logged messages
+          files (List[Path]): the files to parse, all the source files by default
+
+        Yields:
+          tuple: the file and its logged messages keyed by level
+        """
+        with tracer.span("walk"):
+            files = sorted(self.local_dir.rglob("*.py") if files is None else files)
+            file_stats = {file: file.stat() for file in files}
+
+        self._file_stats.update(file_stats)
+
+        cached = {}
+
+        if self.cache:
+            with tracer.span("cache lookup"):
+                for file in files:
+                    stats = self.cache.get(instance_name, file, file_stats[file])
+                    if stats is not None:
+                        cached[file] = stats
+
+            logger.debug("{} of {} files served from the cache", len(cached), len(files))
+
+        pending = [file for file in files if file not in cached]
+        known_hashes = [self.cache.get_hash(instance_name, file) if self.cache else None for file in pending]
+        results = self._map(pending, instance_name, known_hashes)
+        skipped = 0
+
+        for file in files:
+            if file in cached:
+                yield file, cached[file]
+                continue
+
+            result = next(results)
+            skipped += result.skipped
+            tracer.extend(result.events)
+
+            if result.error:
+                logger.error("Unable to parse {}: {}", file, result.error)
+                continue
+
+            if not self.cache:
+                yield file, result.stats
+            elif result.stats is None:
+                yield file, self.cache.refresh(instance_name, file, file_stats[file])
+            else:
+                self.cache.put(instance_name, file, file_stats[file], result.content_hash, result.stats)
+                yield file, result.stats
+
+        logger.debug("{} of {} files skipped without a call to {}", skipped, len(pending), instance_name)
+
+        if self.cache:
+            with tracer.span("cache save"):
+                self.cache.save()
+
+    def _map(self, files: List[Path], instance_name: str, known_hashes: List[Union[str, None]]):
+        """Run _parse_file on the files, in a process pool when more than one job is requested.
+
+        With a source index, the trees are taken from the index instead, in this process. With I/O threads and a single
+        job, the files are read ahead in a thread pool and parsed in this process.
+
+        Args:
+          files (List[Path]): the files to parse
+          instance_name (str): the instance name to filter the found logged messages
+          known_hashes (List[str|None]): the content hash of the cached version of each file
+
+        Yields:
+          ParseResult: the results, in the same order as the files
+        """
+        if self.source_index is not None:
+            yield from map(self._parse_indexed_file, files, repeat(instance_name), known_hashes)
+        elif self.jobs > 1 and len(files) > 1:
+            # multiprocessing is only needed with several jobs
+            from concurrent.futures import ProcessPoolExecutor  # pylint: disable=import-outside-toplevel
+
+            logger.debug("Parsing {} files with {} jobs", len(files), self.jobs)
+            chunksize = max(1, len(files) // (self.jobs * 4))
+
+            with ProcessPoolExecutor(max_workers=self.jobs) as executor:
+                yield from executor.map(
+                    _parse_file,
+                    files,
+                    repeat(instance_name),
+                    known_hashes,
+                    repeat(tracer.enabled),
+                    chunksize=chunksize,
+                )
+        elif self.io_threads > 0:
+            reads = FilePrefetcher(self.io_threads).read(files)
+
+            for (file, content), known_hash in zip(reads, known_hashes):
+                yield _parse_content(file, content, instance_name, known_hash)
+        else:
+            yield from map(_parse_file, files, repeat(instance_name), known_hashes, repeat(tracer.enabled))
+
+    def _parse_indexed_file(self, file: Path, instance_name: str, known_hash: str = None):
+        """Same as _parse_file, with the file read and parsed by the source index, and released once parsed.
+
+        The prefilter runs on the content, a file which does not match is not parsed unless another extractor needs
+        its tree.
+
+        Args:
+            file (Path): the source file to parse
+            instance_name (str): the instance name to filter the found logged messages
+            known_hash (str): the content hash of the cached version of the file
+
+        Returns:
+            ParseResult: the logged messages keyed by level, None when the content matches known_hash
+        """
+        try:
+            content, content_hash = self.source_index.read(file)
+
+            if content_hash == known_hash:
+                return ParseResult(file, None, content_hash=content_hash)
+
+            if not _prefilter_pattern(instance_name).search(content):
+                return ParseResult(file, {}, content_hash=content_hash, skipped=True)
+
+            source = self.source_index.get(file)
+        except (SyntaxError, ValueError) as exc_info:
+            return ParseResult(file, {}, str(exc_info))
+        finally:
+            self.source_index.release(file)
+
+        stats = self._visit_logs(source.tree, source.source_code, instance_name)
+
+        return ParseResult(file, stats, content_hash=content_hash)
+
+    def _get_logged_messages(self, instance_name: str, log_level: str):
+        """Get the logged messages for a level, the source tree is only parsed on the first call.
+
+        Args:
+          instance_name (str): the instance name to filter the found logged messages
+          log_level (str): the level to filter the found logged messages
+
+        Returns:
+          dict: object with key:value pairs of logged messages per file
+        """
+        if instance_name not in self._logged_messages:
+            self._logged_messages[instance_name] = self._extract_logged_message(instance_name)
+
+        return self._logged_messages[instance_name].get(log_level, {})
+
     def _generate_link(self, text: str, file_path: str, file: Path, lineno: int):
         """Generate link to a source file.
 
@@ -150,37 +740,77 @@ class DocumentationGenerator:
         url = f"{self.base_url}/{str(self.source_dir)}{parent_dir}/{file.name}#lines-{lineno}"
         return f"[{text}]({url})"
 
-    def generate_md(self, instance_name: str, log_level: str):
-        """Get the content of the markdown table.
+    def has_logged_messages(self, instance_name: str, log_level: str):
+        """Check if any message is logged at a level.
 
         Args:
           instance_name (str): the instance name to filter the found logged messages
           log_level (str): the level to filter the found logged messages
 
         Returns:
-          str: markdown table content
+          bool: whether or not a table would be generated
         """
+        return bool(self._get_logged_messages(instance_name, log_level))
+
+    def _rows(self, logged_messages: dict):
+        """Generate the rows of the markdown table.
+
+        Args:
+          logged_messages (dict): object with key:value pairs of logged messages per file
+
+        Yields:
+          list: file, path, link to the line and message
+        """
+        for file, messages in logged_messages.items():
+            file_path = self._get_relative_path(file)
+            for lineno, message in messages.items():
+                lineno_link = self._generate_link(lineno, file_path, file, lineno)
+                yield [file.name, file_path, lineno_link, f"`{message}`"]
+
+    def write_md(self, file_buffer: TextIO, instance_name: str, log_level: str):
+        """Write the markdown table straight to a file.
+
+        Args:
+          file_buffer (TextIO): the file to write to
+          instance_name (str): the instance name to filter the found logged messages
+          log_level (str): the level to filter the found logged messages
 
-        logged_messages = self._extract_logged_message(instance_name, log_level)
-        data = []
+        Returns:
+          bool: whether or not a table was written
+        """
+        logged_messages = self._get_logged_messages(instance_name, log_level)
 
         logger.info("Generating markdown table for {}", instance_name)
 
-        if logged_messages:
-            for file, messages in logged_messages.items():
-                for lineno, message in messages.items():
-                    file_path = self._get_relative_path(file)
-                    lineno_link = self._generate_link(lineno, file_path, file, lineno)
-                    data.append([file.name, file_path, lineno_link, f"`{message}`"])
+        if not logged_messages:
+            return False
+
+        writer = MarkdownTableWriter(["file", "path", "lineno", "message"])
+        with tracer.span("render", level=log_level):
+            writer.write(file_buffer, lambda: self._rows(logged_messages))
+
+        return True
+
+    def generate_md(self, instance_name: str, log_level: str):
+        """Get the content of the markdown table.
+
+        Args:
+          instance_name (str): the instance name to filter the found logged messages
+          log_level (str): the level to filter the found logged messages
 
-            dataframe = pd.DataFrame(data, columns=["file", "path", "lineno", "message"])  # pylint: disable=C0103
+        Returns:
+          str: markdown table content
+        """
+        file_buffer = io.StringIO()
 
-            return dataframe.to_markdown(index=False)
+        if self.write_md(file_buffer, instance_name, log_level):
+            return file_buffer.getvalue()
 
         return False
 
 
 @click.command()
+@trace_options
 @click.option(
     "-o",
     "--output_file",
@@ -196,6 +826,7 @@ class DocumentationGenerator:
     prompt="Please enter the name of the logging instance_name in your code.",
     default="logger",
     show_default=True,
+    help='Comma separated names or attributes of the logging instances, i.e. "logger,self.log,getLogger()".',
 )
 @click.option(
     "-d",
@@ -213,6 +844,49 @@ class DocumentationGenerator:
     default="https://github.com/thoroc/py-documentation-generator",
     show_default=True,
 )
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=0),
+    default=1,
+    help="Number of processes used to parse the source files, 0 to use all the CPUs.",
+    show_default=True,
+)
+@click.option(
+    "--io-threads",
+    type=click.IntRange(min=0),
+    default=0,
+    show_default=True,
+    help="Number of files read at the same time ahead of the parser, for network filesystems. 0 to not read ahead.",
+)
+@click.option(
+    "--since",
+    type=str,
+    default=None,
+    help="Only parse the files changed since this git revision, the others are taken from the index of the last run.",
+)
+@click.option(
+    "-f",
+    "--format",
+    "output_format",
+    type=click.Choice(["md", CATALOG_FORMAT, *RECORD_WRITERS]),
+    default="md",
+    help="Markdown tables per level, a markdown table of the unique message templates, or one JSON Lines/CSV record "
+    "per log call. Use - as output file for stdout.",
+    show_default=True,
+)
+@click.option(
+    "--database",
+    "database_file",
+    type=click.Path(dir_okay=False),
+    default=None,
+    help="Also store the log calls in this SQLite database, i.e. docs/LOGGED_MESSAGES.db, for the query command.",
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Parse every source file, without reading or updating the cache.",
+)
 @click.option(
     "-d",
     "--debug",
@@ -224,15 +898,27 @@ def generate_logged_messages_listing(
     instance_name: str,
     source_dir: str,
     url: str,
+    jobs: int,
+    io_threads: int,
+    since: str,
+    output_format: str,
+    database_file: str,
+    no_cache: bool,
     debug: bool,
 ):
-    """Write the logged messages to a markdown file.
+    """Write the logged messages to a markdown, JSON Lines or CSV file.
 
     Args:
-      output_file (str): the name of the markdown file to write to
+      output_file (str): the name of the file to write to, in the docs directory; - for stdout
       instance_name (str): the instance name to filter the found logged messages
       source_dir (str): the source code directory
       url (str): the url to the bitbucket repository
+      jobs (int): the number of processes used to parse the source files
+      io_threads (int): the number of files read ahead of the parser, with a single job
+      since (str): the git revision to compare the working tree with to find the files to parse
+      output_format (str): md, catalog, jsonl or csv
+      database_file (str): the SQLite database to store the log calls in, if any
+      no_cache (bool): whether or not to bypass the cache of the parsed files
 
     Returns:
       None
@@ -242,24 +928,122 @@ def generate_logged_messages_listing(
         logger.remove()
         logger.add(sys.stderr, level="INFO")
 
-    generator = DocumentationGenerator(source_dir, url)
+    if since and output_format != "md":
+        raise click.BadOptionUsage("since", "--since is only supported with the md format.")
+
+    cache = None if no_cache else ParseCache(Path(Path.cwd(), CACHE_FILE))
 
-    output_path = Path(Path.cwd(), "docs", output_file)
+    if output_file == "-":
+        index = None
+        output_path = None
+    else:
+        output_path = Path(Path.cwd(), "docs", output_file)
+        index = LogIndex(output_path.with_name(f"{output_path.stem}.index.json"), Path(Path.cwd(), source_dir))
 
-    with output_path.open("w") as file_buffer:
-        file_buffer.write("# Logs\n\n")
+    generator = DocumentationGenerator(
+        source_dir,
+        url,
+        jobs,
+        cache,
+        index if output_format == "md" else None,
+        since,
+        io_threads=io_threads,
+    )
+    database = LogDatabase(Path(Path.cwd(), database_file)) if database_file else None
 
-        for level in LOG_LEVEL_NANES:
-            table = generator.generate_md(instance_name, level)
-            if table:
-                logger.info("Writing level: {}", level)
-                file_buffer.write(f"## {level}\n\n")
-                file_buffer.write(table)
-                if level != LOG_LEVEL_NANES[-1]:
-                    file_buffer.write("\n\n")
+    if output_path is None:
+        _write_output(sys.stdout, generator, instance_name, output_format, database)
+    else:
+        with output_path.open("w", newline="" if output_format == "csv" else None) as file_buffer:
+            _write_output(file_buffer, generator, instance_name, output_format, database)
 
         logger.info("Done writing to file: {}", output_path)
 
+    if database and output_format == "md":
+        with tracer.span("database"):
+            count = database.write(instance_name, generator.records(instance_name))
+        logger.info("Stored {} log calls in {}", count, database.database_file)
+
+    if generator.index:
+        with tracer.span("index save"):
+            generator.index.save()
+
+
+def _write_output(
+    file_buffer: TextIO,
+    generator: DocumentationGenerator,
+    instance_name: str,
+    output_format: str,
+    database: LogDatabase = None,
+):
+    """Write the logged messages in the requested format.
+
+    Args:
+      file_buffer (TextIO): the file to write to
+      generator (DocumentationGenerator): the generator of the logged messages
+      instance_name (str): the instance name to filter the found logged messages
+      output_format (str): md, catalog, jsonl or csv
+      database (LogDatabase): the database the records are also stored in, as they are written
+    """
+    if output_format == CATALOG_FORMAT or output_format in RECORD_WRITERS:
+        records = generator.iter_records(instance_name)
+
+        if database:
+            records = database.store(instance_name, records)
+
+        if output_format == CATALOG_FORMAT:
+            write_catalog(file_buffer, records)
+            return
+
+        with tracer.span("write records"):
+            count = RECORD_WRITERS[output_format](file_buffer).write(records)
+        logger.info("Written {} records", count)
+        return
+
+    levels = [level for level in LOG_LEVEL_NANES if generator.has_logged_messages(instance_name, level)]
+    write_md_sections(file_buffer, levels, lambda level: generator.write_md(file_buffer, instance_name, level))
+
+
+def write_catalog(file_buffer: TextIO, records: Iterable[Dict[str, Union[str, int]]]):
+    """Write the markdown table of the unique message templates, one row per template.
+
+    Args:
+      file_buffer (TextIO): the file to write to
+      records (Iterable[Dict[str, Union[str, int]]]): the log calls, with the RECORD_FIELDS keys
+    """
+    catalog = MessageCatalog()
+
+    with tracer.span("catalog"):
+        count = catalog.add_records(records)
+
+    logger.info("Found {} unique message templates in {} log calls", catalog.template_count, count)
+    file_buffer.write("# Message templates\n\n")
+
+    if not catalog.template_count:
+        return
+
+    with tracer.span("render"):
+        rows = list(catalog.rows(LOG_LEVEL_NANES))
+        MarkdownTableWriter(["template", "count", "levels", "locations"]).write(file_buffer, lambda: rows)
+
+
+def write_md_sections(file_buffer: TextIO, levels: List[str], write_table: Callable[[str], None]):
+    """Write the markdown document, one section per level.
+
+    Args:
+      file_buffer (TextIO): the file to write to
+      levels (List[str]): the levels with logged messages, in the order of LOG_LEVEL_NANES
+      write_table (Callable[[str], None]): writes the table of a level to file_buffer
+    """
+    file_buffer.write("# Logs\n\n")
+
+    for level in levels:
+        logger.info("Writing level: {}", level)
+        file_buffer.write(f"## {level}\n\n")
+        write_table(level)
+        if level != LOG_LEVEL_NANES[-1]:
+            file_buffer.write("\n\n")
+
 
 if __name__ == "__main__":
     generate_logged_messages_listing()
@@ -4,10 +4,12 @@ from pathlib import Path
 import click
 from loguru import logger
 
+from src.commands.tracing import trace_options
 from src.models.contributor_manager import ContributorManager
 
 
 @click.command()
+@trace_options
 @click.option(
     "-e",
     "--exclude",
@@ -22,6 +24,7 @@ from src.models.contributor_manager import ContributorManager
     help="Enable debug mode. Prints debug messages to the console.",
 )
 def generate_mailmap(exclude: tuple, debug: bool):
+    """Write the .mailmap file listing the contributors of the git repository."""
     if not debug:
         # default loguru level is DEBUG
         logger.remove()
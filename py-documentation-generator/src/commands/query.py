@@ -0,0 +1,83 @@
+from pathlib import Path
+import sys
+import time
+import click
+from loguru import logger
+
+from src.generators.markdown_table import MarkdownTableWriter
+from src.generators.record_writers import RECORD_FIELDS, RECORD_WRITERS
+from src.models.log_database import LogDatabase
+
+
+@click.command()
+@click.option(
+    "--database",
+    "database_file",
+    default=Path("docs", "LOGGED_MESSAGES.db"),
+    type=click.Path(exists=True, dir_okay=False),
+    show_default=True,
+    help="Database written by generate-logged-messages-listing --database.",
+)
+@click.option("-l", "--level", "levels", multiple=True, help="Level of the calls, can be repeated.")
+@click.option(
+    "-p",
+    "--path",
+    default=None,
+    help='Prefix of the path relative to the source directory, i.e. "payments/".',
+)
+@click.option(
+    "-m",
+    "--message",
+    default=None,
+    help='Glob pattern matching the whole message, case sensitive, i.e. "*timeout*".',
+)
+@click.option("-i", "--instance-name", default=None, help="Instance name the log calls were listed with.")
+@click.option("-n", "--limit", type=click.IntRange(min=1), default=None, help="Maximum number of log calls.")
+@click.option(
+    "-f",
+    "--format",
+    "output_format",
+    type=click.Choice(["md", *RECORD_WRITERS]),
+    default="md",
+    help="Markdown table, or one JSON Lines/CSV record per log call.",
+    show_default=True,
+)
+@click.option(
+    "-d",
+    "--debug",
+    is_flag=True,
+    help="Enable debug mode. Prints debug messages to the console.",
+)
+def query(
+    database_file: str,
+    levels: tuple,
+    path: str,
+    message: str,
+    instance_name: str,
+    limit: int,
+    output_format: str,
+    debug: bool,
+):
+    """Print the log calls stored in the database matching the filters, without reading the source files."""
+    if not debug:
+        # default loguru level is DEBUG
+        logger.remove()
+        logger.add(sys.stderr, level="INFO")
+
+    start = time.perf_counter()
+    database = LogDatabase(Path(database_file))
+    records = database.query([level.upper() for level in levels], path, message, instance_name, limit)
+    logger.debug("Found {} log calls in {:.1f} ms", len(records), (time.perf_counter() - start) * 1000)
+
+    if output_format in RECORD_WRITERS:
+        RECORD_WRITERS[output_format](sys.stdout).write(records)
+    elif records:
+        writer = MarkdownTableWriter(RECORD_FIELDS)
+        writer.write(sys.stdout, lambda: ([str(record[field]) for field in RECORD_FIELDS] for record in records))
+        sys.stdout.write("\n")
+    else:
+        logger.info("No log call found")
+
+
+if __name__ == "__main__":
+    query()
@@ -0,0 +1,45 @@
+import functools
+import click
+from loguru import logger
+
+from src.models.tracer import tracer
+
+
+def trace_options(command):
+    """Add the --trace and --trace-top options to a command.
+
+    With --trace, the whole command is traced, the events are written to the file and a summary is printed on stderr.
+    To be applied right under `@click.command()`.
+    """
+
+    @click.option(
+        "--trace",
+        "trace_file",
+        type=click.Path(dir_okay=False, writable=True),
+        default=None,
+        help="Write the time spent in each phase, file and commit to this Chrome trace event JSON file.",
+    )
+    @click.option(
+        "--trace-top",
+        type=click.IntRange(min=0),
+        default=10,
+        help="Number of slowest files or commits in the summary of the trace.",
+        show_default=True,
+    )
+    @functools.wraps(command)
+    def wrapper(*args, trace_file: str = None, trace_top: int = 10, **kwargs):
+        if not trace_file:
+            return command(*args, **kwargs)
+
+        tracer.reset(enabled=True)
+
+        try:
+            with tracer.span(command.__name__):
+                return command(*args, **kwargs)
+        finally:
+            tracer.save(trace_file)
+            logger.info("Trace written to {}", trace_file)
+            click.echo(tracer.summary(trace_top), err=True)
+            tracer.reset()
+
+    return wrapper
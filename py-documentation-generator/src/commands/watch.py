@@ -0,0 +1,197 @@
+from pathlib import Path
+import sys
+import time
+import click
+from loguru import logger
+
+from src.commands.generate_logged_messages_listing import (
+    LOG_LEVEL_NANES,
+    DocumentationGenerator,
+    write_md_sections,
+)
+from src.commands.tracing import trace_options
+from src.generators.local_module_generator import LocalModuleGenerator
+from src.models.source_watcher import SourceWatcher
+from src.models.tracer import tracer
+
+
+class DocumentationWatch:
+    """Keep the modules listing and the logged messages listing up to date, in memory between rounds.
+
+    Only the changed files are parsed again, and only the tables they appear in are rendered again.
+
+    Usage:
+        watch = DocumentationWatch("src", "docs", "logger", "https://github.com/org/repo", "LOGGED_MESSAGES.md")
+        watch.generate()
+        watch.update(SourceWatcher(Path("src")).wait())
+    """
+
+    def __init__(self, source_dir: str, output_dir: str, instance_name: str, url: str, output_file: str):
+        self._source_dir = source_dir
+        self._output_dir = output_dir
+        self._instance_name = instance_name
+        self._output_path = Path(output_dir, output_file)
+        self._modules: LocalModuleGenerator = None
+        self._logs = DocumentationGenerator(source_dir, url)
+        # rendered table of each level with logged messages
+        self._tables = {}
+
+    def generate(self):
+        """Parse every source file and write the documentation."""
+        self._modules = LocalModuleGenerator(self._source_dir, self._output_dir, "modules")
+        self._write_modules()
+
+        for level in LOG_LEVEL_NANES:
+            table = self._logs.generate_md(self._instance_name, level)
+            if table:
+                self._tables[level] = table
+
+        self._write_logs()
+
+    def update(self, changes):
+        """Parse the changed files and write the documentation.
+
+        Args:
+            changes (SourceChanges): the files added or modified, and deleted
+        """
+        with tracer.span("modules"):
+            self._update_modules(changes)
+
+        with tracer.span("logged messages"):
+            levels = self._logs.update_files(self._instance_name, changes.modified, changes.deleted)
+
+            for level in levels:
+                table = self._logs.generate_md(self._instance_name, level)
+                if table:
+                    self._tables[level] = table
+                else:
+                    self._tables.pop(level, None)
+
+            self._write_logs()
+
+    def _update_modules(self, changes):
+        try:
+            if not changes.deleted and self._modules.update_modules(changes.modified):
+                self._write_modules()
+                return
+        except SyntaxError as exc_info:
+            # most likely saved in the middle of an edit, the next save will fix it
+            logger.error("Keeping the modules listing, unable to parse {}: {}", exc_info.filename, exc_info)
+            return
+
+        logger.info("Packages changed, listing all the modules again")
+        modules = LocalModuleGenerator(self._source_dir, self._output_dir, "modules")
+
+        if modules.content is None:
+            logger.error("Keeping the modules listing, unable to list the modules of {}", self._source_dir)
+            return
+
+        self._modules = modules
+        self._write_modules()
+
+    def _write_modules(self):
+        self._modules.to_json()
+        self._modules.to_markdown()
+
+    def _write_logs(self):
+        levels = [level for level in LOG_LEVEL_NANES if level in self._tables]
+
+        with self._output_path.open("w") as file_buffer:
+            write_md_sections(file_buffer, levels, lambda level: file_buffer.write(self._tables[level]))
+
+
+@click.command()
+@trace_options
+@click.option(
+    "-s",
+    "--source-dir",
+    default=Path("src"),
+    type=click.Path(exists=True, file_okay=False),
+    show_default=True,
+)
+@click.option(
+    "-o",
+    "--output-dir",
+    default=Path("docs"),
+    type=click.Path(exists=True, file_okay=False),
+    show_default=True,
+)
+@click.option(
+    "-i",
+    "--instance-name",
+    default="logger",
+    show_default=True,
+    help="Comma separated names or attributes of the logging instances.",
+)
+@click.option(
+    "-u",
+    "--url",
+    default="https://github.com/thoroc/py-documentation-generator",
+    show_default=True,
+    help="Url to the hosted repo.",
+)
+@click.option(
+    "-l",
+    "--logged-messages-file",
+    default="LOGGED_MESSAGES.md",
+    show_default=True,
+    help="Name of the logged messages listing, in the output directory.",
+)
+@click.option("--interval", type=click.FloatRange(min=0), default=0.5, show_default=True, help="Seconds between polls.")
+@click.option(
+    "--debounce",
+    type=click.FloatRange(min=0),
+    default=0.2,
+    show_default=True,
+    help="Seconds without changes before regenerating.",
+)
+@click.option(
+    "-d",
+    "--debug",
+    is_flag=True,
+    help="Enable debug mode. Prints debug messages to the console.",
+)
+def watch(
+    source_dir: str,
+    output_dir: str,
+    instance_name: str,
+    url: str,
+    logged_messages_file: str,
+    interval: float,
+    debounce: float,
+    debug: bool,
+):
+    """Regenerate the modules and logged messages listings when source files change."""
+    if not debug:
+        # default loguru level is DEBUG
+        logger.remove()
+        logger.add(sys.stderr, level="INFO")
+
+    watcher = SourceWatcher(Path(source_dir), interval=interval, debounce=debounce)
+    documentation = DocumentationWatch(str(source_dir), str(output_dir), instance_name, url, logged_messages_file)
+
+    with tracer.span("generate"):
+        documentation.generate()
+
+    logger.info("Watching {} for changes, press Ctrl+C to stop", source_dir)
+
+    try:
+        while True:
+            changes = watcher.wait()
+            start = time.perf_counter()
+
+            with tracer.span("update"):
+                documentation.update(changes)
+
+            logger.info(
+                "Regenerated after {} modified and {} deleted file(s) in {:.0f} ms",
+                len(changes.modified),
+                len(changes.deleted),
+                (time.perf_counter() - start) * 1000,
+            )
+    except KeyboardInterrupt:
+        logger.info("Stopped watching {}", source_dir)
+
+
+if __name__ == "__main__":
+    watch()
@@ -1,10 +1,70 @@
 from abc import ABC, abstractmethod
-import json
+from contextlib import contextmanager
+import hashlib
+import os
 from pathlib import Path
 from loguru import logger
 
 
+from src.generators.json_stream_writer import JsonStreamWriter
 from src.models import WrongDataTypeException, MissingOutputFilenameException
+from src.models.tracer import tracer
+
+# indent of the JSON files, compact files have none
+JSON_INDENT = 4
+
+
+def _serializable(value):
+    """Get a value json.dump can write, called for the records of the data (i.e. LocalModule)"""
+    to_dict = getattr(value, "to_dict", None)
+
+    if to_dict is None:
+        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+    return to_dict()
+
+
+@contextmanager
+def _atomic_write(output_file: Path, mode: str = "w"):
+    """Open a temporary file next to the output file, it replaces the output file once fully written.
+
+    A reader never sees a partly written file, and the output file is kept when writing fails.
+    """
+    # opened as the output file would be, with the permissions given by the umask
+    temporary_file = output_file.with_name(f".{output_file.name}.{os.getpid()}.tmp")
+
+    try:
+        with temporary_file.open(mode) as file_buffer:
+            yield file_buffer
+
+        os.replace(temporary_file, output_file)
+    except BaseException:
+        temporary_file.unlink(missing_ok=True)
+        raise
+
+
+def _write_if_changed(output_file: Path, content: str) -> bool:
+    """Write a file atomically, only when the hash of its content differs from the file on disk.
+
+    Args:
+        output_file (Path): the file to write
+        content (str): the content of the file
+
+    Returns:
+        bool: whether or not the file was written
+    """
+    data = content.encode("utf-8")
+
+    try:
+        if hashlib.sha256(output_file.read_bytes()).digest() == hashlib.sha256(data).digest():
+            return False
+    except FileNotFoundError:
+        pass
+
+    with _atomic_write(output_file, "wb") as file_buffer:
+        file_buffer.write(data)
+
+    return True
 
 
 class DocumentationGenerator(ABC):
@@ -12,8 +72,15 @@ class DocumentationGenerator(ABC):
         self._source_dir = source_dir
         self._output_dir = output_dir
         self._output_file_name = output_file_name.upper()
-        self._data = self._get_data()
-        self._content = self._get_content()
+        with tracer.span("collect"):
+            self._data = self._get_data()
+        with tracer.span("render"):
+            self._content = self._get_content()
+
+    @property
+    def content(self):
+        """The generated content, None when the data could not be collected or transformed."""
+        return self._content
 
     @abstractmethod
     def _get_data(self):
@@ -42,15 +109,19 @@ class DocumentationGenerator(ABC):
         output_file = self._get_output_file_path("md")
 
         if self._content:
-            with output_file.open("w") as file_buffer:
+            with tracer.span("write md"), output_file.open("w") as file_buffer:
                 logger.debug("Writing data: {}", self._content)
                 logger.debug("to {}", output_file)
 
                 file_buffer.write(self._content)
 
     @logger.catch()
-    def to_json(self):
-        """Generate json data"""
+    def to_json(self, compact: bool = False):
+        """Generate json data
+
+        Args:
+            compact (bool): whether or not to write the JSON without indent nor whitespaces
+        """
         if not isinstance(self._data, dict):
             raise WrongDataTypeException("Wrong datatype for {}; dict expected".format(type(self._data)))
 
@@ -59,5 +130,5 @@ class DocumentationGenerator(ABC):
 
         output_file = self._get_output_file_path("json")
 
-        with output_file.open("w") as fbuffer:
-            json.dump(self._data, fbuffer, indent=4)
+        with tracer.span("write json"), _atomic_write(output_file) as fbuffer:
+            JsonStreamWriter(fbuffer, indent=None if compact else JSON_INDENT, default=_serializable).write(self._data)
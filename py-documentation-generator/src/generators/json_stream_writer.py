@@ -0,0 +1,79 @@
+import json
+from collections.abc import Iterator
+from typing import Any, Callable, TextIO
+
+
+class JsonStreamWriter:
+    """Write JSON to a file as the values are produced, the same as json.dump with the same indent.
+
+    Besides dicts, objects can be iterators of (key, value) pairs, i.e. the packages and modules yielded by a walk:
+    they are written as they are consumed and never held in memory. Values json does not know are converted with
+    `default`, as with json.dump. Without indent the output is compact, without any whitespace.
+
+    Usage:
+        with Path("docs", "MODULES.json").open("w") as file_buffer:
+            JsonStreamWriter(file_buffer, indent=4, default=_serializable).write(data)
+    """
+
+    def __init__(self, file_buffer: TextIO, indent: int = None, default: Callable[[Any], Any] = None):
+        self._file_buffer = file_buffer
+        self._indent = indent
+        self._default = default
+        self._key_separator = ":" if indent is None else ": "
+
+    def write(self, value: Any):
+        """Write a value.
+
+        Args:
+            value (Any): a JSON value, a dict, a list or an iterator of (key, value) pairs
+
+        Raises:
+            TypeError: when a value cannot be converted
+        """
+        self.__write(value, 0)
+
+    def __newline(self, level: int) -> str:
+        return "" if self._indent is None else "\n" + " " * (self._indent * level)
+
+    def __write(self, value: Any, level: int):
+        if isinstance(value, (str, int, float)) or value is None:
+            # bool is an int
+            self._file_buffer.write(json.dumps(value))
+        elif isinstance(value, dict):
+            self.__write_object(iter(value.items()), level)
+        elif isinstance(value, (list, tuple)):
+            self.__write_array(value, level)
+        elif isinstance(value, Iterator):
+            self.__write_object(value, level)
+        elif self._default is not None:
+            self.__write(self._default(value), level)
+        else:
+            raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+    def __write_object(self, items: Iterator, level: int):
+        separator = "{" + self.__newline(level + 1)
+        empty = True
+
+        for key, value in items:
+            # same as json, the keys which are not strings are written as their JSON value
+            key = key if isinstance(key, str) else json.dumps(key)
+            self._file_buffer.write(separator + json.dumps(key) + self._key_separator)
+            self.__write(value, level + 1)
+            separator = "," + self.__newline(level + 1)
+            empty = False
+
+        self._file_buffer.write("{}" if empty else self.__newline(level) + "}")
+
+    def __write_array(self, values: list, level: int):
+        if not values:
+            self._file_buffer.write("[]")
+            return
+
+        separator = "[" + self.__newline(level + 1)
+
+        for value in values:
+            self._file_buffer.write(separator)
+            self.__write(value, level + 1)
+            separator = "," + self.__newline(level + 1)
+
+        self._file_buffer.write(self.__newline(level) + "]")
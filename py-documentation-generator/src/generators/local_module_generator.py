@@ -1,10 +1,31 @@
+import io
+import json
+import os
 from pathlib import Path
-import pandas as pd
+from typing import Dict, List, Set, TextIO, Tuple
 from loguru import logger
 
-from src.generators.documentation_generator import DocumentationGenerator
-from src.models import MissingPackageException
+from src.generators.documentation_generator import (
+    JSON_INDENT,
+    DocumentationGenerator,
+    _atomic_write,
+    _serializable,
+    _write_if_changed,
+)
+from src.generators.json_stream_writer import JsonStreamWriter
+from src.generators.markdown_table import MarkdownTableWriter
+from src.models import MissingOutputFilenameException, MissingPackageException, WrongDataTypeException
+from src.models.local_modules import LocalModule
 from src.models.module_data_provider import ModuleDataProvider
+from src.models.module_manifest import MANIFEST_EXTENSION, ModuleManifest
+from src.models.package_selection import PackageSelection
+from src.models.source_index import SourceIndex
+from src.models.tracer import tracer
+
+# the columns of the tables, the fields of LocalModule
+MODULE_COLUMNS = [key[1:] for key in LocalModule.__slots__]
+# the listing has always shown an empty pandas DataFrame for the packages without modules
+EMPTY_TABLE = "Empty DataFrame\nColumns: []\nIndex: []"
 
 
 class LocalModuleGenerator(DocumentationGenerator):
@@ -13,70 +34,313 @@ class LocalModuleGenerator(DocumentationGenerator):
 
     _data_provider = ModuleDataProvider()
 
-    def __modules_to_dataframe(self, modules: list):
-        logger.debug(f"MODULES: {modules}")
+    def __init__(
+        self,
+        source_dir: str,
+        output_dir: str,
+        output_file_name: str = "",
+        source_index: SourceIndex = None,
+        io_threads: int = 0,
+        jobs: int = 1,
+        incremental: bool = False,
+        selection: PackageSelection = None,
+    ):
+        # rendered table of the modules of each package, keyed by the package names from the root
+        self._tables: Dict[Tuple[str, ...], str] = {}
+        self._source_index = source_index
+        self._io_threads = io_threads
+        self._jobs = jobs if jobs > 0 else os.cpu_count()
+        self._incremental = incremental
+        self._selection = selection
+        # modules added, removed and changed since the previous incremental run
+        self._diff: Dict[str, list] = None
+        super().__init__(source_dir, output_dir, output_file_name)
+
+    def __modules_table(self, modules: List[LocalModule]) -> str:
+        """Render the table of the modules of a package, the same as pandas.DataFrame.to_markdown(index=False)"""
+        logger.debug("MODULES: {}", modules)
 
         if not modules:
-            return pd.DataFrame()
+            return EMPTY_TABLE
 
-        columns = [key[1:] for key in list(modules[0].keys())]
-        data = []
+        rows = []
 
         for module in modules:
-            values = []
+            values = [", ".join(value) if isinstance(value, list) else value for value in module.to_dict().values()]
+            values[0] = values[0].replace("__", r"\_\_")
+            rows.append(values)
 
-            for value in list(module.values()):
-                if isinstance(value, list):
-                    values.append(", ".join(value))
-                else:
-                    values.append(value)
+        return MarkdownTableWriter(MODULE_COLUMNS).render(lambda: iter(rows))
 
-            data.append(values)
+    def __table(self, nodes: dict, package: Tuple[str, ...]) -> str:
+        """Get the table of the modules of a package, rendered once"""
+        if package not in self._tables:
+            modules = [
+                value.get("data") for value in nodes.get("data").values() if value.get("type") == self.TYPE_MODULE
+            ]
+            self._tables[package] = self.__modules_table(modules)
 
-        dataframe = pd.DataFrame(data, columns=columns)
-        dataframe[columns[0]] = dataframe[columns[0]].str.replace("__", r"\_\_")
+        return self._tables[package]
 
-        return dataframe.to_markdown(index=False)
+    def __unwrap(self, file_buffer: TextIO, nodes: dict, depth: int = 1, package: Tuple[str, ...] = ()):
+        """Write the table of a package, then the sections of its sub-packages"""
+        if not isinstance(nodes, dict):
+            return
 
-    def __unwrap(self, nodes: dict, depth: int = 1):
-        content = ""
+        file_buffer.write(f"{self.__table(nodes, package)}\n\n\n")
 
-        if isinstance(nodes, dict):
-            modules = []
+        for key, value in nodes.get("data").items():
+            if value.get("type") == self.TYPE_PACKAGE:
+                file_buffer.write(f"{'#' * (depth + 1)} {key}\n\n")
+                self.__unwrap(file_buffer, value, depth + 1, (*package, key))
 
-            for key, value in nodes.get("data").items():
-                if value.get("type") == self.TYPE_MODULE:
-                    modules.append(value.get("data"))
+    @logger.catch()
+    def _get_content(self):
+        file_buffer = io.StringIO()
 
-            content += f"{self.__modules_to_dataframe(modules)}\n\n\n"
+        # logger.info(f"DATA: {self._data}")
 
-            for key, value in nodes.get("data").items():
-                if value.get("type") == self.TYPE_PACKAGE:
-                    content += f"{'#' * (depth + 1)} {key}\n\n"
-                    content += self.__unwrap(value, depth + 1)
+        for section, nodes in self._data.items():
+            logger.info(f"Object: {section}")
+
+            file_buffer.write(f"# {section}\n\n")
+            self.__unwrap(file_buffer, nodes, package=(section,))
 
-        return content
+        return file_buffer.getvalue()
 
     @logger.catch()
-    def _get_content(self):
-        content = ""
+    def to_shards(self, markdown: bool = True, compact: bool = False) -> List[Path]:
+        """Write one markdown and JSON file per top-level package, and the listing as an index of them.
 
-        # logger.info(f"DATA: {self._data}")
+        The shards are written in a directory named after the listing, i.e. docs/MODULES/models.md. The index keeps
+        the modules of the root, the sections of the packages link to their shard. Each file is written atomically,
+        and only when its content changed, the shards of the packages which no longer exist are removed. With a
+        selection, the modules and the shards it leaves out are kept as the previous index lists them.
+
+        Args:
+            markdown (bool): whether or not to write the markdown files, besides the JSON files
+            compact (bool): whether or not to write the JSON without indent nor whitespaces
+
+        Returns:
+            List[Path]: the files written
+        """
+        if not isinstance(self._data, dict):
+            raise WrongDataTypeException("Wrong datatype for {}; dict expected".format(type(self._data)))
+
+        if not self._output_file_name:
+            raise MissingOutputFilenameException("output_file_name must be specified")
+
+        shard_dir = Path(self._output_dir, self._output_file_name)
+        shard_dir.mkdir(exist_ok=True)
+        indent = None if compact else JSON_INDENT
+        files = {}
+        index = {}
+        index_content = io.StringIO()
+        unlisted = self.__unlisted()
 
         for section, nodes in self._data.items():
-            logger.info(f"Object: {section}")
+            index[section] = {"type": self.TYPE_PACKAGE, "data": {}}
+            nodes, table = self.__merge_unlisted(section, nodes, unlisted.get(section))
+            index_content.write(f"# {section}\n\n{table}\n\n\n")
+
+            for key, value in nodes.get("data").items():
+                if value.get("type") != self.TYPE_PACKAGE:
+                    index[section]["data"][key] = value
+                    continue
+
+                if "shard" in value:
+                    # a package left out by the selection, its shard is kept as it is
+                    index[section]["data"][key] = value
+                    index_content.write(f"## [{key}]({shard_dir.name}/{key}.md)\n\n")
+                    continue
+
+                shard = io.StringIO()
+                JsonStreamWriter(shard, indent=indent, default=_serializable).write({key: value})
+                files[shard_dir / f"{key}.json"] = shard.getvalue()
+                index[section]["data"][key] = {"type": self.TYPE_PACKAGE, "shard": f"{shard_dir.name}/{key}.json"}
+
+                shard = io.StringIO()
+                shard.write(f"# {key}\n\n")
+                self.__unwrap(shard, value, package=(section, key))
+                files[shard_dir / f"{key}.md"] = shard.getvalue()
+                index_content.write(f"## [{key}]({shard_dir.name}/{key}.md)\n\n")
+
+        index_json = io.StringIO()
+        JsonStreamWriter(index_json, indent=indent, default=_serializable).write(index)
+        files[self._get_output_file_path("json")] = index_json.getvalue()
+        files[self._get_output_file_path("md")] = index_content.getvalue()
+
+        if not markdown:
+            files = {file: content for file, content in files.items() if file.suffix != ".md"}
+
+        packages = {file.stem for file in files if file.parent == shard_dir}
+        packages.update(key for section in unlisted.values() for key in section)
+        self.__sweep_stale_shards(shard_dir, packages)
+
+        with tracer.span("write shards"):
+            written = [file for file, content in files.items() if _write_if_changed(file, content)]
+
+        logger.info("{} of {} files changed in {}", len(written), len(files), shard_dir)
+
+        return written
+
+    def __merge_unlisted(self, section: str, nodes: dict, unlisted: dict = None) -> Tuple[dict, str]:
+        """Add the entries of the previous index left out by the selection to a section, and render its table.
+
+        Args:
+            section (str): the name of the section, the root directory
+            nodes (dict): the JSON representation of the root package
+            unlisted (dict): the modules and the packages of the section the selection does not list, by name
+
+        Returns:
+            Tuple[dict, str]: the root package with the unlisted entries, and the table of its modules
+        """
+        if not unlisted:
+            return nodes, self.__table(nodes, (section,))
 
-            content += f"# {section}\n\n"
-            content += self.__unwrap(nodes)
+        # same order as the walk, by name
+        nodes = {**nodes, "data": dict(sorted({**unlisted, **nodes.get("data")}.items()))}
+        modules = [value.get("data") for value in nodes["data"].values() if value.get("type") == self.TYPE_MODULE]
 
-        return content
+        return nodes, self.__modules_table(modules)
+
+    def __sweep_stale_shards(self, shard_dir: Path, packages: Set[str]):
+        """Remove the shards of the packages which no longer exist.
+
+        Args:
+            shard_dir (Path): the directory of the shards
+            packages (Set[str]): the packages whose shards are kept, the listed and the unlisted ones
+        """
+        for stale in shard_dir.iterdir():
+            if stale.suffix not in (".md", ".json") or stale.stem in packages:
+                continue
+
+            # the shards of the packages left out by the selection are not stale
+            if self._selection is None or self._selection.selects((stale.stem,)):
+                logger.debug("Removing {}", stale)
+                stale.unlink()
+
+    def __unlisted(self) -> Dict[str, dict]:
+        """Get the entries of the previous index left out by the selection, they are written again as they were.
+
+        Returns:
+            Dict[str, dict]: the modules and the packages, with their shard, which the selection does not list, by
+                name for each section; empty without selection
+        """
+        index_file = self._get_output_file_path("json")
+
+        if self._selection is None or not index_file.is_file():
+            return {}
+
+        try:
+            with index_file.open("r") as file_buffer:
+                index = json.load(file_buffer)
+        except (OSError, ValueError) as exc_info:
+            logger.warning("Ignoring unreadable index file {}: {}", index_file, exc_info)
+            return {}
+
+        unlisted = {}
+
+        for section, nodes in index.items():
+            unlisted[section] = {}
+
+            for key, value in nodes.get("data", {}).items():
+                if value.get("type") == self.TYPE_PACKAGE and "shard" in value:
+                    if not self._selection.selects((key,)):
+                        unlisted[section][key] = value
+                elif value.get("type") == self.TYPE_MODULE and not self._selection.selects(()):
+                    unlisted[section][key] = {"type": self.TYPE_MODULE, "data": LocalModule.from_dict(value["data"])}
+
+        return unlisted
+
+    @classmethod
+    @logger.catch()
+    def stream_json(
+        cls,
+        source_dir: str,
+        output_dir: str,
+        output_file_name: str,
+        compact: bool = False,
+        selection: PackageSelection = None,
+    ):
+        """Write the JSON listing as the packages are walked, without keeping the modules in memory.
+
+        The JSON is the same as to_json writes. The listing is only replaced once fully written, it is kept when a
+        directory is not a package or a module cannot be parsed.
+
+        Args:
+            source_dir (str): the source directory
+            output_dir (str): the directory of the listing
+            output_file_name (str): the name of the listing, without extension
+            compact (bool): whether or not to write the JSON without indent nor whitespaces
+            selection (PackageSelection): the packages to list
+        """
+        data = cls._data_provider.iter_serialize(Path(source_dir).resolve(), selection=selection)
+        output_file = Path(output_dir, f"{output_file_name.upper()}.json")
+
+        with tracer.span("write json"), _atomic_write(output_file) as file_buffer:
+            JsonStreamWriter(file_buffer, indent=None if compact else JSON_INDENT, default=_serializable).write(data)
+
+    @property
+    def diff(self) -> Dict[str, list]:
+        """The modules added, removed and changed since the previous incremental run, None when not incremental."""
+        return self._diff
 
     @logger.catch()
     def _get_data(self):
         cwd = Path(self._source_dir).resolve()
-        data = self._data_provider.serialize(cwd)
+        manifest = ModuleManifest(self._get_output_file_path(MANIFEST_EXTENSION)) if self._incremental else None
+        data = self._data_provider.serialize(
+            cwd,
+            source_index=self._source_index,
+            io_threads=self._io_threads,
+            jobs=self._jobs,
+            manifest=manifest,
+            selection=self._selection,
+        )
 
         if not data:
             raise MissingPackageException("No local modules found")
 
+        if manifest is not None:
+            self._diff = manifest.diff()
+            manifest.save()
+
         return data
+
+    def update_modules(self, files: List[Path]):
+        """Analyse modules again and render only the tables of their packages.
+
+        Args:
+            files (List[Path]): the modified modules, as absolute paths
+
+        Returns:
+            bool: False when a file is not a module of the listing (i.e. added or emptied), nothing is updated then
+
+        Raises:
+            SyntaxError: when a module cannot be parsed, nothing is updated then
+        """
+        root = Path(self._source_dir).resolve()
+        updates = []
+
+        for file in files:
+            package = (root.name, *file.relative_to(root).parent.parts)
+            nodes = self._data.get(root.name)
+
+            for name in package[1:]:
+                nodes = nodes["data"].get(name) if nodes else None
+
+            module = nodes["data"].get(file.name) if nodes else None
+
+            if not module or module["type"] != self.TYPE_MODULE or not file.is_file() or file.stat().st_size == 0:
+                return False
+
+            updates.append((module, LocalModule.from_path(file), package))
+
+        for module, local_module, package in updates:
+            module["data"] = local_module
+            self._tables.pop(package, None)
+
+        self._content = self._get_content()
+
+        return True
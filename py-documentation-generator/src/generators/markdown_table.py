@@ -0,0 +1,200 @@
+import io
+import math
+from typing import Callable, Iterable, List, Sequence, TextIO
+
+try:
+    # tabulate measures the display width of wide characters when wcwidth is installed, so do we
+    import wcwidth
+except ImportError:  # pragma: no cover
+    wcwidth = None
+
+# same as tabulate, the headers are padded with at least 2 spaces
+MIN_PADDING = 2
+
+# least to most generic type of a column
+TYPE_BOOL = 1
+TYPE_INT = 2
+TYPE_FLOAT = 3
+TYPE_STR = 4
+
+
+def _value_type(value: str) -> int:
+    """Get the least generic type of a cell, following tabulate's rules"""
+    if value in ("True", "False"):
+        return TYPE_BOOL
+
+    try:
+        int(value)
+        return TYPE_INT
+    except ValueError:
+        pass
+
+    try:
+        number = float(value)
+    except ValueError:
+        return TYPE_STR
+
+    if math.isinf(number) or math.isnan(number):
+        return TYPE_FLOAT if value.lower() in ["inf", "-inf", "nan"] else TYPE_STR
+
+    return TYPE_FLOAT
+
+
+def _after_point(value: str) -> int:
+    """Get the number of characters after the decimal point of a number, -1 for integers and text"""
+    if _value_type(value) != TYPE_FLOAT:
+        return -1
+
+    position = value.rfind(".")
+    position = value.lower().rfind("e") if position < 0 else position
+
+    return len(value) - position - 1 if position >= 0 else -1
+
+
+def _width(value: str) -> int:
+    # printable ASCII characters are one column wide, wcwidth is only needed for the others
+    if not wcwidth or (value.isascii() and value.isprintable()):
+        return len(value)
+
+    return wcwidth.wcswidth(value)
+
+
+def _pad_left(value: str, width: int) -> str:
+    return " " * (width - _width(value)) + value
+
+
+def _pad_right(value: str, width: int) -> str:
+    return value + " " * (width - _width(value))
+
+
+def _format_float(value: str) -> str:
+    try:
+        return format(float(value), "g")
+    except ValueError:
+        return value
+
+
+class _Column:
+    """Width and type of a column, updated one cell at a time"""
+
+    def __init__(self, header: str):
+        self.header = header
+        self.type = TYPE_BOOL
+        self.text_width = _width(header) + MIN_PADDING
+        # for numbers: widest part before the decimal point and the most decimals, as written and formatted as float
+        self.int_lead = self.int_decimals = -1
+        self.float_lead = self.float_decimals = -1
+
+    def update(self, value: str):
+        self.type = max(self.type, _value_type(value))
+        self.text_width = max(self.text_width, _width(value.strip()))
+
+        if self.type <= TYPE_INT:
+            decimals = _after_point(value)
+            self.int_lead = max(self.int_lead, _width(value) - decimals)
+            self.int_decimals = max(self.int_decimals, decimals)
+
+        if self.type <= TYPE_FLOAT:
+            formatted = _format_float(value)
+            decimals = _after_point(formatted)
+            self.float_lead = max(self.float_lead, _width(formatted) - decimals)
+            self.float_decimals = max(self.float_decimals, decimals)
+
+    @property
+    def numeric(self) -> bool:
+        return self.type in (TYPE_INT, TYPE_FLOAT)
+
+    @property
+    def decimals(self) -> int:
+        return self.int_decimals if self.type == TYPE_INT else self.float_decimals
+
+    @property
+    def width(self) -> int:
+        if self.type == TYPE_INT:
+            return max(_width(self.header) + MIN_PADDING, self.int_lead + self.int_decimals)
+        if self.type == TYPE_FLOAT:
+            return max(_width(self.header) + MIN_PADDING, self.float_lead + self.float_decimals)
+
+        return self.text_width
+
+    def render(self, value: str) -> str:
+        if self.type == TYPE_FLOAT:
+            value = _format_float(value)
+        if self.numeric:
+            return _pad_left(value + " " * (self.decimals - _after_point(value)), self.width)
+
+        return _pad_right(value.strip(), self.width)
+
+    def render_header(self) -> str:
+        return _pad_left(self.header, self.width) if self.numeric else _pad_right(self.header, self.width)
+
+
+class MarkdownTableWriter:
+    """Write a markdown table straight to a file, row by row.
+
+    The layout is the same as `pandas.DataFrame.to_markdown(index=False)` (tabulate "pipe" format) for single-line
+    cells: text columns are left aligned, numeric columns are right aligned on their decimal point. The rows are
+    iterated twice, once to compute the width and type of each column, then to write them.
+
+    Usage:
+        writer = MarkdownTableWriter(["file", "lineno"])
+        writer.write(file_buffer, lambda: iter(rows))
+    """
+
+    def __init__(self, columns: List[str]):
+        self._columns = columns
+
+    def _measure(self, rows: Iterable[Sequence[str]]) -> List[_Column]:
+        """Compute the type and width of each column.
+
+        Args:
+            rows (Iterable[Sequence[str]]): the rows of the table
+
+        Returns:
+            List[_Column]: the columns
+        """
+        columns = [_Column(header) for header in self._columns]
+
+        for row in rows:
+            for column, value in zip(columns, row):
+                column.update(value)
+
+        for column in columns:
+            # a column with only booleans or no value at all is aligned as text
+            if column.type == TYPE_BOOL:
+                column.type = TYPE_STR
+
+        return columns
+
+    def write(self, file_buffer: TextIO, rows: Callable[[], Iterable[Sequence[str]]]):
+        """Write the table, without a trailing new line.
+
+        Args:
+            file_buffer (TextIO): the file to write to
+            rows (Callable[[], Iterable[Sequence[str]]]): returns a new iterator over the rows each time it is called
+        """
+        columns = self._measure(rows())
+
+        header = [column.render_header() for column in columns]
+        separator = [
+            "-" * (column.width + 1) + ":" if column.numeric else ":" + "-" * (column.width + 1) for column in columns
+        ]
+        file_buffer.write(f"| {' | '.join(header)} |\n|{'|'.join(separator)}|")
+
+        for row in rows():
+            cells = [column.render(value) for column, value in zip(columns, row)]
+            file_buffer.write(f"\n| {' | '.join(cells)} |")
+
+    def render(self, rows: Callable[[], Iterable[Sequence[str]]]) -> str:
+        """Get the table as a string.
+
+        Args:
+            rows (Callable[[], Iterable[Sequence[str]]]): returns a new iterator over the rows each time it is called
+
+        Returns:
+            str: the markdown table
+        """
+        file_buffer = io.StringIO()
+        self.write(file_buffer, rows)
+
+        return file_buffer.getvalue()
@@ -0,0 +1,61 @@
+from abc import ABC, abstractmethod
+import csv
+import json
+from typing import Dict, Iterable, TextIO, Union
+
+RECORD_FIELDS = ["file", "path", "line", "level", "instance", "message"]
+
+
+class RecordWriter(ABC):
+    """Write the logged messages as one record per log call, as they are produced."""
+
+    def __init__(self, file_buffer: TextIO):
+        self._file_buffer = file_buffer
+
+    @abstractmethod
+    def write_record(self, record: Dict[str, Union[str, int]]):
+        """Write a single record"""
+        raise NotImplementedError("write_record() must be implemented")
+
+    def write(self, records: Iterable[Dict[str, Union[str, int]]]):
+        """Write all the records.
+
+        Args:
+            records (Iterable[Dict[str, Union[str, int]]]): the records, with the RECORD_FIELDS keys
+
+        Returns:
+            int: the number of records written
+        """
+        count = 0
+
+        for record in records:
+            self.write_record(record)
+            count += 1
+
+        return count
+
+
+class JsonLinesRecordWriter(RecordWriter):
+    """Write one JSON object per line"""
+
+    def write_record(self, record: Dict[str, Union[str, int]]):
+        self._file_buffer.write(json.dumps(record, ensure_ascii=False))
+        self._file_buffer.write("\n")
+
+
+class CsvRecordWriter(RecordWriter):
+    """Write a CSV file with a header line"""
+
+    def __init__(self, file_buffer: TextIO):
+        super().__init__(file_buffer)
+        self._writer = csv.DictWriter(file_buffer, fieldnames=RECORD_FIELDS)
+        self._writer.writeheader()
+
+    def write_record(self, record: Dict[str, Union[str, int]]):
+        self._writer.writerow(record)
+
+
+RECORD_WRITERS = {
+    "jsonl": JsonLinesRecordWriter,
+    "csv": CsvRecordWriter,
+}
@@ -16,3 +16,7 @@ class MissingModuleFilesException(Exception):
 
 class InvalidGitRepositoryException(Exception):
     """Invalid git repository"""
+
+
+class InvalidRevisionException(Exception):
+    """Invalid git revision"""
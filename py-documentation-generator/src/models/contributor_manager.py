@@ -7,6 +7,7 @@ from loguru import logger
 
 from src.models.contributor import Contributor
 from src.models import InvalidGitRepositoryException
+from src.models.tracer import tracer
 
 
 class ContributorManager:
@@ -79,35 +80,37 @@ class ContributorManager:
     @logger.catch
     def _init_contributors(self):
         """List all contributors found in repo"""
-        commits = list(self._repo.iter_commits("HEAD"))
+        with tracer.span("list commits"):
+            commits = list(self._repo.iter_commits("HEAD"))
         logger.info(
             "Generating list of contributors from {} commit(s).",
             len(commits)
         )
         for commit in commits:
-            contributor_name = commit.author.name
-            contributor_email = commit.author.email
-
-            logger.info(
-                "Commit: {} created by: {} <{}>",
-                commit, contributor_name, contributor_email
-            )
-
-            contributor: Contributor = self._get_contributor(
-                contributor_name,
-                contributor_email
-            )
-
-            if contributor_email not in self._exclude:
-                # check if we have a contributor with the same name and email
-                if contributor:
-                    logger.info("Found existing contributor={}", contributor)
-                    contributor.add_commit(commit)
-                else:
-                    contributor = Contributor(
-                        contributor_name, contributor_email, [commit])
-                    logger.info("Found new contributor={}", contributor)
-                    self._contributors.append(contributor)
+            with tracer.span("commit", "commit", commit=commit.hexsha):
+                contributor_name = commit.author.name
+                contributor_email = commit.author.email
+
+                logger.info(
+                    "Commit: {} created by: {} <{}>",
+                    commit, contributor_name, contributor_email
+                )
+
+                contributor: Contributor = self._get_contributor(
+                    contributor_name,
+                    contributor_email
+                )
+
+                if contributor_email not in self._exclude:
+                    # check if we have a contributor with the same name and email
+                    if contributor:
+                        logger.info("Found existing contributor={}", contributor)
+                        contributor.add_commit(commit)
+                    else:
+                        contributor = Contributor(
+                            contributor_name, contributor_email, [commit])
+                        logger.info("Found new contributor={}", contributor)
+                        self._contributors.append(contributor)
 
         logger.info("Found {} contributors", len(self._contributors))
 
@@ -123,7 +126,7 @@ class ContributorManager:
         Args:
             sort_contributors (bool): whether or not to sort contributors by names alphabetically
         """
-        with self._mail_map_path.open("w") as file_buffer:
+        with tracer.span("write mailmap"), self._mail_map_path.open("w") as file_buffer:
             logger.info("Writing mailmap file")
 
             if sort_contributors:
@@ -0,0 +1,72 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable, Iterator, Tuple
+
+from src.models.tracer import tracer
+
+
+def _read(file: Path) -> bytes:
+    with tracer.span("read", "file", file=str(file)):
+        return file.read_bytes()
+
+
+class FilePrefetcher:
+    """Read files in a thread pool, ahead of the code processing them.
+
+    On network filesystems the time is spent waiting for the reads: while a file is parsed, the next ones are being
+    read. At most `ahead` files are read but not yet consumed, the memory used does not depend on the number of files.
+
+    Usage:
+        for file, content in FilePrefetcher(threads=8).read(sorted(Path("src").rglob("*.py"))):
+            ast.parse(content)
+    """
+
+    def __init__(self, threads: int = 8, ahead: int = None):
+        """Constructor
+
+        Args:
+            threads (int): the number of files read at the same time
+            ahead (int): the number of files read but not consumed yet, twice the number of threads by default
+        """
+        self._threads = max(1, threads)
+        self._ahead = max(self._threads, ahead or 2 * self._threads)
+
+    def read(self, files: Iterable[Path]) -> Iterator[Tuple[Path, bytes]]:
+        """Read the files, in order.
+
+        The files are only taken from the iterable as the reads are consumed.
+
+        Args:
+            files (Iterable[Path]): the files to read
+
+        Yields:
+            tuple: the file and its content
+
+        Raises:
+            OSError: when a file cannot be read, once the files before it have been yielded
+        """
+        files = iter(files)
+        pending = deque()
+
+        with ThreadPoolExecutor(max_workers=self._threads, thread_name_prefix="prefetch") as executor:
+            try:
+                for file in files:
+                    pending.append((file, executor.submit(_read, file)))
+
+                    if len(pending) >= self._ahead:
+                        yield self.__next(pending)
+
+                while pending:
+                    yield self.__next(pending)
+            finally:
+                # stopped early, the reads not started yet are dropped
+                for _, future in pending:
+                    future.cancel()
+
+    @staticmethod
+    def __next(pending: deque) -> Tuple[Path, bytes]:
+        """Wait for the oldest read"""
+        file, future = pending.popleft()
+
+        return file, future.result()
@@ -3,9 +3,18 @@ import json
 from typing import Dict, List, Union
 from pathlib import Path
 
+from src.models.source_index import SourceIndex
+from src.models.tracer import tracer
 
-class LocalModule(dict):
-    """Local module"""
+
+class LocalModule:
+    """Local module
+
+    A slotted record, each field is stored once. json.dump does not know it, the generators serialize it with
+    `to_dict`, which keeps the keys of the JSON listing.
+    """
+
+    __slots__ = ("_name", "_path", "_module", "_functions", "_classes")
 
     def __init__(
         self,
@@ -20,23 +29,33 @@ class LocalModule(dict):
         self._module = module
         self._functions = functions
         self._classes = classes
-        dict.__init__(self, **self.__dict__)
 
     @classmethod
-    def from_path(cls, path: Path):
+    def from_path(cls, path: Path, source_index: SourceIndex = None, content: bytes = None):
         """Create a LocalModule object from a path.
 
         Args:
             path (Path): Path to module
+            source_index (SourceIndex): the index to get the parsed module from, released once the module is analysed,
+                the module is parsed otherwise
+            content (bytes): the content of the module when it was already read, the module is read otherwise
 
         Returns:
             LocalModule: LocalModule object
         """
-        _name = path.name
-        _path = str(path.relative_to(Path.cwd()).parent)
-        _module = path.parent.name
-        _functions = cls.__list_methods(path)
-        _classes = cls.__list_classes(path)
+        with tracer.span("module", "file", file=str(path)):
+            if source_index is None:
+                tree = SourceIndex.parse(path, content).tree
+            else:
+                try:
+                    tree = source_index.get(path, content).tree
+                finally:
+                    source_index.release(path)
+
+            _name = path.name
+            _path = str(path.relative_to(Path.cwd()).parent)
+            _module = path.parent.name
+            _functions, _classes = cls.__list_symbols(tree)
 
         return cls(_name, _path, _module, _functions, _classes)
 
@@ -54,37 +73,40 @@ class LocalModule(dict):
 
         return cls(**data)
 
-    @staticmethod
-    def __list_methods(node: Path):
-        """List all methods.
-
-        Args:
-            node (Path): Path to module
+    def to_dict(self) -> Dict[str, Union[str, List[str]]]:
+        """Get the fields, as they are written in the JSON listing.
 
         Returns:
-            List[str]: List of methods
+            Dict[str, Union[str, List[str]]]: _name, _path, _module, _functions and _classes
         """
-        curr_path = Path(node)
-
-        with curr_path.open("rt") as curr_file:
-            tree = ast.parse(curr_file.read(), filename=curr_path)
-            return [func.name for func in tree.body if isinstance(func, ast.FunctionDef)]
+        return {field: getattr(self, field) for field in self.__slots__}
 
     @staticmethod
-    def __list_classes(node: Path):
-        """List all classes.
+    def __list_symbols(tree: ast.Module):
+        """List all top-level methods and classes, in a single pass.
 
         Args:
-            node (Path): Path to module
+            tree (ast.Module): the parsed module
 
         Returns:
-            List[str]: List of classes
+            Tuple[List[str], List[str]]: List of methods and list of classes
         """
-        curr_path = Path(node)
+        functions = []
+        classes = []
+
+        for node in tree.body:
+            if isinstance(node, ast.FunctionDef):
+                functions.append(node.name)
+            elif isinstance(node, ast.ClassDef):
+                classes.append(node.name)
+
+        return functions, classes
+
+    def __eq__(self, other):
+        if not isinstance(other, LocalModule):
+            return NotImplemented
 
-        with curr_path.open("rt") as curr_file:
-            tree = ast.parse(curr_file.read(), filename=curr_path)
-            return [node.name for node in tree.body if isinstance(node, ast.ClassDef)]
+        return self.to_dict() == other.to_dict()
 
     def __repr__(self):
-        return json.dumps(self.__dict__)
+        return json.dumps(self.to_dict())
@@ -0,0 +1,221 @@
+from contextlib import closing
+from itertools import islice
+from pathlib import Path
+import sqlite3
+from typing import Dict, Iterable, Iterator, List, Union
+from loguru import logger
+
+# bumped when the tables change, a database written with another schema is created again
+SCHEMA_VERSION = 1
+# number of calls inserted at once
+BATCH_SIZE = 1000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS levels (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS calls (
+    file_id INTEGER NOT NULL REFERENCES files (id),
+    level_id INTEGER NOT NULL REFERENCES levels (id),
+    line INTEGER NOT NULL,
+    instance TEXT NOT NULL,
+    message TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS calls_level ON calls (level_id);
+CREATE INDEX IF NOT EXISTS calls_file ON calls (file_id, line);
+CREATE INDEX IF NOT EXISTS calls_message ON calls (message);
+CREATE INDEX IF NOT EXISTS calls_instance ON calls (instance);
+"""
+
+QUERY = """
+SELECT files.name AS file, files.path AS path, calls.line AS line, levels.name AS level,
+    calls.instance AS instance, calls.message AS message
+FROM calls
+JOIN files ON files.id = calls.file_id
+JOIN levels ON levels.id = calls.level_id
+"""
+
+
+class LogDatabase:
+    """SQLite database of the log calls, queried without reading the source tree again.
+
+    The records are the ones written by the JSON Lines and CSV formats, the paths are relative to the source
+    directory. Each run replaces the calls of its instance name.
+
+    Usage:
+        database = LogDatabase(Path("docs", "LOGGED_MESSAGES.db"))
+        database.write("logger", generator.iter_records("logger"))
+        database.query(levels=["ERROR"], path="payments/", message="Unable to *")
+    """
+
+    def __init__(self, database_file: Path):
+        self._database_file = Path(database_file)
+
+    @property
+    def database_file(self) -> Path:
+        """The path of the database file."""
+        return self._database_file
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database, creating the tables if needed.
+
+        Returns:
+            sqlite3.Connection: the connection, to be closed by the caller
+        """
+        connection = sqlite3.connect(self._database_file)
+        version = connection.execute("PRAGMA user_version").fetchone()[0]
+
+        if version == SCHEMA_VERSION:
+            return connection
+
+        if version:
+            logger.info("Creating {} again, written with schema version {}", self._database_file, version)
+            for table in ("calls", "files", "levels"):
+                connection.execute(f"DROP TABLE IF EXISTS {table}")
+
+        connection.executescript(SCHEMA)
+        connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+        return connection
+
+    def store(self, instance_name: str, records: Iterable[Dict[str, Union[str, int]]]) -> Iterator[dict]:
+        """Replace the log calls of an instance name, passing the records through as they are stored.
+
+        The calls are committed once all the records are consumed, nothing is changed if the iteration stops early.
+
+        Args:
+            instance_name (str): the instance name the messages were filtered with
+            records (Iterable[Dict[str, Union[str, int]]]): the records, with the RECORD_FIELDS keys
+
+        Yields:
+            dict: the records
+        """
+        records = iter(records)
+
+        with closing(self._connect()) as connection, connection:
+            connection.execute("DELETE FROM calls WHERE instance = ?", (instance_name,))
+            file_ids = {}
+            level_ids = {}
+
+            while True:
+                batch = list(islice(records, BATCH_SIZE))
+
+                if not batch:
+                    break
+
+                rows = []
+
+                for record in batch:
+                    if record["path"] not in file_ids:
+                        file_ids[record["path"]] = self.__get_id(
+                            connection, "files", path=record["path"], name=record["file"]
+                        )
+                    if record["level"] not in level_ids:
+                        level_ids[record["level"]] = self.__get_id(connection, "levels", name=record["level"])
+
+                    rows.append(
+                        (
+                            file_ids[record["path"]],
+                            level_ids[record["level"]],
+                            record["line"],
+                            instance_name,
+                            record["message"],
+                        )
+                    )
+
+                connection.executemany(
+                    "INSERT INTO calls (file_id, level_id, line, instance, message) VALUES (?, ?, ?, ?, ?)", rows
+                )
+
+                yield from batch
+
+            connection.execute("DELETE FROM files WHERE id NOT IN (SELECT file_id FROM calls)")
+            # statistics of the indexes, without them the planner picks the level index and sorts all its calls
+            connection.execute("ANALYZE")
+
+        logger.debug("Saved the log calls of {} to {}", instance_name, self._database_file)
+
+    def write(self, instance_name: str, records: Iterable[Dict[str, Union[str, int]]]) -> int:
+        """Replace the log calls of an instance name.
+
+        Args:
+            instance_name (str): the instance name the messages were filtered with
+            records (Iterable[Dict[str, Union[str, int]]]): the records, with the RECORD_FIELDS keys
+
+        Returns:
+            int: the number of calls stored
+        """
+        return sum(1 for _ in self.store(instance_name, records))
+
+    @staticmethod
+    def __get_id(connection: sqlite3.Connection, table: str, **values: str) -> int:
+        """Get the id of the row with the first value, inserted if missing"""
+        columns = ", ".join(values)
+        placeholders = ", ".join("?" * len(values))
+        connection.execute(f"INSERT OR IGNORE INTO {table} ({columns}) VALUES ({placeholders})", tuple(values.values()))
+        key, value = next(iter(values.items()))
+
+        return connection.execute(f"SELECT id FROM {table} WHERE {key} = ?", (value,)).fetchone()[0]
+
+    def query(
+        self,
+        levels: List[str] = None,
+        path: str = None,
+        message: str = None,
+        instance_name: str = None,
+        limit: int = None,
+    ) -> List[dict]:
+        """Get the log calls matching all the given filters, sorted by path and line.
+
+        Args:
+            levels (List[str]): the levels of the calls, i.e. ["ERROR", "CRITICAL"]
+            path (str): the prefix of the path relative to the source directory, i.e. "payments/"
+            message (str): the glob pattern matching the whole message, case sensitive, i.e. "Unable to *"
+            instance_name (str): the instance name the messages were filtered with
+            limit (int): the maximum number of calls
+
+        Returns:
+            List[dict]: the records, with the RECORD_FIELDS keys
+        """
+        conditions = []
+        parameters = []
+
+        if levels:
+            conditions.append(f"levels.name IN ({', '.join('?' * len(levels))})")
+            parameters.extend(levels)
+
+        if path:
+            # a range on the unique index of the paths, LIKE and GLOB would scan the table
+            conditions.append("files.path >= ? AND files.path < ?")
+            parameters.extend([path, path[:-1] + chr(ord(path[-1]) + 1)])
+
+        if message:
+            conditions.append("calls.message GLOB ?")
+            parameters.append(message)
+
+        if instance_name:
+            conditions.append("calls.instance = ?")
+            parameters.append(instance_name)
+
+        sql = QUERY
+
+        if conditions:
+            sql += "WHERE " + " AND ".join(conditions) + "\n"
+
+        sql += "ORDER BY files.path, calls.line"
+
+        if limit:
+            sql += " LIMIT ?"
+            parameters.append(limit)
+
+        with closing(self._connect()) as connection:
+            cursor = connection.execute(sql, parameters)
+            columns = [column[0] for column in cursor.description]
+
+            return [dict(zip(columns, row)) for row in cursor]
@@ -0,0 +1,140 @@
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Union
+from loguru import logger
+
+from src import CACHE_FORMAT
+
+
+class LogIndex:
+    """Sidecar index of the logged messages found in each file, written next to the generated documentation.
+
+    The files are stored relative to the source directory so the index can be reused from another checkout. Each file
+    is recorded with its size and mtime when it was parsed, the files without any logged message included, so that a
+    file changed since then is parsed again even when git no longer reports it (i.e. edited then restored).
+
+    Usage:
+        index = LogIndex(Path("docs", "LOGGED_MESSAGES.index.json"), source_dir)
+        index.get("logger")  # {Path(...): {"INFO": {12: "message"}}, ...}
+        index.changed("logger")  # [Path(...), ...]
+        index.set("logger", logged_messages, file_stats)
+        index.save()
+    """
+
+    def __init__(self, index_file: Path, source_dir: Path, version: int = CACHE_FORMAT):
+        self._index_file = Path(index_file)
+        self._source_dir = Path(source_dir)
+        self._version = version
+        self._instances: Dict[str, dict] = self.__load()
+
+    @property
+    def index_file(self) -> Path:
+        """The path of the index file."""
+        return self._index_file
+
+    def __load(self):
+        """Load the index file, discarding it if it was written in another format.
+
+        Returns:
+            dict: the logged messages of each instance name, keyed by relative path
+        """
+        if not self._index_file.is_file():
+            return {}
+
+        try:
+            with self._index_file.open("r") as file_buffer:
+                content = json.load(file_buffer)
+        except (OSError, ValueError) as exc_info:
+            logger.warning("Ignoring unreadable index file {}: {}", self._index_file, exc_info)
+            return {}
+
+        if content.get("version") != self._version:
+            logger.info("Ignoring index file {} written in format {}", self._index_file, content.get("version"))
+            return {}
+
+        return content.get("instances", {})
+
+    def get(self, instance_name: str) -> Union[Dict[Path, dict], None]:
+        """Get the logged messages found in each file.
+
+        Args:
+            instance_name (str): the instance name the messages were filtered with
+
+        Returns:
+            dict|None: the logged messages keyed by level, for each file, empty for the files without any; None if the
+                instance name is not indexed
+        """
+        files = self._instances.get(instance_name)
+
+        if files is None:
+            return None
+
+        return {
+            Path(self._source_dir, relative_path): {
+                # JSON objects only have string keys, restore the line numbers
+                level: {int(lineno): message for lineno, message in messages.items()}
+                for level, messages in entry["stats"].items()
+            }
+            for relative_path, entry in files.items()
+        }
+
+    def changed(self, instance_name: str) -> List[Path]:
+        """List the indexed files whose size or mtime changed since they were parsed, the deleted ones included.
+
+        Args:
+            instance_name (str): the instance name the messages were filtered with
+
+        Returns:
+            List[Path]: the changed files
+        """
+        changed = []
+
+        for relative_path, entry in self._instances.get(instance_name, {}).items():
+            file = Path(self._source_dir, relative_path)
+
+            try:
+                file_stat = file.stat()
+            except FileNotFoundError:
+                changed.append(file)
+                continue
+
+            if entry["size"] != file_stat.st_size or entry["mtime"] != file_stat.st_mtime_ns:
+                changed.append(file)
+
+        return changed
+
+    def set(self, instance_name: str, logged_messages: Dict[Path, dict], file_stats: Dict[Path, os.stat_result]):
+        """Replace the logged messages found in each file.
+
+        Args:
+            instance_name (str): the instance name the messages were filtered with
+            logged_messages (Dict[Path, dict]): the logged messages keyed by level, for each file
+            file_stats (Dict[Path, os.stat_result]): the stat of the files when they were parsed, the files which were
+                not parsed again keep their recorded stat; the files without logged messages are recorded as well
+        """
+        previous = self._instances.get(instance_name, {})
+        files = {}
+
+        for file in sorted(logged_messages.keys() | file_stats.keys()):
+            relative_path = Path(file).relative_to(self._source_dir).as_posix()
+            file_stat = file_stats.get(file)
+
+            if file_stat is not None:
+                size, mtime = file_stat.st_size, file_stat.st_mtime_ns
+            elif relative_path in previous:
+                size, mtime = previous[relative_path]["size"], previous[relative_path]["mtime"]
+            else:
+                # never matches, the file is parsed again on the next run
+                size, mtime = None, None
+
+            files[relative_path] = {"size": size, "mtime": mtime, "stats": logged_messages.get(file, {})}
+
+        self._instances[instance_name] = files
+
+    def save(self):
+        """Write the index file."""
+        with self._index_file.open("w") as file_buffer:
+            json.dump({"version": self._version, "instances": self._instances}, file_buffer)
+
+        logger.debug("Saved index to {}", self._index_file)
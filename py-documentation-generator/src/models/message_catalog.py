@@ -0,0 +1,126 @@
+import re
+from typing import Dict, Iterable, Iterator, List, Union
+
+# a replacement field, with at most one level of nested fields (i.e. "{value:{width}}"), or an escaped brace
+PLACEHOLDER_PATTERN = re.compile(r"\{\{|\}\}|\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}")
+# files listed in the locations of a template, every cell of a markdown column is padded to the widest one
+MAX_FILES = 5
+
+
+def message_template(message: str) -> str:
+    """Get the template of a message, the placeholders collapsed to {}.
+
+    Args:
+        message (str): the rendered message, i.e. "Unable to charge {card.number}"
+
+    Returns:
+        str: the template, i.e. "Unable to charge {}"
+    """
+    return PLACEHOLDER_PATTERN.sub(lambda match: match.group() if match.group() in ("{{", "}}") else "{}", message)
+
+
+class CatalogEntry:
+    """A message template, with the levels and the locations it is logged at."""
+
+    __slots__ = ("template", "count", "levels", "locations")
+
+    def __init__(self, template: str):
+        self.template = template
+        self.count = 0
+        self.levels = set()
+        # line numbers keyed by path, in the order they were found
+        self.locations: Dict[str, List[int]] = {}
+
+    def add(self, level: str, path: str, line: int):
+        self.count += 1
+        self.levels.add(level)
+        self.locations.setdefault(path, []).append(line)
+
+
+class MessageCatalog:
+    """Catalog of the unique message templates, built as the log calls are found.
+
+    The templates are interned in a dict, the rendered messages already seen are mapped straight to their entry so
+    each distinct message is normalized once.
+
+    Usage:
+        catalog = MessageCatalog()
+        catalog.add_records(generator.iter_records("logger"))
+        catalog.entries()  # most logged templates first
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, CatalogEntry] = {}
+        self._messages: Dict[str, CatalogEntry] = {}
+
+    @property
+    def template_count(self) -> int:
+        """The number of unique templates."""
+        return len(self._entries)
+
+    def add(self, message: str, level: str, path: str, line: int):
+        """Add a log call.
+
+        Args:
+            message (str): the rendered message
+            level (str): the level of the call
+            path (str): the path of the file, relative to the source directory
+            line (int): the line of the call
+        """
+        entry = self._messages.get(message)
+
+        if entry is None:
+            template = message_template(message)
+            entry = self._entries.get(template)
+
+            if entry is None:
+                entry = self._entries[template] = CatalogEntry(template)
+
+            self._messages[message] = entry
+
+        entry.add(level, path, line)
+
+    def add_records(self, records: Iterable[Dict[str, Union[str, int]]]) -> int:
+        """Add the log calls of records.
+
+        Args:
+            records (Iterable[Dict[str, Union[str, int]]]): the records, with the RECORD_FIELDS keys
+
+        Returns:
+            int: the number of calls added
+        """
+        count = 0
+
+        for record in records:
+            self.add(record["message"], record["level"], record["path"], record["line"])
+            count += 1
+
+        return count
+
+    def entries(self) -> List[CatalogEntry]:
+        """Get the templates, the most logged first then in alphabetical order.
+
+        Returns:
+            List[CatalogEntry]: the entries
+        """
+        return sorted(self._entries.values(), key=lambda entry: (-entry.count, entry.template))
+
+    def rows(self, level_order: List[str], max_files: int = MAX_FILES) -> Iterator[List[str]]:
+        """Generate the rows of the markdown table.
+
+        Args:
+            level_order (List[str]): the levels, in the order they are listed in
+            max_files (int): the number of files listed in the locations, the others are counted
+
+        Yields:
+            list: template, count, levels and locations (the lines grouped by file)
+        """
+        for entry in self.entries():
+            levels = ", ".join(level for level in level_order if level in entry.levels)
+            files = list(entry.locations.items())
+            locations = ", ".join(f"{path}:{','.join(map(str, lines))}" for path, lines in files[:max_files])
+
+            if len(files) > max_files:
+                locations += f" and {len(files) - max_files} more files"
+
+            yield [f"`{entry.template}`", str(entry.count), levels, locations]
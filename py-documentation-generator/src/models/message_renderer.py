@@ -0,0 +1,119 @@
+import ast
+import re
+from typing import List, Union
+
+# a string literal with its optional prefix, or a comment between implicitly concatenated literals
+LITERAL_PATTERN = re.compile(
+    r"""[rRbBuUfF]{0,2}(?:'''(?P<triple_single>(?:[^\\]|\\.)*?)'''"""
+    r'''|"""(?P<triple_double>(?:[^\\]|\\.)*?)"""'''
+    r"""|'(?P<single>(?:[^'\\\n]|\\.)*)'"""
+    r'''|"(?P<double>(?:[^"\\\n]|\\.)*)"'''
+    r"""|(?P<comment>\#[^\n]*))""",
+    re.DOTALL,
+)
+# a run of whitespace and comments, or same as LITERAL_PATTERN
+NORMALIZE_PATTERN = re.compile(rf"(?P<whitespace>(?:\s|\#[^\n]*)+)|{LITERAL_PATTERN.pattern}", re.DOTALL)
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+class MessageRenderer:
+    """Render the arguments of a log call as they are written in the source code.
+
+    The text of each argument is sliced from the source code using the offsets of its node. The quotes and prefix of
+    an argument which is a string literal or an f-string are dropped, the other arguments are kept as they are written
+    and only the whitespaces outside of their string literals are collapsed.
+
+    Usage:
+        renderer = MessageRenderer(source_code)
+        renderer.render(call_node.args)
+    """
+
+    def __init__(self, source_code: Union[str, None] = None):
+        self._source = source_code.encode("utf-8") if source_code is not None else None
+        self._line_offsets: Union[List[int], None] = None
+
+    def __offsets(self):
+        """Get the offset of the start of each line, computed on first use.
+
+        Returns:
+            List[int]: offsets in bytes, indexed by line number - 1
+        """
+        if self._line_offsets is None:
+            self._line_offsets = [0]
+            for line in self._source.splitlines(keepends=True):
+                self._line_offsets.append(self._line_offsets[-1] + len(line))
+
+        return self._line_offsets
+
+    def segment(self, node: ast.AST) -> str:
+        """Get the source code of a node.
+
+        Falls back to unparsing the node when the renderer has no source code.
+
+        Args:
+            node (ast.AST): the node, usually an argument of a call
+
+        Returns:
+            str: the source code of the node
+        """
+        if self._source is None or getattr(node, "end_lineno", None) is None:
+            return ast.unparse(node)
+
+        offsets = self.__offsets()
+        # col_offset and end_col_offset are byte offsets in the UTF-8 encoded line
+        start = offsets[node.lineno - 1] + node.col_offset
+        end = offsets[node.end_lineno - 1] + node.end_col_offset
+
+        return self._source[start:end].decode("utf-8")
+
+    @staticmethod
+    def _literal_body(match: re.Match) -> str:
+        """Get the content of a string literal matched by LITERAL_PATTERN."""
+        for group in ("single", "double", "triple_double", "triple_single"):
+            body = match.group(group)
+            if body is not None:
+                return body
+
+        return ""
+
+    @staticmethod
+    def _normalize(match: re.Match) -> str:
+        """Collapse a run of whitespace and drop a comment, leaving the string literals as they are written."""
+        if match.group("whitespace") is not None:
+            return " "
+
+        if match.group("comment") is not None:
+            return ""
+
+        return match.group(0)
+
+    def render_node(self, node: ast.AST) -> str:
+        """Render a single argument.
+
+        Args:
+            node (ast.AST): the argument
+
+        Returns:
+            str: the normalized text of the argument
+        """
+        text = self.segment(node)
+
+        if isinstance(node, ast.JoinedStr) or (isinstance(node, ast.Constant) and isinstance(node.value, (str, bytes))):
+            # implicitly concatenated literals are joined, whatever separates them is dropped
+            text = "".join(self._literal_body(match) for match in LITERAL_PATTERN.finditer(text))
+
+            return WHITESPACE_PATTERN.sub(" ", text).strip()
+
+        # the literals nested in an expression (i.e. the key of `content.get("version")`) keep their quotes
+        return NORMALIZE_PATTERN.sub(self._normalize, text).strip()
+
+    def render(self, nodes: List[ast.AST]) -> str:
+        """Render the arguments of a call as a single message.
+
+        Args:
+            nodes (List[ast.AST]): the arguments
+
+        Returns:
+            str: the message
+        """
+        return " ".join(self.render_node(node) for node in nodes)
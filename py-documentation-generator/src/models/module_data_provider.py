@@ -1,7 +1,76 @@
+from fnmatch import fnmatch
+import hashlib
+from itertools import chain, repeat
+import os
 from pathlib import Path
+from typing import Callable, Iterator, List, Tuple, Union
+from loguru import logger
 
 from src.models import MissingModuleFilesException
+from src.models.file_prefetcher import FilePrefetcher
 from src.models.local_modules import LocalModule
+from src.models.module_manifest import ModuleManifest
+from src.models.package_selection import PackageSelection
+from src.models.source_index import SourceIndex
+from src.models.tracer import tracer
+
+
+def _analyse_module(path: Path, trace: bool = False) -> Tuple[LocalModule, tuple]:
+    """Analyse a module, called in the worker processes.
+
+    Args:
+        path (Path): the module
+        trace (bool): whether or not to record the trace events of the module
+
+    Returns:
+        Tuple[LocalModule, tuple]: the module and the trace events recorded while analysing it
+    """
+    tracer.reset(trace)
+    module = LocalModule.from_path(path)
+
+    return module, tuple(tracer.events)
+
+
+def _analyse_if_changed(
+    path: Path, content: bytes, previous_hash: Union[str, None], source_index: SourceIndex = None
+) -> Tuple[Union[LocalModule, None], str]:
+    """Hash the content of a module and analyse it if it differs from its recorded version.
+
+    Args:
+        path (Path): the module
+        content (bytes): the content of the module
+        previous_hash (str|None): the content hash of the recorded version of the module
+        source_index (SourceIndex): the index to get the parsed module from
+
+    Returns:
+        Tuple[LocalModule|None, str]: the module, None when its content is unchanged, and its content hash
+    """
+    content_hash = hashlib.sha256(content).hexdigest()
+
+    if content_hash == previous_hash:
+        return None, content_hash
+
+    return LocalModule.from_path(path, source_index, content), content_hash
+
+
+def _analyse_changed_module(
+    path: Path, previous_hash: Union[str, None], trace: bool = False
+) -> Tuple[Union[LocalModule, None], str, tuple]:
+    """Read, hash and analyse a module if it changed, called in the worker processes.
+
+    Args:
+        path (Path): the module
+        previous_hash (str|None): the content hash of the recorded version of the module
+        trace (bool): whether or not to record the trace events of the module
+
+    Returns:
+        Tuple[LocalModule|None, str, tuple]: the module, None when its content is unchanged, its content hash and the
+            trace events recorded while analysing it
+    """
+    tracer.reset(trace)
+    module, content_hash = _analyse_if_changed(path, path.read_bytes(), previous_hash)
+
+    return module, content_hash, tuple(tracer.events)
 
 
 class ModuleDataProvider:
@@ -13,9 +82,19 @@ class ModuleDataProvider:
         ".DS_Store",
     ]
 
-    def __get_files(self, node: Path, show_empty: bool = False):
+    @staticmethod
+    def __scan(node: Path) -> List[os.DirEntry]:
+        """List a directory, sorted by name.
+
+        The entries cache their type and their stat result, the directory is listed once for both the check of the
+        package and the walk.
+        """
+        with os.scandir(node) as entries:
+            return sorted(entries, key=lambda entry: entry.name)
+
+    def __get_files(self, node: Path, entries: List[os.DirEntry], show_empty: bool = False):
         """Get all files in the current directory"""
-        files = sorted([n for n in node.glob("*.py") if n.is_file()])
+        files = [entry for entry in entries if fnmatch(entry.name, "*.py") and entry.is_file()]
 
         if len(files) < 1:
             raise MissingModuleFilesException(f'No source files found in "{node}". Are you sure this is a module?')
@@ -24,55 +103,273 @@ class ModuleDataProvider:
             raise MissingModuleFilesException(f'No __init__.py found in "{node}". Are you sure this is a module?')
 
         if show_empty:
-            return [n for n in files if n.stat().st_size > 0]
+            return [entry for entry in files if entry.stat().st_size > 0]
 
         return files
 
-    def __walk(self, root: Path, show_empty: bool = False):
+    def __walk(
+        self,
+        entries: List[os.DirEntry],
+        show_empty: bool = False,
+        source_index: SourceIndex = None,
+        deferred: List[Tuple[dict, os.DirEntry]] = None,
+        lazy: bool = False,
+        selection: PackageSelection = None,
+        package: Tuple[str, ...] = (),
+    ) -> Iterator[Tuple[str, dict]]:
         """Walk through directories
 
         Args:
-            root (Path): Root directory
+            entries (List[os.DirEntry]): the entries of the directory, sorted by name
             show_empty (bool): Show empty files
+            source_index (SourceIndex): the index to get the parsed modules from
+            deferred (List[Tuple[dict, os.DirEntry]]): the modules to analyse after the walk, analysed while walking if
+                None
+            lazy (bool): whether or not the data of the sub-packages is walked only when it is iterated, it is a dict
+                otherwise
+            selection (PackageSelection): the packages to list, the others are not listed nor their modules analysed
+            package (Tuple[str, ...]): the names of the directory from the root
 
-        Returns:
-            Dict: JSON representation of node
+        Yields:
+            Tuple[str, dict]: the name and JSON representation of each package and module of the directory
         """
-        modules = {}
+        selected = selection is None or selection.selects(package)
+
+        for entry in entries:
+            node = Path(entry.path)
+
+            if entry.is_dir() and node.name not in self.BLACKLISTED_DIRS:
+                sub_package = (*package, node.name)
 
-        for node in sorted(root.iterdir()):
+                if selection is not None and not selection.walks(sub_package):
+                    continue
 
-            if node.is_dir() and node.name not in self.BLACKLISTED_DIRS:
+                children = self.__scan(node)
                 # Check if directory is a module
-                leafs = self.__get_files(node, show_empty)
+                leafs = self.__get_files(node, children, show_empty)
 
                 if "__init__.py" in [n.name for n in leafs]:
-                    modules[node.name] = {
-                        "type": "package",
-                        "data": self.__walk(node),
-                    }
+                    walk = self.__walk(
+                        children,
+                        source_index=source_index,
+                        deferred=deferred,
+                        lazy=lazy,
+                        selection=selection,
+                        package=sub_package,
+                    )
+
+                    if selection is not None and not selection.selects(sub_package):
+                        # a package only walked to reach the selected ones is left out when none is found under it
+                        first = next(walk, None)
+
+                        if first is None:
+                            continue
+
+                        walk = chain([first], walk)
+
+                    yield node.name, {"type": "package", "data": walk if lazy else dict(walk)}
 
-            if node.is_file() and node.stat().st_size > 0:
-                modules[node.name] = {
+            if selected and entry.is_file() and entry.stat().st_size > 0:
+                module = {
                     "type": "module",
-                    "data": LocalModule.from_path(node),
+                    "data": None if deferred is not None else LocalModule.from_path(node, source_index),
                 }
 
-        return modules
+                if deferred is not None:
+                    deferred.append((module, entry))
 
-    def serialize(self, root: Path, show_empty: bool = False):
+                yield node.name, module
+
+    def serialize(
+        self,
+        root: Path,
+        show_empty: bool = False,
+        source_index: SourceIndex = None,
+        io_threads: int = 0,
+        jobs: int = 1,
+        manifest: ModuleManifest = None,
+        selection: PackageSelection = None,
+    ):
         """Serialize package data.
 
+        The packages are walked first, the modules are then analysed in a process pool when more than one job is
+        requested, and slotted back in the tree in the order they were found.
+
         Args:
             root (Path): Root directory
             show_empty (bool): Show empty files
+            source_index (SourceIndex): the index to get the parsed modules from, each module is parsed otherwise
+            io_threads (int): the number of modules read at the same time while they are analysed, 0 to read each
+                module when it is analysed
+            jobs (int): the number of processes analysing the modules, ignored with a source index
+            manifest (ModuleManifest): the modules of the previous run, only the new or changed modules are analysed
+                and the manifest is updated with them, the modules of the packages left out by the selection are kept
+            selection (PackageSelection): the packages to list, the walk is pruned before their directories are listed
 
         Returns:
             Dict: JSON representation of package
         """
+        jobs = 1 if source_index is not None else jobs
+        deferred = [] if io_threads > 0 or jobs > 1 or manifest is not None else None
+
+        with tracer.span("walk"):
+            data = {
+                root.name: {
+                    "type": "package",
+                    "data": dict(
+                        self.__walk(self.__scan(root), show_empty, source_index, deferred, selection=selection)
+                    ),
+                }
+            }
+
+        if deferred and manifest is not None:
+            with tracer.span("analyse"):
+                self.__analyse_changed(deferred, manifest, source_index, io_threads, jobs)
+        elif deferred:
+            with tracer.span("analyse"):
+                self.__analyse(deferred, source_index, io_threads, jobs)
+
+        if manifest is not None and selection is not None:
+            # the packages which were not walked are not removed, their modules are kept as they were recorded
+            base = Path(root).relative_to(Path.cwd())
+            manifest.carry_over(lambda key: not self.__listed(selection, base, key))
+
+        return data
+
+    @staticmethod
+    def __listed(selection: PackageSelection, base: Path, key: str) -> bool:
+        """Whether or not the module of a manifest key is in the selected packages.
+
+        Args:
+            selection (PackageSelection): the packages to list
+            base (Path): the root directory, relative to the working directory
+            key (str): the path of the module, relative to the working directory
+
+        Returns:
+            bool: True when the module is in a selected package, or outside of the root directory
+        """
+        package = Path(key).parent
+
+        if package != base and base not in package.parents:
+            return True
+
+        return selection.selects(package.relative_to(base).parts)
+
+    def iter_serialize(
+        self,
+        root: Path,
+        show_empty: bool = False,
+        source_index: SourceIndex = None,
+        selection: PackageSelection = None,
+    ):
+        """Same as serialize, the packages are walked and the modules analysed as the data is iterated.
+
+        The data of each package is an iterator of (name, node) pairs instead of a dict, only the directories from the
+        root to the current package are held in memory, i.e. while a JsonStreamWriter writes them.
+
+        Args:
+            root (Path): Root directory
+            show_empty (bool): Show empty files
+            source_index (SourceIndex): the index to get the parsed modules from, each module is parsed otherwise
+            selection (PackageSelection): the packages to list, the walk is pruned before their directories are listed
+
+        Returns:
+            Dict: JSON representation of package, with the data of the packages as iterators
+        """
         return {
             root.name: {
                 "type": "package",
-                "data": self.__walk(root, show_empty),
+                "data": self.__walk(self.__scan(root), show_empty, source_index, lazy=True, selection=selection),
             }
         }
+
+    @staticmethod
+    def __read(nodes: List[Path], io_threads: int) -> Iterator[Tuple[Path, bytes]]:
+        """Read the modules, in a thread pool when I/O threads are requested"""
+        if io_threads > 0:
+            return FilePrefetcher(io_threads).read(nodes)
+
+        return ((node, node.read_bytes()) for node in nodes)
+
+    def __analyse_changed(
+        self,
+        deferred: List[Tuple[dict, os.DirEntry]],
+        manifest: ModuleManifest,
+        source_index: SourceIndex,
+        io_threads: int,
+        jobs: int,
+    ):
+        """Take the unchanged modules from the manifest and analyse the others, the manifest is updated with them.
+
+        The modules whose size or mtime changed are read and hashed, only those whose content changed are analysed.
+        Each module is hashed and analysed right after it is read, by the worker processes with several jobs, its
+        content is not kept once it is analysed.
+        """
+        cwd = Path.cwd()
+        touched = []
+
+        for module, entry in deferred:
+            key = Path(entry.path).relative_to(cwd).as_posix()
+            local_module = manifest.get(key, entry.stat())
+
+            if local_module is None:
+                touched.append((module, entry, key))
+            else:
+                module["data"] = local_module
+
+        logger.debug("{} of {} modules taken from the manifest by their stat", manifest.hits, len(deferred))
+        nodes = [Path(entry.path) for _, entry, _ in touched]
+        previous_hashes = [manifest.get_hash(key) for _, _, key in touched]
+
+        if jobs > 1 and len(touched) > 1:
+            results = self.__map(_analyse_changed_module, jobs, nodes, previous_hashes)
+        else:
+            results = (
+                _analyse_if_changed(node, content, previous_hash, source_index)
+                for (node, content), previous_hash in zip(self.__read(nodes, io_threads), previous_hashes)
+            )
+
+        for (module, entry, key), (local_module, content_hash) in zip(touched, results):
+            if local_module is None:
+                module["data"] = manifest.refresh(key, entry.stat())
+            else:
+                module["data"] = local_module
+                manifest.put(key, entry.stat(), content_hash, local_module)
+
+    @staticmethod
+    def __map(worker: Callable, jobs: int, *iterables: list) -> Iterator[tuple]:
+        """Run a worker on each module in a process pool, the trace events recorded by the workers are merged.
+
+        The worker takes the items of the iterables and whether or not to trace, it returns its results followed by
+        its trace events.
+        """
+        # multiprocessing is only needed with several jobs
+        from concurrent.futures import ProcessPoolExecutor  # pylint: disable=import-outside-toplevel
+
+        logger.debug("Analysing {} modules with {} jobs", len(iterables[0]), jobs)
+        chunksize = max(1, len(iterables[0]) // (jobs * 4))
+
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            for *result, events in executor.map(worker, *iterables, repeat(tracer.enabled), chunksize=chunksize):
+                tracer.extend(events)
+                yield tuple(result)
+
+    def __analyse(
+        self,
+        deferred: List[Tuple[dict, os.DirEntry]],
+        source_index: SourceIndex,
+        io_threads: int,
+        jobs: int,
+    ):
+        """Analyse the modules found by the walk, in a process pool when more than one job is requested."""
+        nodes = [Path(entry.path) for _, entry in deferred]
+
+        if jobs > 1 and len(deferred) > 1:
+            for (module, _), (local_module,) in zip(deferred, self.__map(_analyse_module, jobs, nodes)):
+                module["data"] = local_module
+        else:
+            # without I/O threads each module is read when it is analysed, unless the source index already holds it
+            contents = (content for _, content in self.__read(nodes, io_threads)) if io_threads > 0 else repeat(None)
+
+            for (module, _), node, content in zip(deferred, nodes, contents):
+                module["data"] = LocalModule.from_path(node, source_index, content)
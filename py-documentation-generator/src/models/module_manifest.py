@@ -0,0 +1,186 @@
+import json
+import os
+from pathlib import Path
+from typing import Callable, Dict, List, Union
+from loguru import logger
+
+from src import CACHE_FORMAT
+from src.models.local_modules import LocalModule
+
+# extension of the manifest, next to the JSON and markdown listings
+MANIFEST_EXTENSION = "manifest.json"
+# the symbols of a module compared by the diff, as they are named in the JSON listing
+SYMBOL_FIELDS = ("_functions", "_classes")
+
+
+class ModuleManifest:
+    """Manifest of the modules of a listing, stored next to it.
+
+    Each module is recorded with the size, mtime and content hash of its file, and with its symbols. A module whose
+    size and mtime are unchanged is taken from the manifest without reading its file, the content hash allows to reuse
+    a module whose file was touched but not modified (i.e. a fresh checkout). Only the modules recorded since the
+    manifest was loaded are saved, the others were removed from the tree, unless they are carried over because their
+    package was not listed this time.
+
+    Usage:
+        manifest = ModuleManifest(Path("docs", "MODULES.manifest.json"))
+        module = manifest.get("src/main.py", file.stat())
+        ...
+        manifest.put("src/main.py", file.stat(), content_hash, module)
+        manifest.diff()
+        manifest.save()
+    """
+
+    def __init__(self, manifest_file: Path, version: int = CACHE_FORMAT):
+        self._manifest_file = Path(manifest_file)
+        self._version = version
+        # the modules of the previous run, and the modules of this run
+        self._previous: Dict[str, dict] = self.__load()
+        self._entries: Dict[str, dict] = {}
+        self._hits = 0
+
+    @property
+    def hits(self) -> int:
+        """The number of modules taken from the manifest."""
+        return self._hits
+
+    def __load(self):
+        """Load the modules from the manifest file, discarding it if it was written in another format.
+
+        Returns:
+            dict: the entries keyed by module path
+        """
+        if not self._manifest_file.is_file():
+            return {}
+
+        try:
+            with self._manifest_file.open("r") as file_buffer:
+                content = json.load(file_buffer)
+        except (OSError, ValueError) as exc_info:
+            logger.warning("Ignoring unreadable manifest file {}: {}", self._manifest_file, exc_info)
+            return {}
+
+        if content.get("version") != self._version:
+            logger.info("Ignoring manifest file {} written in format {}", self._manifest_file, content.get("version"))
+            return {}
+
+        return content.get("modules", {})
+
+    def get(self, key: str, file_stat: os.stat_result) -> Union[LocalModule, None]:
+        """Get a module if its file is unchanged since it was recorded.
+
+        Args:
+            key (str): the path of the module, relative to the working directory
+            file_stat (os.stat_result): the current stat of the file
+
+        Returns:
+            LocalModule|None: the module
+        """
+        entry = self._previous.get(key)
+
+        if entry and entry["size"] == file_stat.st_size and entry["mtime"] == file_stat.st_mtime_ns:
+            self._entries[key] = entry
+            self._hits += 1
+            return LocalModule.from_dict(entry["module"])
+
+        return None
+
+    def get_hash(self, key: str) -> Union[str, None]:
+        """Get the content hash of the recorded version of a module.
+
+        Args:
+            key (str): the path of the module, relative to the working directory
+
+        Returns:
+            str|None: the content hash
+        """
+        entry = self._previous.get(key)
+
+        return entry["hash"] if entry else None
+
+    def refresh(self, key: str, file_stat: os.stat_result) -> LocalModule:
+        """Update the stat of a module whose content is unchanged and get it.
+
+        Args:
+            key (str): the path of the module, relative to the working directory
+            file_stat (os.stat_result): the current stat of the file
+
+        Returns:
+            LocalModule: the module
+        """
+        entry = self._entries[key] = {**self._previous[key], "size": file_stat.st_size, "mtime": file_stat.st_mtime_ns}
+        self._hits += 1
+
+        return LocalModule.from_dict(entry["module"])
+
+    def put(self, key: str, file_stat: os.stat_result, content_hash: str, module: LocalModule):
+        """Add or replace a module.
+
+        Args:
+            key (str): the path of the module, relative to the working directory
+            file_stat (os.stat_result): the stat of the file when it was read
+            content_hash (str): the hash of the content of the file
+            module (LocalModule): the analysed module
+        """
+        self._entries[key] = {
+            "size": file_stat.st_size,
+            "mtime": file_stat.st_mtime_ns,
+            "hash": content_hash,
+            "module": module.to_dict(),
+        }
+
+    def carry_over(self, unlisted: Callable[[str], bool]):
+        """Keep the recorded modules which were not listed in this run, i.e. outside of the selected packages.
+
+        They are saved as they were recorded and are neither added, removed nor changed in the diff.
+
+        Args:
+            unlisted (Callable[[str], bool]): whether or not the module of a path was left out of the listing
+        """
+        for key, entry in self._previous.items():
+            if key not in self._entries and unlisted(key):
+                self._entries[key] = entry
+
+    def diff(self) -> Dict[str, List]:
+        """Get the modules added, removed and changed since the manifest was loaded.
+
+        Returns:
+            Dict[str, List]: the sorted paths of the added and removed modules, and the changed modules with the
+                symbols added and removed, i.e.
+                `{"module": "src/main.py", "_functions": {"added": ["main"], "removed": []}, "_classes": {...}}`
+        """
+        changed = []
+
+        for key in sorted(self._entries.keys() & self._previous.keys()):
+            entry = self._entries[key]
+            previous = self._previous[key]
+
+            if entry["hash"] == previous["hash"]:
+                continue
+
+            change = {"module": key}
+
+            for field in SYMBOL_FIELDS:
+                symbols = set(entry["module"][field])
+                previous_symbols = set(previous["module"][field])
+                change[field] = {
+                    "added": sorted(symbols - previous_symbols),
+                    "removed": sorted(previous_symbols - symbols),
+                }
+
+            changed.append(change)
+
+        return {
+            "added": sorted(self._entries.keys() - self._previous.keys()),
+            "removed": sorted(self._previous.keys() - self._entries.keys()),
+            "changed": changed,
+        }
+
+    def save(self):
+        """Write the manifest file, with the modules recorded since it was loaded."""
+        self._manifest_file.parent.mkdir(parents=True, exist_ok=True)
+
+        with self._manifest_file.open("w") as file_buffer:
+            json.dump({"version": self._version, "modules": self._entries}, file_buffer)
+
+        logger.debug("Saved {} modules to {}", len(self._entries), self._manifest_file)
@@ -0,0 +1,60 @@
+from fnmatch import fnmatchcase
+from typing import Iterable, Tuple
+
+
+class PackageSelection:
+    """Packages of the source directory to list, decided from their names before their directory is listed.
+
+    The packages are named from the source directory with dots, i.e. "models.payments", the source directory itself
+    is "". The patterns are globs matched one name at a time, "*" does not cross dots: "*.payments" selects the
+    payments package of every top-level package. A selected package is listed with all its sub-packages, up to
+    `max_depth` levels below the source directory. Excluded packages are never listed, even when included.
+
+    Usage:
+        selection = PackageSelection(include=["models"], exclude=["models.legacy"], max_depth=3)
+        selection.walks(("models",))  # True
+        selection.selects(("models", "legacy"))  # False
+    """
+
+    def __init__(self, include: Iterable[str] = (), exclude: Iterable[str] = (), max_depth: int = None):
+        self._include = [tuple(pattern.split(".")) for pattern in include]
+        self._exclude = [tuple(pattern.split(".")) for pattern in exclude]
+        self._max_depth = max_depth
+
+    @staticmethod
+    def __matches(pattern: Tuple[str, ...], package: Tuple[str, ...]) -> bool:
+        return len(pattern) <= len(package) and all(map(fnmatchcase, package, pattern))
+
+    def selects(self, package: Tuple[str, ...]) -> bool:
+        """Whether or not the modules of a package are listed.
+
+        Args:
+            package (Tuple[str, ...]): the names of the package from the source directory, () for the source directory
+
+        Returns:
+            bool: True when the package is neither too deep nor excluded, and it or one of its parents is included
+        """
+        if not self.walks(package):
+            return False
+
+        return not self._include or any(self.__matches(pattern, package) for pattern in self._include)
+
+    def walks(self, package: Tuple[str, ...]) -> bool:
+        """Whether or not the directory of a package is listed, either to list its modules or to reach an included
+        package.
+
+        Args:
+            package (Tuple[str, ...]): the names of the package from the source directory, () for the source directory
+
+        Returns:
+            bool: True when the package is neither too deep nor excluded, and it can be or lead to an included package
+        """
+        if self._max_depth is not None and len(package) > self._max_depth:
+            return False
+
+        if any(self.__matches(pattern, package) for pattern in self._exclude):
+            return False
+
+        # the names are compared up to the shortest: the included packages, their sub-packages and their parents, which
+        # are walked to reach them
+        return not self._include or any(all(map(fnmatchcase, package, pattern)) for pattern in self._include)
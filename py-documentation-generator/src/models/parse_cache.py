@@ -0,0 +1,155 @@
+import json
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Union
+from loguru import logger
+
+from src import CACHE_FORMAT
+
+
+class ParseCache:
+    """On-disk cache of the logged messages found in each source file.
+
+    The entries are keyed on the instance name and the path of the file, they are valid as long as the size and mtime
+    of the file are unchanged. The content hash allows to reuse an entry for a file which was touched but not modified.
+    The least recently used entries are evicted once the cache holds more than `max_entries`.
+
+    Usage:
+        cache = ParseCache(Path(".cache", "logged_messages.json"))
+        stats = cache.get("logger", file, file.stat())
+        ...
+        cache.put("logger", file, file.stat(), content_hash, stats)
+        cache.save()
+    """
+
+    DEFAULT_MAX_ENTRIES = 100000
+
+    def __init__(self, cache_file: Path, max_entries: int = DEFAULT_MAX_ENTRIES, version: int = CACHE_FORMAT):
+        self._cache_file = Path(cache_file)
+        self._max_entries = max_entries
+        self._version = version
+        self._entries: OrderedDict = self.__load()
+        self._hits = 0
+
+    @property
+    def hits(self) -> int:
+        """The number of entries served from the cache."""
+        return self._hits
+
+    def __load(self):
+        """Load the entries from the cache file, discarding it if it was written in another format.
+
+        Returns:
+            OrderedDict: the entries, from the least to the most recently used
+        """
+        if not self._cache_file.is_file():
+            return OrderedDict()
+
+        try:
+            with self._cache_file.open("r") as file_buffer:
+                content = json.load(file_buffer)
+        except (OSError, ValueError) as exc_info:
+            logger.warning("Ignoring unreadable cache file {}: {}", self._cache_file, exc_info)
+            return OrderedDict()
+
+        if content.get("version") != self._version:
+            logger.info("Ignoring cache file {} written in format {}", self._cache_file, content.get("version"))
+            return OrderedDict()
+
+        return OrderedDict(content.get("entries", {}))
+
+    @staticmethod
+    def __key(instance_name: str, file: Path):
+        return f"{instance_name}:{file}"
+
+    @staticmethod
+    def __decode(stats: Dict[str, Dict[str, str]]):
+        # JSON objects only have string keys, restore the line numbers
+        return {level: {int(lineno): message for lineno, message in messages.items()} for level, messages in stats.items()}
+
+    def get(self, instance_name: str, file: Path, file_stat: os.stat_result) -> Union[dict, None]:
+        """Get the logged messages of a file if it is unchanged since it was cached.
+
+        Args:
+            instance_name (str): the instance name the messages were filtered with
+            file (Path): the source file
+            file_stat (os.stat_result): the current stat of the source file
+
+        Returns:
+            dict|None: the logged messages keyed by level
+        """
+        key = self.__key(instance_name, file)
+        entry = self._entries.get(key)
+
+        if entry and entry["size"] == file_stat.st_size and entry["mtime"] == file_stat.st_mtime_ns:
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return self.__decode(entry["stats"])
+
+        return None
+
+    def get_hash(self, instance_name: str, file: Path) -> Union[str, None]:
+        """Get the content hash of the cached version of a file.
+
+        Args:
+            instance_name (str): the instance name the messages were filtered with
+            file (Path): the source file
+
+        Returns:
+            str|None: the content hash
+        """
+        entry = self._entries.get(self.__key(instance_name, file))
+
+        return entry["hash"] if entry else None
+
+    def refresh(self, instance_name: str, file: Path, file_stat: os.stat_result) -> dict:
+        """Update the stat of an entry whose content is unchanged and get its logged messages.
+
+        Args:
+            instance_name (str): the instance name the messages were filtered with
+            file (Path): the source file
+            file_stat (os.stat_result): the current stat of the source file
+
+        Returns:
+            dict: the logged messages keyed by level
+        """
+        key = self.__key(instance_name, file)
+        entry = self._entries[key]
+        entry["size"] = file_stat.st_size
+        entry["mtime"] = file_stat.st_mtime_ns
+        self._entries.move_to_end(key)
+        self._hits += 1
+
+        return self.__decode(entry["stats"])
+
+    def put(self, instance_name: str, file: Path, file_stat: os.stat_result, content_hash: str, stats: dict):
+        """Add or replace the logged messages of a file.
+
+        Args:
+            instance_name (str): the instance name the messages were filtered with
+            file (Path): the source file
+            file_stat (os.stat_result): the stat of the source file when it was read
+            content_hash (str): the hash of the content of the source file
+            stats (dict): the logged messages keyed by level
+        """
+        key = self.__key(instance_name, file)
+        self._entries[key] = {
+            "size": file_stat.st_size,
+            "mtime": file_stat.st_mtime_ns,
+            "hash": content_hash,
+            "stats": stats,
+        }
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def save(self):
+        """Write the cache file."""
+        self._cache_file.parent.mkdir(parents=True, exist_ok=True)
+
+        with self._cache_file.open("w") as file_buffer:
+            json.dump({"version": self._version, "entries": self._entries}, file_buffer)
+
+        logger.debug("Saved {} entries to {}", len(self._entries), self._cache_file)
@@ -0,0 +1,92 @@
+from __future__ import annotations
+from pathlib import Path
+from typing import List
+from loguru import logger
+
+from src.models import InvalidGitRepositoryException, InvalidRevisionException
+
+
+class SourceChanges:
+    """Source files changed between a revision and the working tree.
+
+    Usage:
+        changes = SourceChanges.from_git(Path("src"), "main")
+        changes.modified  # added, modified, copied files and new names of the renamed files
+        changes.deleted  # deleted files and old names of the renamed files
+    """
+
+    _modified: List[Path]
+    _deleted: List[Path]
+
+    def __init__(self, modified: List[Path], deleted: List[Path]):
+        self._modified = modified
+        self._deleted = deleted
+
+    @property
+    def modified(self) -> List[Path]:
+        """The files to parse again."""
+        return self._modified
+
+    @property
+    def deleted(self) -> List[Path]:
+        """The files which no longer exist."""
+        return self._deleted
+
+    @classmethod
+    def from_git(cls, source_dir: Path, rev: str, pattern: str = "*.py"):
+        """List the files changed under a directory since a revision, untracked files included.
+
+        Args:
+            source_dir (Path): the directory to look into, inside a git working tree
+            rev (str): the revision to compare the working tree with
+            pattern (str): the pattern of the files to keep
+
+        Returns:
+            SourceChanges: the changed files, as absolute paths
+        """
+        # GitPython is only loaded when comparing with a revision, the watcher builds the changes without it
+        # pylint: disable=import-outside-toplevel
+        from git import GitCommandError, InvalidGitRepositoryError, NoSuchPathError, Repo
+
+        source_dir = Path(source_dir).resolve()
+
+        try:
+            repo = Repo(source_dir, search_parent_directories=True)
+        except (InvalidGitRepositoryError, NoSuchPathError) as exc_info:
+            raise InvalidGitRepositoryException(f'"{source_dir}" is not inside a git repository.') from exc_info
+
+        root = Path(repo.working_tree_dir).resolve()
+
+        try:
+            # -z: NUL separated, paths are not quoted; -M: report renames
+            output = repo.git.diff("--name-status", "-M", "-z", rev, "--", str(source_dir))
+            untracked = repo.git.ls_files("--others", "--exclude-standard", "-z", "--", str(source_dir))
+        except GitCommandError as exc_info:
+            raise InvalidRevisionException(f'Unable to compare the working tree with "{rev}".') from exc_info
+
+        modified, deleted = [], []
+        fields = iter(output.split("\0"))
+
+        for status in fields:
+            if not status:
+                continue
+
+            if status[0] in ("R", "C"):
+                old_path, new_path = next(fields), next(fields)
+                if status[0] == "R":
+                    deleted.append(root / old_path)
+                modified.append(root / new_path)
+            elif status[0] == "D":
+                deleted.append(root / next(fields))
+            else:
+                modified.append(root / next(fields))
+
+        modified.extend(root / path for path in untracked.split("\0") if path)
+
+        changes = cls(
+            sorted(path for path in modified if path.match(pattern)),
+            sorted(path for path in deleted if path.match(pattern)),
+        )
+        logger.debug("{} file(s) changed and {} deleted since {}", len(changes.modified), len(changes.deleted), rev)
+
+        return changes
@@ -0,0 +1,182 @@
+import ast
+import hashlib
+from pathlib import Path
+from typing import Dict, NamedTuple, Tuple, Union
+
+from src.models.tracer import tracer
+
+
+class IndexedSource(NamedTuple):
+    """A source file read and parsed"""
+
+    content: bytes
+    tree: ast.Module
+    content_hash: str
+
+    @property
+    def source_code(self) -> str:
+        """The content decoded, it is not kept besides the content."""
+        return self.content.decode("utf-8")
+
+
+class SourceIndex:
+    """Read and parse each source file once per run, for every extractor.
+
+    The module listing needs the top-level functions and classes, the logged messages listing needs the log calls:
+    both walk the same tree instead of reading and parsing the file each. A file can be read without being parsed, i.e.
+    to check it with a prefilter, it is parsed on the first call of `get`. Once each of the `consumers` released a file,
+    it is dropped from the index.
+
+    Usage:
+        index = SourceIndex(consumers=2)
+        index.get(Path("src/main.py")).tree
+        index.release(Path("src/main.py"))
+        LocalModuleGenerator("src", "docs", "modules", source_index=index)
+        DocumentationGenerator("src", url, source_index=index)
+    """
+
+    def __init__(self, consumers: int = 1):
+        """Constructor
+
+        Args:
+            consumers (int): the number of extractors releasing each file, i.e. the modules and the logged messages
+        """
+        self._consumers = consumers
+        self._files: Dict[Path, Union[IndexedSource, Exception]] = {}
+        # content and content hash of the files read but not parsed yet
+        self._contents: Dict[Path, Tuple[bytes, str]] = {}
+        # number of consumers done with each file
+        self._releases: Dict[Path, int] = {}
+        # resolved path of each directory, the files are keyed by resolved path
+        self._directories: Dict[Path, Path] = {}
+        self._file_count = 0
+
+    @property
+    def file_count(self) -> int:
+        """The number of files read so far."""
+        return self._file_count
+
+    def read(self, file: Path, content: bytes = None) -> Tuple[bytes, str]:
+        """Get the content of a source file, read on the first call, without parsing it.
+
+        Args:
+            file (Path): the source file
+            content (bytes): the content of the file when it was already read, i.e. by a FilePrefetcher
+
+        Returns:
+            Tuple[bytes, str]: the content and content hash of the file
+
+        Raises:
+            SyntaxError: when the file was already parsed and cannot be
+            ValueError: when the file was already parsed and is not valid UTF-8
+        """
+        file = self.__resolve(Path(file))
+        entry = self._files.get(file)
+
+        if isinstance(entry, Exception):
+            raise entry
+
+        if entry is not None:
+            return entry.content, entry.content_hash
+
+        if file not in self._contents:
+            with tracer.span("read", "file", file=str(file)):
+                content = file.read_bytes() if content is None else content
+
+            self._contents[file] = content, hashlib.sha256(content).hexdigest()
+            self._file_count += 1
+
+        return self._contents[file]
+
+    def get(self, file: Path, content: bytes = None) -> IndexedSource:
+        """Get a source file, read and parsed on the first call.
+
+        Args:
+            file (Path): the source file
+            content (bytes): the content of the file when it was already read, i.e. by a FilePrefetcher
+
+        Returns:
+            IndexedSource: the content, tree and content hash of the file
+
+        Raises:
+            SyntaxError: when the file cannot be parsed
+            ValueError: when the file is not valid UTF-8
+        """
+        file = self.__resolve(Path(file))
+
+        if file not in self._files:
+            if file in self._contents:
+                content = self._contents.pop(file)[0]
+            else:
+                self._file_count += 1
+
+            self._files[file] = self.__load(file, content)
+
+        entry = self._files[file]
+
+        if isinstance(entry, Exception):
+            raise entry
+
+        return entry
+
+    def release(self, file: Path):
+        """Tell a consumer is done with a file, it is dropped once all of them are.
+
+        Args:
+            file (Path): the source file
+        """
+        file = self.__resolve(Path(file))
+        releases = self._releases.get(file, 0) + 1
+
+        if releases < self._consumers:
+            self._releases[file] = releases
+            return
+
+        self._releases.pop(file, None)
+        self._files.pop(file, None)
+        self._contents.pop(file, None)
+
+    def __resolve(self, file: Path) -> Path:
+        """Same as Path.resolve, with the directories resolved once: a single system call per file"""
+        directory = self._directories.get(file.parent)
+
+        if directory is None:
+            directory = self._directories[file.parent] = file.parent.resolve()
+
+        file = directory / file.name
+
+        return file.resolve() if file.is_symlink() else file
+
+    @staticmethod
+    def parse(file: Path, content: bytes = None) -> IndexedSource:
+        """Read and parse a file, without keeping it.
+
+        Args:
+            file (Path): the source file
+            content (bytes): the content of the file when it was already read, i.e. by a FilePrefetcher
+
+        Returns:
+            IndexedSource: the content, tree and content hash of the file
+
+        Raises:
+            SyntaxError: when the file cannot be parsed
+            ValueError: when the file is not valid UTF-8
+        """
+        with tracer.span("index", "file", file=str(file)):
+            if content is None:
+                with tracer.span("read"):
+                    content = file.read_bytes()
+
+            source_code = content.decode("utf-8")
+            with tracer.span("ast.parse"):
+                tree = ast.parse(source_code, filename=str(file))
+
+        return IndexedSource(content, tree, hashlib.sha256(content).hexdigest())
+
+    @staticmethod
+    def __load(file: Path, content: bytes = None):
+        """Read and parse a file, the errors are returned to be raised on each access."""
+        try:
+            return SourceIndex.parse(file, content)
+        except (SyntaxError, ValueError) as exc_info:
+            return exc_info
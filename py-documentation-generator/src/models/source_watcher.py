@@ -0,0 +1,88 @@
+import time
+from pathlib import Path
+from typing import Dict, Tuple
+
+from src.models.source_changes import SourceChanges
+
+
+class SourceWatcher:
+    """Poll a directory for changed source files by comparing snapshots of their stats.
+
+    A burst of changes (i.e. an editor saving several files, a git checkout) is reported as a single change once the
+    directory has been quiet for the debounce delay.
+
+    Usage:
+        watcher = SourceWatcher(Path("src"), interval=0.5, debounce=0.2)
+        while True:
+            changes = watcher.wait()
+            changes.modified, changes.deleted
+    """
+
+    def __init__(self, source_dir: Path, pattern: str = "*.py", interval: float = 0.5, debounce: float = 0.2):
+        """Constructor
+
+        Args:
+            source_dir (Path): the directory to watch, recursively
+            pattern (str): the pattern of the files to watch
+            interval (float): the delay between two polls, in seconds
+            debounce (float): how long the directory must stay unchanged before reporting the changes, in seconds
+        """
+        self._source_dir = Path(source_dir).resolve()
+        self._pattern = pattern
+        self._interval = interval
+        self._debounce = debounce
+        self._snapshot = self.snapshot()
+
+    def snapshot(self) -> Dict[Path, Tuple[int, int]]:
+        """Get the modification time and size of every watched file.
+
+        Returns:
+            Dict[Path, Tuple[int, int]]: the modification time in nanoseconds and the size, keyed by absolute path
+        """
+        snapshot = {}
+
+        for file in self._source_dir.rglob(self._pattern):
+            try:
+                stat = file.stat()
+            except FileNotFoundError:
+                # deleted while walking, it is reported on the next poll
+                continue
+            snapshot[file] = (stat.st_mtime_ns, stat.st_size)
+
+        return snapshot
+
+    def poll(self) -> SourceChanges:
+        """Compare the files with the previous snapshot.
+
+        Returns:
+            SourceChanges: the files added or modified, and deleted, since the previous poll
+        """
+        previous, self._snapshot = self._snapshot, self.snapshot()
+
+        modified = [file for file, stat in self._snapshot.items() if previous.get(file) != stat]
+        deleted = [file for file in previous if file not in self._snapshot]
+
+        return SourceChanges(sorted(modified), sorted(deleted))
+
+    def wait(self) -> SourceChanges:
+        """Block until files change and the directory is quiet again.
+
+        Returns:
+            SourceChanges: all the files added or modified, and deleted, during the burst of changes
+        """
+        changes = self.poll()
+
+        while not changes.modified and not changes.deleted:
+            time.sleep(self._interval)
+            changes = self.poll()
+
+        modified, deleted = set(changes.modified), set(changes.deleted)
+
+        while changes.modified or changes.deleted:
+            time.sleep(self._debounce)
+            changes = self.poll()
+            # the last change of a file wins: a file deleted then created again is modified
+            modified = (modified - set(changes.deleted)) | set(changes.modified)
+            deleted = (deleted - set(changes.modified)) | set(changes.deleted)
+
+        return SourceChanges(sorted(modified), sorted(deleted))
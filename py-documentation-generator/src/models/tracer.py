@@ -0,0 +1,155 @@
+import json
+import os
+import threading
+import time
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+from src.generators.markdown_table import MarkdownTableWriter
+
+# the phases of a command, the other categories are the items processed (i.e. "file", "commit")
+CATEGORY_PHASE = "phase"
+
+# returned by a disabled tracer, a single object to keep tracing close to free when it is off
+_NO_SPAN = nullcontext()
+
+
+class _Span:
+    """Record a complete event when the context exits"""
+
+    __slots__ = ("_tracer", "_name", "_category", "_args", "_start")
+
+    def __init__(self, tracer: "Tracer", name: str, category: str, args: dict):
+        self._tracer = tracer
+        self._name = name
+        self._category = category
+        self._args = args
+
+    def __enter__(self):
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        end = time.perf_counter_ns()
+        self._tracer.events.append(
+            {
+                "name": self._name,
+                "cat": self._category,
+                "ph": "X",
+                # the trace event format is in microseconds
+                "ts": self._start / 1000,
+                "dur": (end - self._start) / 1000,
+                "pid": os.getpid(),
+                "tid": threading.get_native_id(),
+                "args": self._args,
+            }
+        )
+
+
+class Tracer:
+    """Record how long each phase and each file or commit takes, in the Chrome trace event format.
+
+    The events can be opened in chrome://tracing or https://ui.perfetto.dev. Phases use the "phase" category, the
+    items use their own category and have it as argument as well, i.e. `{"cat": "file", "args": {"file": "a.py"}}`.
+
+    Usage:
+        tracer = Tracer(enabled=True)
+        with tracer.span("walk"):
+            with tracer.span("parse", "file", file="src/main.py"):
+                ...
+        tracer.save(Path("trace.json"))
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.events: List[dict] = []
+
+    def span(self, name: str, category: str = CATEGORY_PHASE, **args):
+        """Time a block of code.
+
+        Args:
+            name (str): the name of the phase
+            category (str): "phase", or the kind of item processed
+            args: the arguments shown with the event, i.e. the file processed
+
+        Returns:
+            ContextManager: records the event on exit, does nothing when the tracer is disabled
+        """
+        if not self.enabled:
+            return _NO_SPAN
+
+        return _Span(self, name, category, args)
+
+    def extend(self, events: Iterable[dict]):
+        """Add events recorded by another tracer, i.e. in a worker process."""
+        self.events.extend(events)
+
+    def reset(self, enabled: bool = False):
+        """Drop the events recorded so far."""
+        self.enabled = enabled
+        self.events = []
+
+    def save(self, trace_file: Path):
+        """Write the events to a Chrome trace event JSON file."""
+        with Path(trace_file).open("w") as file_buffer:
+            json.dump({"traceEvents": self.events, "displayTimeUnit": "ms"}, file_buffer)
+
+    def totals(self) -> Dict[str, dict]:
+        """Get the number of spans and the total time of each phase, items included.
+
+        Returns:
+            Dict[str, dict]: calls and total duration in microseconds, keyed by name
+        """
+        totals = {}
+
+        for event in self.events:
+            total = totals.setdefault(event["name"], {"calls": 0, "duration": 0.0})
+            total["calls"] += 1
+            total["duration"] += event["dur"]
+
+        return totals
+
+    def slowest(self, top: int = 10) -> List[tuple]:
+        """Get the items which took the longest, all their spans added up.
+
+        Args:
+            top (int): the number of items to return
+
+        Returns:
+            List[tuple]: category, item and total duration in microseconds, slowest first
+        """
+        durations = {}
+
+        for event in self.events:
+            category = event["cat"]
+            if category != CATEGORY_PHASE and category in event["args"]:
+                key = (category, event["args"][category])
+                durations[key] = durations.get(key, 0.0) + event["dur"]
+
+        ranked = sorted(durations.items(), key=lambda item: item[1], reverse=True)
+
+        return [(category, item, duration) for (category, item), duration in ranked[:top]]
+
+    def summary(self, top: int = 10) -> str:
+        """Get the time per phase and the slowest items as markdown tables.
+
+        Args:
+            top (int): the number of slowest items to list
+
+        Returns:
+            str: the tables
+        """
+        totals = sorted(self.totals().items(), key=lambda item: item[1]["duration"], reverse=True)
+        phases = MarkdownTableWriter(["phase", "calls", "total (ms)"]).render(
+            lambda: ([name, str(total["calls"]), f"{total['duration'] / 1000:.3f}"] for name, total in totals)
+        )
+        items = MarkdownTableWriter(["type", "item", "total (ms)"]).render(
+            lambda: ([category, str(item), f"{duration / 1000:.3f}"] for category, item, duration in self.slowest(top))
+        )
+
+        return f"{phases}\n\n{items}"
+
+
+# the tracer of the current process, enabled by the --trace option of the commands
+tracer = Tracer()
@@ -0,0 +1,33 @@
+from benchmarks.synthetic import SyntheticRepository, SyntheticSourceTree
+
+
+def test_source_tree_is_deterministic(tmp_path):
+    tree = SyntheticSourceTree(seed=7, depth=2, packages=2, modules=3, log_density=0.5)
+
+    first = tree.write(tmp_path / "first" / "src")
+    second = tree.write(tmp_path / "second" / "src")
+
+    # 1 + 2 + 4 packages, each with an __init__.py and 3 modules
+    assert len(first) == 28
+    assert [file.relative_to(tmp_path / "first") for file in first] == [
+        file.relative_to(tmp_path / "second") for file in second
+    ]
+    assert [file.read_text() for file in first] == [file.read_text() for file in second]
+    assert "logger." in first[1].read_text()
+
+
+def test_source_tree_without_log_calls(tmp_path):
+    files = SyntheticSourceTree(depth=0, log_density=0).write(tmp_path / "src")
+
+    assert all("logger." not in file.read_text() for file in files)
+
+
+def test_repository_is_deterministic(tmp_path):
+    first = SyntheticRepository(seed=7, commits=12, authors=3).write(tmp_path / "first")
+    second = SyntheticRepository(seed=7, commits=12, authors=3).write(tmp_path / "second")
+
+    commits = list(first.iter_commits("HEAD"))
+
+    assert len(commits) == 12
+    assert len({commit.author.email for commit in commits}) <= 3
+    assert [commit.hexsha for commit in commits] == [commit.hexsha for commit in second.iter_commits("HEAD")]
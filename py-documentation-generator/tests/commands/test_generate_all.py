@@ -0,0 +1,49 @@
+import ast
+from click.testing import CliRunner
+import pytest
+from src.commands.generate_all import generate_all
+from src.commands.generate_logged_messages_listing import generate_logged_messages_listing
+from src.generators.local_module_generator import LocalModuleGenerator
+
+MODULE = '''from loguru import logger
+
+
+class {name}:
+    pass
+
+
+def {name_lower}():
+    logger.info("{name} started")
+    logger.error("{name} failed")
+'''
+
+
+@pytest.mark.parametrize("io_threads", ["0", "4"])
+def test_same_as_separate_commands(tmp_path, monkeypatch, mocker, io_threads):
+    # Arrange
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "src" / "package").mkdir(parents=True)
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "all").mkdir()
+    (tmp_path / "src" / "__init__.py").write_text("")
+    (tmp_path / "src" / "package" / "__init__.py").write_text("")
+    (tmp_path / "src" / "main.py").write_text(MODULE.format(name="Main", name_lower="main"))
+    (tmp_path / "src" / "package" / "worker.py").write_text(MODULE.format(name="Worker", name_lower="worker"))
+    (tmp_path / "src" / "package" / "empty.py").write_text("")
+    LocalModuleGenerator("src", "docs", "modules").to_markdown()
+    LocalModuleGenerator("src", "docs", "modules").to_json()
+    CliRunner().invoke(
+        generate_logged_messages_listing,
+        ["-o", "LOGGED_MESSAGES.md", "-i", "logger", "--source_dir", "src", "-u", "http://localhost", "--no-cache"],
+    )
+    parse = mocker.spy(ast, "parse")
+
+    # Act
+    result = CliRunner().invoke(generate_all, ["-o", "all", "-u", "http://localhost", "--io-threads", io_threads])
+
+    # Assert
+    assert result.exit_code == 0
+    # each module is parsed once, the empty files are neither listed as modules nor parsed for log calls
+    assert parse.call_count == 2
+    for name in ["MODULES.md", "MODULES.json", "LOGGED_MESSAGES.md"]:
+        assert (tmp_path / "all" / name).read_text() == (tmp_path / "docs" / name).read_text()
@@ -0,0 +1,368 @@
+import ast
+import csv
+import json
+import os
+from click.testing import CliRunner
+import pytest
+from src.commands import generate_logged_messages_listing as command
+from src.commands.generate_logged_messages_listing import (
+    DocumentationGenerator,
+    FuncVisitor,
+    generate_logged_messages_listing,
+)
+from src.models.parse_cache import ParseCache
+
+SOURCE_CODE = '''
+from loguru import logger
+
+
+def main():
+    logger.info("Starting")
+    logger.debug(f"Value: {value}")
+    logger.error("Failed", exc_info=True)
+    logger.info("Done")
+    other.info("Ignored")
+'''
+
+
+def test_func_visitor_all_levels():
+    # Arrange
+    tree = ast.parse(SOURCE_CODE)
+    visitor = FuncVisitor("logger", source_code=SOURCE_CODE)
+
+    # Act
+    visitor.visit(tree)
+
+    # Assert
+    assert visitor.stats == {
+        "INFO": {6: "Starting", 9: "Done"},
+        "DEBUG": {7: "Value: {value}"},
+        "ERROR": {8: "Failed"},
+    }
+
+
+def test_func_visitor_selected_levels():
+    # Arrange
+    tree = ast.parse(SOURCE_CODE)
+    visitor = FuncVisitor("logger", ["ERROR"], SOURCE_CODE)
+
+    # Act
+    visitor.visit(tree)
+
+    # Assert
+    assert visitor.stats == {"ERROR": {8: "Failed"}}
+
+
+BOUND_SOURCE_CODE = """
+import logging
+from logging import getLogger
+
+
+def main():
+    log.info("Before binding")
+    self.logger.error("Attribute")
+    other.info("Ignored")
+
+
+log = logging.getLogger(__name__)
+module_logger: logging.Logger = getLogger("module")
+module_logger.warning("Bound")
+"""
+
+
+def test_func_visitor_instance_patterns():
+    # Arrange
+    source_code = SOURCE_CODE + "    self.logger.warning('Attribute')\n    log.info('Alias')\n"
+    tree = ast.parse(source_code)
+    visitor = FuncVisitor("logger, log,self.logger", source_code=source_code)
+
+    # Act
+    visitor.visit(tree)
+
+    # Assert
+    assert visitor.stats == {
+        "INFO": {6: "Starting", 9: "Done", 12: "Alias"},
+        "DEBUG": {7: "Value: {value}"},
+        "ERROR": {8: "Failed"},
+        "WARNING": {11: "Attribute"},
+    }
+
+
+def test_func_visitor_bound_loggers():
+    # Arrange
+    tree = ast.parse(BOUND_SOURCE_CODE)
+    visitor = FuncVisitor("self.logger,getLogger()", source_code=BOUND_SOURCE_CODE)
+
+    # Act
+    visitor.visit(tree)
+
+    # Assert
+    assert visitor.stats == {
+        "INFO": {7: "Before binding"},
+        "ERROR": {8: "Attribute"},
+        "WARNING": {14: "Bound"},
+    }
+
+
+def test_extract_logged_message_single_parse(mocker, tmp_path, monkeypatch):
+    # Arrange
+    monkeypatch.chdir(tmp_path)
+    source_dir = tmp_path / "src"
+    source_dir.mkdir()
+    (source_dir / "main.py").write_text(SOURCE_CODE)
+    generator = DocumentationGenerator("src", "http://localhost")
+    spy = mocker.spy(DocumentationGenerator, "_parse_logs")
+
+    # Act
+    tables = [generator.generate_md("logger", level) for level in ["INFO", "DEBUG", "ERROR", "WARNING"]]
+
+    # Assert
+    assert spy.call_count == 1
+    assert all(tables[:3])
+    assert tables[3] is False
+
+
+def test_extract_logged_message_jobs(tmp_path, monkeypatch):
+    # Arrange
+    monkeypatch.chdir(tmp_path)
+    source_dir = tmp_path / "src"
+    source_dir.mkdir()
+    for index in range(8):
+        (source_dir / f"module_{index}.py").write_text(SOURCE_CODE)
+    (source_dir / "broken.py").write_text("def broken(:\n    logger.info('Never')\n")
+
+    # Act
+    serial = DocumentationGenerator("src", "http://localhost")._extract_logged_message("logger")
+    parallel = DocumentationGenerator("src", "http://localhost", jobs=3)._extract_logged_message("logger")
+    prefetched = DocumentationGenerator("src", "http://localhost", io_threads=3)._extract_logged_message("logger")
+
+    # Assert
+    assert list(serial["INFO"]) == [source_dir / f"module_{index}.py" for index in range(8)]
+    assert list(parallel["INFO"]) == list(serial["INFO"])
+    assert parallel == serial
+    assert list(prefetched["INFO"]) == list(serial["INFO"])
+    assert prefetched == serial
+
+
+def test_extract_logged_message_cached(mocker, tmp_path, monkeypatch):
+    # Arrange
+    monkeypatch.chdir(tmp_path)
+    source_dir = tmp_path / "src"
+    source_dir.mkdir()
+    (source_dir / "main.py").write_text(SOURCE_CODE)
+    (source_dir / "touched.py").write_text(SOURCE_CODE)
+    (source_dir / "modified.py").write_text(SOURCE_CODE)
+    cache_file = tmp_path / "cache.json"
+    expected = DocumentationGenerator("src", "http://localhost", cache=ParseCache(cache_file))._extract_logged_message(
+        "logger"
+    )
+
+    # Act
+    os.utime(source_dir / "touched.py", ns=(0, 0))
+    (source_dir / "modified.py").write_text(SOURCE_CODE.replace("Done", "Finished"))
+    spy = mocker.spy(DocumentationGenerator, "_parse_logs")
+    cache = ParseCache(cache_file)
+    sut = DocumentationGenerator("src", "http://localhost", cache=cache)._extract_logged_message("logger")
+
+    # Assert
+    assert spy.call_count == 1
+    assert cache.hits == 2
+    assert sut["INFO"][source_dir / "main.py"] == expected["INFO"][source_dir / "main.py"]
+    assert sut["INFO"][source_dir / "touched.py"] == expected["INFO"][source_dir / "touched.py"]
+    assert sut["INFO"][source_dir / "modified.py"] == {6: "Starting", 9: "Finished"}
+
+
+def test_since_same_as_full_regeneration(faker, mocker, tmp_path, monkeypatch):
+    # Arrange
+    monkeypatch.chdir(tmp_path)
+    repo = faker.repository(dir_path=tmp_path)
+    source_dir = tmp_path / "src"
+    (source_dir / "package").mkdir(parents=True)
+    (tmp_path / "docs").mkdir()
+    for name in ["main.py", "renamed.py", "deleted.py", "package/modified.py"]:
+        (source_dir / name).write_text(SOURCE_CODE.replace("Starting", f"Starting {name}"))
+    repo.git.add(str(source_dir))
+    repo.git.commit("-m", "add sources", author="test-bot <test-bot@example.com>")
+    arguments = ["-o", "LOGS.md", "-i", "logger", "--source_dir", "src", "-u", "http://localhost", "--no-cache"]
+    runner = CliRunner()
+    runner.invoke(generate_logged_messages_listing, arguments)
+
+    # Act
+    repo.git.mv(str(source_dir / "renamed.py"), str(source_dir / "package" / "moved.py"))
+    repo.git.rm(str(source_dir / "deleted.py"))
+    (source_dir / "package" / "modified.py").write_text(SOURCE_CODE.replace("Done", "Finished"))
+    (source_dir / "added.py").write_text(SOURCE_CODE.replace("Starting", "Added"))
+    spy = mocker.spy(DocumentationGenerator, "_parse_logs")
+    result = runner.invoke(generate_logged_messages_listing, [*arguments, "--since", "HEAD"])
+    parsed = spy.call_count
+    incremental = (tmp_path / "docs" / "LOGS.md").read_text()
+    (tmp_path / "docs" / "LOGS.index.json").unlink()
+    runner.invoke(generate_logged_messages_listing, arguments)
+    full = (tmp_path / "docs" / "LOGS.md").read_text()
+
+    # Assert
+    assert result.exit_code == 0
+    assert parsed == 3
+    assert "Added" in incremental
+    assert "deleted.py" not in incremental
+    assert incremental == full
+
+
+def test_since_edited_then_reverted(faker, tmp_path, monkeypatch):
+    # Arrange
+    monkeypatch.chdir(tmp_path)
+    repo = faker.repository(dir_path=tmp_path)
+    source_dir = tmp_path / "src"
+    source_dir.mkdir()
+    (tmp_path / "docs").mkdir()
+    for name in ["a.py", "b.py"]:
+        (source_dir / name).write_text(SOURCE_CODE.replace("Starting", f"Starting {name}"))
+    repo.git.add(str(source_dir))
+    repo.git.commit("-m", "add sources", author="test-bot <test-bot@example.com>")
+    arguments = ["-o", "LOGS.md", "-i", "logger", "--source_dir", "src", "-u", "http://localhost", "--no-cache"]
+    runner = CliRunner()
+    runner.invoke(generate_logged_messages_listing, arguments)
+    full = (tmp_path / "docs" / "LOGS.md").read_text()
+    (source_dir / "a.py").write_text(SOURCE_CODE.replace("Starting", "Edited"))
+    # b.py no longer has any log call, it is indexed without logged messages
+    (source_dir / "b.py").write_text("def main():\n    pass\n")
+    runner.invoke(generate_logged_messages_listing, [*arguments, "--since", "HEAD"])
+    edited = (tmp_path / "docs" / "LOGS.md").read_text()
+
+    # Act
+    repo.git.checkout("--", str(source_dir / "a.py"), str(source_dir / "b.py"))
+    result = runner.invoke(generate_logged_messages_listing, [*arguments, "--since", "HEAD"])
+
+    # Assert
+    assert result.exit_code == 0
+    assert "Edited" in edited
+    assert "Starting b.py" not in edited
+    assert (tmp_path / "docs" / "LOGS.md").read_text() == full
+
+
+@pytest.mark.parametrize("mmap_threshold", [1, 1024 * 1024])
+def test_prefilter_skips_files_without_calls(mocker, tmp_path, monkeypatch, mmap_threshold):
+    # Arrange
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(command, "MMAP_THRESHOLD", mmap_threshold)
+    source_dir = tmp_path / "src"
+    source_dir.mkdir()
+    (source_dir / "main.py").write_text(SOURCE_CODE)
+    (source_dir / "continued.py").write_text("(logger)\\\n    .warning('Continued')\n")
+    (source_dir / "other.py").write_text("import logging\n\nlog = logging.getLogger()\nlog.info('Other')\n")
+    (source_dir / "empty.py").write_text("")
+    spy = mocker.spy(DocumentationGenerator, "_parse_logs")
+
+    # Act
+    sut = DocumentationGenerator("src", "http://localhost")._extract_logged_message("logger")
+
+    # Assert
+    assert spy.call_count == 2
+    assert sut["WARNING"] == {source_dir / "continued.py": {1: "Continued"}}
+
+
+@pytest.mark.parametrize(
+    "instance_name, parsed",
+    [("logger", ["continued.py", "main.py"]), ("log,self._log", ["other.py"]), ("getLogger()", ["other.py"])],
+)
+def test_prefilter_instance_patterns(mocker, tmp_path, monkeypatch, instance_name, parsed):
+    # Arrange
+    monkeypatch.chdir(tmp_path)
+    source_dir = tmp_path / "src"
+    source_dir.mkdir()
+    (source_dir / "main.py").write_text(SOURCE_CODE)
+    (source_dir / "continued.py").write_text("(logger)\\\n    .warning('Continued')\n")
+    (source_dir / "other.py").write_text("import logging\n\nlog = logging.getLogger()\nlog.info('Other')\n")
+    spy = mocker.spy(DocumentationGenerator, "_parse_logs")
+
+    # Act
+    DocumentationGenerator("src", "http://localhost")._extract_logged_message(instance_name)
+
+    # Assert
+    assert sorted(call.args[0] for call in spy.call_args_list) == sorted(
+        (source_dir / file).read_text() for file in parsed
+    )
+
+
+def test_jsonl_and_csv_formats(tmp_path, monkeypatch):
+    # Arrange
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "src" / "package").mkdir(parents=True)
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "src" / "package" / "main.py").write_text(SOURCE_CODE)
+    arguments = ["-i", "logger", "--source_dir", "src", "-u", "http://localhost", "--no-cache"]
+    runner = CliRunner()
+
+    # Act
+    runner.invoke(generate_logged_messages_listing, [*arguments, "-o", "LOGS.csv", "--format", "csv"])
+    result = runner.invoke(generate_logged_messages_listing, [*arguments, "-o", "-", "--format", "jsonl"])
+
+    # Assert
+    # stderr may be mixed with stdout depending on the version of click
+    records = [json.loads(line) for line in result.stdout.splitlines() if line.startswith("{")]
+    assert records[0] == {
+        "file": "main.py",
+        "path": "package/main.py",
+        "line": 6,
+        "level": "INFO",
+        "instance": "logger",
+        "message": "Starting",
+    }
+    assert [record["line"] for record in records] == [6, 7, 8, 9]
+    with (tmp_path / "docs" / "LOGS.csv").open(newline="") as file_buffer:
+        rows = list(csv.DictReader(file_buffer))
+    assert [row["level"] for row in rows] == ["INFO", "DEBUG", "ERROR", "INFO"]
+    assert not (tmp_path / "docs" / "-").exists()
+
+
+def test_catalog_format(tmp_path, monkeypatch):
+    # Arrange
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "src").mkdir()
+    (tmp_path / "docs").mkdir()
+    for name in ["first", "second"]:
+        (tmp_path / "src" / f"{name}.py").write_text(SOURCE_CODE.replace("{value}", f"{{{name}}}"))
+    arguments = ["-i", "logger", "--source_dir", "src", "-u", "http://localhost", "--no-cache"]
+
+    # Act
+    result = CliRunner().invoke(generate_logged_messages_listing, [*arguments, "-o", "CATALOG.md", "-f", "catalog"])
+
+    # Assert
+    assert result.exit_code == 0
+    assert (tmp_path / "docs" / "CATALOG.md").read_text() == (
+        "# Message templates\n\n"
+        "| template    |   count | levels   | locations               |\n"
+        "|:------------|--------:|:---------|:------------------------|\n"
+        "| `Done`      |       2 | INFO     | first.py:9, second.py:9 |\n"
+        "| `Failed`    |       2 | ERROR    | first.py:8, second.py:8 |\n"
+        "| `Starting`  |       2 | INFO     | first.py:6, second.py:6 |\n"
+        "| `Value: {}` |       2 | DEBUG    | first.py:7, second.py:7 |"
+    )
+
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_trace(tmp_path, monkeypatch, jobs):
+    # Arrange
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "src").mkdir()
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "src" / "main.py").write_text(SOURCE_CODE)
+    (tmp_path / "src" / "other.py").write_text(SOURCE_CODE)
+    arguments = ["-o", "LOGS.md", "-i", "logger", "--source_dir", "src", "-u", "http://localhost", "--no-cache"]
+
+    # Act
+    result = CliRunner().invoke(
+        generate_logged_messages_listing, [*arguments, "--jobs", jobs, "--trace", "trace.json", "--trace-top", "1"]
+    )
+
+    # Assert
+    assert result.exit_code == 0
+    events = json.loads((tmp_path / "trace.json").read_text())["traceEvents"]
+    names = {event["name"] for event in events}
+    assert {"generate_logged_messages_listing", "walk", "file", "read", "ast.parse", "visit", "render"} <= names
+    files = {event["args"]["file"] for event in events if event["cat"] == "file"}
+    assert files == {str(tmp_path / "src" / "main.py"), str(tmp_path / "src" / "other.py")}
+    assert all(event["ph"] == "X" and event["dur"] >= 0 for event in events)
+    assert "| phase" in result.output
+    assert not command.tracer.enabled
+    assert not command.tracer.events
@@ -0,0 +1,65 @@
+import json
+import pytest
+from click.testing import CliRunner
+from src.commands.generate_logged_messages_listing import generate_logged_messages_listing
+from src.commands.query import query
+
+MODULE = '''from loguru import logger
+
+
+def {name}():
+    logger.info("{name} started")
+    logger.error("Unable to run {name}")
+'''
+
+
+@pytest.mark.parametrize("output_format", ["md", "jsonl"])
+def test_query_without_the_sources(tmp_path, monkeypatch, output_format):
+    # Arrange
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "src" / "payments").mkdir(parents=True)
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "src" / "main.py").write_text(MODULE.format(name="main"))
+    (tmp_path / "src" / "payments" / "card.py").write_text(MODULE.format(name="charge"))
+    arguments = ["-i", "logger", "--source_dir", "src", "-u", "http://localhost", "--no-cache"]
+    CliRunner().invoke(
+        generate_logged_messages_listing,
+        [*arguments, "-o", "LOGS.md", "--format", output_format, "--database", "docs/LOGGED_MESSAGES.db"],
+    )
+    (tmp_path / "src" / "payments" / "card.py").unlink()
+
+    # Act
+    result = CliRunner().invoke(query, ["-l", "error", "-p", "payments/", "-f", "jsonl"])
+
+    # Assert
+    assert result.exit_code == 0
+    records = [json.loads(line) for line in result.stdout.splitlines() if line.startswith("{")]
+    assert records == [
+        {
+            "file": "card.py",
+            "path": "payments/card.py",
+            "line": 6,
+            "level": "ERROR",
+            "instance": "logger",
+            "message": "Unable to run charge",
+        }
+    ]
+
+
+def test_query_markdown(tmp_path, monkeypatch):
+    # Arrange
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "src").mkdir()
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "src" / "main.py").write_text(MODULE.format(name="main"))
+    CliRunner().invoke(
+        generate_logged_messages_listing,
+        ["-i", "logger", "--source_dir", "src", "-u", "http://localhost", "-o", "LOGS.md", "--database", "logs.db"],
+    )
+
+    # Act
+    result = CliRunner().invoke(query, ["--database", "logs.db", "-m", "*started"])
+
+    # Assert
+    assert result.exit_code == 0
+    assert "| main.py | main.py |      5 | INFO    | logger     | main started |\n" in result.stdout
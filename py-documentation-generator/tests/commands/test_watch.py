@@ -0,0 +1,107 @@
+import subprocess
+import sys
+from pathlib import Path
+from src.commands.watch import DocumentationWatch
+from src.generators.local_module_generator import LocalModuleGenerator
+from src.models.source_changes import SourceChanges
+
+ROOT_DIR = Path(__file__).resolve().parent.parent.parent
+
+MODULE = '''from loguru import logger
+
+
+def {name}():
+    logger.info("{message}")
+    logger.error("Failed")
+'''
+
+
+def generate(tmp_path, output_dir):
+    (tmp_path / output_dir).mkdir(exist_ok=True)
+    watch = DocumentationWatch("src", output_dir, "logger", "http://localhost", "LOGS.md")
+    watch.generate()
+
+    return watch
+
+
+def read(tmp_path, output_dir):
+    return [(tmp_path / output_dir / name).read_text() for name in ["LOGS.md", "MODULES.md", "MODULES.json"]]
+
+
+def test_update_same_as_full_generation(tmp_path, monkeypatch, mocker):
+    # Arrange
+    monkeypatch.chdir(tmp_path)
+    source_dir = tmp_path / "src"
+    (source_dir / "package").mkdir(parents=True)
+    (source_dir / "__init__.py").write_text("")
+    (source_dir / "package" / "__init__.py").write_text("")
+    (source_dir / "main.py").write_text(MODULE.format(name="main", message="Starting"))
+    (source_dir / "package" / "worker.py").write_text(MODULE.format(name="work", message="Working"))
+    (source_dir / "package" / "other.py").write_text(MODULE.format(name="other", message="Other"))
+    watch = generate(tmp_path, "docs")
+    update_modules = mocker.spy(LocalModuleGenerator, "update_modules")
+
+    # Act
+    (source_dir / "package" / "worker.py").write_text(
+        MODULE.format(name="work_harder", message="Working harder").replace("logger.error", "logger.debug")
+    )
+    watch.update(SourceChanges([source_dir / "package" / "worker.py"], []))
+
+    # Assert
+    generate(tmp_path, "expected")
+    assert update_modules.spy_return is True
+    assert "work_harder" in (tmp_path / "docs" / "MODULES.md").read_text()
+    assert read(tmp_path, "docs") == read(tmp_path, "expected")
+
+
+def test_update_deleted_file(tmp_path, monkeypatch):
+    # Arrange
+    monkeypatch.chdir(tmp_path)
+    source_dir = tmp_path / "src"
+    source_dir.mkdir()
+    (source_dir / "__init__.py").write_text("")
+    (source_dir / "main.py").write_text(MODULE.format(name="main", message="Starting"))
+    (source_dir / "other.py").write_text(MODULE.format(name="other", message="Other"))
+    watch = generate(tmp_path, "docs")
+
+    # Act
+    (source_dir / "other.py").unlink()
+    watch.update(SourceChanges([], [source_dir / "other.py"]))
+
+    # Assert
+    generate(tmp_path, "expected")
+    assert "Other" not in (tmp_path / "docs" / "LOGS.md").read_text()
+    assert read(tmp_path, "docs") == read(tmp_path, "expected")
+
+
+def test_update_keeps_listing_on_syntax_error(tmp_path, monkeypatch):
+    # Arrange
+    monkeypatch.chdir(tmp_path)
+    source_dir = tmp_path / "src"
+    source_dir.mkdir()
+    (source_dir / "__init__.py").write_text("")
+    (source_dir / "main.py").write_text(MODULE.format(name="main", message="Starting"))
+    watch = generate(tmp_path, "docs")
+    before = (tmp_path / "docs" / "MODULES.md").read_text()
+
+    # Act
+    (source_dir / "main.py").write_text("def broken(:\n")
+    watch.update(SourceChanges([source_dir / "main.py"], []))
+
+    # Assert
+    assert (tmp_path / "docs" / "MODULES.md").read_text() == before
+
+
+def test_watch_does_not_import_git():
+    # Arrange
+    script = (
+        "import sys\n"
+        "import src.commands.watch\n"
+        "print(sorted(name for name in sys.modules if name == 'git' or name.startswith('git.')))\n"
+    )
+
+    # Act
+    result = subprocess.run([sys.executable, "-c", script], cwd=ROOT_DIR, capture_output=True, text=True, check=True)
+
+    # Assert
+    assert result.stdout.splitlines()[-1] == "[]"
@@ -0,0 +1,51 @@
+import io
+import json
+import pytest
+from src.generators.json_stream_writer import JsonStreamWriter
+from src.models.local_modules import LocalModule
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        {"src": {"type": "package", "data": {"main.py": {"type": "module", "data": None}}}},
+        {"empty": {}, "list": [], "values": [1, 2.5, True, None, "é\"\n"], 1: False},
+        [],
+        "text",
+    ],
+)
+@pytest.mark.parametrize("indent", [4, None])
+def test_same_as_json(value, indent):
+    # Arrange
+    file_buffer = io.StringIO()
+
+    # Act
+    JsonStreamWriter(file_buffer, indent=indent).write(value)
+
+    # Assert
+    assert file_buffer.getvalue() == json.dumps(value, indent=indent, separators=None if indent else (",", ":"))
+
+
+def test_write_iterators_as_objects():
+    # Arrange
+    file_buffer = io.StringIO()
+    consumed = []
+
+    def modules():
+        for name in ["cli.py", "main.py"]:
+            consumed.append(name)
+            yield name, LocalModule(name, "src", "src", ["main"], [])
+
+    # Act
+    JsonStreamWriter(file_buffer, indent=4, default=LocalModule.to_dict).write({"src": modules()})
+
+    # Assert
+    assert consumed == ["cli.py", "main.py"]
+    assert file_buffer.getvalue() == json.dumps(
+        {"src": {name: LocalModule(name, "src", "src", ["main"], []).to_dict() for name in consumed}}, indent=4
+    )
+
+
+def test_unknown_type():
+    with pytest.raises(TypeError):
+        JsonStreamWriter(io.StringIO()).write({"value": object()})
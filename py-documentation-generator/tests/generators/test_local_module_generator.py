@@ -0,0 +1,102 @@
+import json
+import shutil
+from src.generators.documentation_generator import _serializable
+from src.generators.local_module_generator import LocalModuleGenerator
+from src.models.package_selection import PackageSelection
+
+
+def test_same_markdown_as_pandas(tmp_path, monkeypatch):
+    # Arrange
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "src" / "empty").mkdir(parents=True)
+    (tmp_path / "src" / "2024").mkdir()
+    (tmp_path / "src" / "__init__.py").write_text("def main():\n    pass\n\n\nclass App:\n    pass\n")
+    (tmp_path / "src" / "__main__.py").write_text("def run():\n    pass\n\n\ndef stop():\n    pass\n")
+    (tmp_path / "src" / "empty" / "__init__.py").write_text("")
+    (tmp_path / "src" / "2024" / "__init__.py").write_text("VALUE = 1\n")
+
+    # Act
+    sut = LocalModuleGenerator("src", ".", "modules")
+
+    # Assert
+    assert sut.content == (
+        "# src\n\n"
+        "| name            | path   | module   | functions   | classes   |\n"
+        "|:----------------|:-------|:---------|:------------|:----------|\n"
+        "| \\_\\_init\\_\\_.py | src    | src      | main        | App       |\n"
+        "| \\_\\_main\\_\\_.py | src    | src      | run, stop   |           |\n\n\n"
+        "## 2024\n\n"
+        "| name            | path     |   module | functions   | classes   |\n"
+        "|:----------------|:---------|---------:|:------------|:----------|\n"
+        "| \\_\\_init\\_\\_.py | src/2024 |     2024 |             |           |\n\n\n"
+        "## empty\n\n"
+        # the packages without modules have always been listed as an empty pandas DataFrame
+        "Empty DataFrame\nColumns: []\nIndex: []\n\n\n"
+    )
+
+
+def test_to_shards_writes_changed_files(tmp_path, monkeypatch):
+    # Arrange
+    monkeypatch.chdir(tmp_path)
+    for package in ("src", "src/models", "src/commands", "src/scripts"):
+        (tmp_path / package).mkdir()
+        (tmp_path / package / "__init__.py").write_text("def main():\n    pass\n")
+    LocalModuleGenerator("src", ".", "modules").to_shards()
+    (tmp_path / "src" / "models" / "user.py").write_text("class User:\n    pass\n")
+    shutil.rmtree(tmp_path / "src" / "scripts")
+    generator = LocalModuleGenerator("src", ".", "modules")
+
+    # Act
+    written = generator.to_shards()
+    unchanged = LocalModuleGenerator("src", ".", "modules").to_shards()
+
+    # Assert
+    # the index lists the packages, scripts was removed
+    assert sorted(file.as_posix() for file in written) == [
+        "MODULES.json",
+        "MODULES.md",
+        "MODULES/models.json",
+        "MODULES/models.md",
+    ]
+    assert unchanged == []
+    assert sorted(file.name for file in (tmp_path / "MODULES").iterdir()) == [
+        "commands.json",
+        "commands.md",
+        "models.json",
+        "models.md",
+    ]
+    index = json.loads((tmp_path / "MODULES.json").read_text())
+    assert index["src"]["data"]["models"] == {"type": "package", "shard": "MODULES/models.json"}
+    assert json.loads((tmp_path / "MODULES" / "models.json").read_text()) == json.loads(
+        json.dumps({"models": generator._data["src"]["data"]["models"]}, default=_serializable)
+    )
+    assert "## [models](MODULES/models.md)" in (tmp_path / "MODULES.md").read_text()
+    assert (tmp_path / "MODULES" / "models.md").read_text().startswith("# models\n\n| name ")
+
+
+def test_to_shards_keeps_the_unselected_packages(tmp_path, monkeypatch):
+    # Arrange
+    monkeypatch.chdir(tmp_path)
+    for package in ("src", "src/models", "src/commands"):
+        (tmp_path / package).mkdir()
+        (tmp_path / package / "__init__.py").write_text("def main():\n    pass\n")
+    LocalModuleGenerator("src", ".", "modules").to_shards()
+    (tmp_path / "src" / "models" / "user.py").write_text("class User:\n    pass\n")
+    generator = LocalModuleGenerator("src", ".", "modules", selection=PackageSelection(include=["models"]))
+
+    # Act
+    written = generator.to_shards()
+    index = (tmp_path / "MODULES.json").read_text(), (tmp_path / "MODULES.md").read_text()
+    unchanged = LocalModuleGenerator("src", ".", "modules").to_shards()
+
+    # Assert
+    assert sorted(file.as_posix() for file in written) == ["MODULES/models.json", "MODULES/models.md"]
+    # the index is the same as the one of a full run
+    assert unchanged == []
+    assert index == ((tmp_path / "MODULES.json").read_text(), (tmp_path / "MODULES.md").read_text())
+    assert sorted(file.name for file in (tmp_path / "MODULES").iterdir()) == [
+        "commands.json",
+        "commands.md",
+        "models.json",
+        "models.md",
+    ]
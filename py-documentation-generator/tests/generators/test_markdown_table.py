@@ -0,0 +1,49 @@
+import io
+import pandas as pd
+import pytest
+from src.generators.markdown_table import MarkdownTableWriter
+
+
+@pytest.mark.parametrize(
+    ("columns", "rows"),
+    [
+        (
+            ["file", "path", "lineno", "message"],
+            [["main.py", "root", "[6](http://localhost/src/main.py#lines-6)", "`Starting`"]],
+        ),
+        (
+            ["name", "path", "module", "functions", "classes"],
+            [["__init__.py", "src/models", "models", "", "Contributor"], ["cli.py", "src", "src", "main", ""]],
+        ),
+        (["name", "count"], [["a", "12"], ["b", "7"]]),
+        (["name", "ratio"], [["a", "1.5"], ["b", "12.25"], ["c", "3"]]),
+        (["name", "flag"], [[" padded ", "True"], ["é", "False"]]),
+    ],
+)
+def test_same_as_pandas(columns, rows):
+    # Arrange
+    expected = pd.DataFrame(rows, columns=columns).to_markdown(index=False)
+
+    # Act
+    sut = MarkdownTableWriter(columns).render(lambda: iter(rows))
+
+    # Assert
+    assert sut == expected
+
+
+def test_write_streams_rows():
+    # Arrange
+    calls = []
+
+    def rows():
+        calls.append(1)
+        yield ["main.py", "`Starting`"]
+
+    file_buffer = io.StringIO()
+
+    # Act
+    MarkdownTableWriter(["file", "message"]).write(file_buffer, rows)
+
+    # Assert
+    assert len(calls) == 2
+    assert file_buffer.getvalue().endswith("| main.py | `Starting` |")
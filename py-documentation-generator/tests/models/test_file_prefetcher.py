@@ -0,0 +1,50 @@
+import pytest
+from src.models.file_prefetcher import FilePrefetcher
+
+
+def test_read_in_order(tmp_path):
+    # Arrange
+    files = [tmp_path / f"module_{index}.py" for index in range(20)]
+    for index, file in enumerate(files):
+        file.write_text(f"value = {index}\n")
+
+    # Act
+    sut = list(FilePrefetcher(threads=4).read(files))
+
+    # Assert
+    assert sut == [(file, f"value = {index}\n".encode()) for index, file in enumerate(files)]
+
+
+def test_read_ahead_is_bounded(tmp_path):
+    # Arrange
+    taken = []
+
+    def files():
+        for index in range(100):
+            file = tmp_path / f"module_{index}.py"
+            file.write_text("")
+            taken.append(file)
+            yield file
+
+    # Act
+    reads = FilePrefetcher(threads=2, ahead=5).read(files())
+    next(reads)
+    reads.close()
+
+    # Assert
+    assert len(taken) == 5
+
+
+def test_read_error_after_previous_files(tmp_path):
+    # Arrange
+    file = tmp_path / "main.py"
+    file.write_text("")
+    reads = FilePrefetcher(threads=2).read([file, tmp_path / "missing.py"])
+
+    # Act
+    first = next(reads)
+
+    # Assert
+    assert first == (file, b"")
+    with pytest.raises(FileNotFoundError):
+        next(reads)
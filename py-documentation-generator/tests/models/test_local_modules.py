@@ -0,0 +1,64 @@
+import ast
+import json
+from src.generators.documentation_generator import _serializable
+from src.models.local_modules import LocalModule
+
+SOURCE_CODE = '''
+class First:
+    def method(self):
+        pass
+
+
+def first():
+    def nested():
+        pass
+
+
+async def coroutine():
+    pass
+
+
+class Second:
+    pass
+'''
+
+
+def test_from_path_parses_once(tmp_path, monkeypatch, mocker):
+    # Arrange
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "package").mkdir()
+    file = tmp_path / "package" / "main.py"
+    file.write_text(SOURCE_CODE)
+    parse = mocker.spy(ast, "parse")
+
+    # Act
+    sut = LocalModule.from_path(file)
+
+    # Assert
+    assert parse.call_count == 1
+    assert sut.to_dict() == {
+        "_name": "main.py",
+        "_path": "package",
+        "_module": "package",
+        "_functions": ["first"],
+        "_classes": ["First", "Second"],
+    }
+
+
+def test_same_json_as_a_dict():
+    # Arrange
+    data = {"main.py": {"type": "module", "data": LocalModule("main.py", "src", "src", ["main"], [])}}
+
+    # Act
+    sut = json.dumps(data, indent=4, default=_serializable)
+
+    # Assert
+    assert json.loads(sut)["main.py"]["data"] == {
+        "_name": "main.py",
+        "_path": "src",
+        "_module": "src",
+        "_functions": ["main"],
+        "_classes": [],
+    }
+    assert LocalModule.from_dict(json.loads(sut)["main.py"]["data"]) == data["main.py"]["data"]
+    assert not hasattr(data["main.py"]["data"], "__dict__")
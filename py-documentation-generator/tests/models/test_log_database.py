@@ -0,0 +1,83 @@
+import sqlite3
+import pytest
+from src.models.log_database import LogDatabase
+
+
+def record(path, line, level, message, instance="logger"):
+    return {
+        "file": path.rsplit("/", 1)[-1],
+        "path": path,
+        "line": line,
+        "level": level,
+        "instance": instance,
+        "message": message,
+    }
+
+
+RECORDS = [
+    record("main.py", 3, "INFO", "Starting"),
+    record("payments/card.py", 12, "ERROR", "Unable to charge {card}"),
+    record("payments/card.py", 4, "INFO", "Charging {card}"),
+    record("payments/refund.py", 8, "ERROR", "Unable to refund"),
+    record("payments_old/card.py", 2, "ERROR", "Unable to charge"),
+]
+
+
+@pytest.fixture(name="database")
+def fixture_database(tmp_path):
+    database = LogDatabase(tmp_path / "LOGGED_MESSAGES.db")
+    database.write("logger", RECORDS)
+
+    return database
+
+
+@pytest.mark.parametrize(
+    "filters, expected",
+    [
+        ({}, [RECORDS[0], RECORDS[2], RECORDS[1], RECORDS[3], RECORDS[4]]),
+        ({"levels": ["ERROR"], "path": "payments/"}, [RECORDS[1], RECORDS[3]]),
+        ({"message": "Unable to charge*"}, [RECORDS[1], RECORDS[4]]),
+        ({"levels": ["INFO", "ERROR"], "limit": 2}, [RECORDS[0], RECORDS[2]]),
+        ({"instance_name": "log"}, []),
+    ],
+)
+def test_query(database, filters, expected):
+    # Act
+    sut = database.query(**filters)
+
+    # Assert
+    assert sut == expected
+
+
+def test_write_replaces_the_instance(database):
+    # Arrange
+    other = record("other.py", 1, "DEBUG", "Other", instance="log")
+    database.write("log", [other])
+
+    # Act
+    count = database.write("logger", RECORDS[:1])
+
+    # Assert
+    assert count == 1
+    assert database.query() == [RECORDS[0], other]
+    with sqlite3.connect(database.database_file) as connection:
+        assert connection.execute("SELECT path FROM files ORDER BY path").fetchall() == [("main.py",), ("other.py",)]
+
+
+def test_store_rolls_back_when_stopped(database):
+    # Act
+    records = database.store("logger", [record("new.py", 1, "INFO", "New")])
+    next(records)
+    records.close()
+
+    # Assert
+    assert len(database.query()) == len(RECORDS)
+
+
+def test_query_uses_the_indexes(database):
+    # Arrange
+    with sqlite3.connect(database.database_file) as connection:
+        indexes = {row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+
+    # Assert
+    assert {"calls_level", "calls_file", "calls_message"} <= indexes
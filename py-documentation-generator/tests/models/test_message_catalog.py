@@ -0,0 +1,39 @@
+import pytest
+from src.models.message_catalog import MessageCatalog, message_template
+
+
+@pytest.mark.parametrize(
+    "message, expected",
+    [
+        ("Unable to charge {card.number}", "Unable to charge {}"),
+        ("{count} of {total:{width}} files", "{} of {} files"),
+        ("Literal {{braces}} kept", "Literal {{braces}} kept"),
+        ("Value: %s value", "Value: %s value"),
+    ],
+)
+def test_message_template(message, expected):
+    assert message_template(message) == expected
+
+
+def test_catalog_groups_the_templates():
+    # Arrange
+    sut = MessageCatalog()
+
+    # Act
+    sut.add("Unable to charge {card}", "ERROR", "payments/card.py", 12)
+    sut.add("Starting", "INFO", "main.py", 3)
+    sut.add("Unable to charge {card.number}", "WARNING", "payments/card.py", 40)
+    sut.add("Unable to charge {card}", "ERROR", "payments/refund.py", 8)
+    sut.add("Unable to charge {card}", "ERROR", "payments/transfer.py", 20)
+
+    # Assert
+    assert sut.template_count == 2
+    assert list(sut.rows(["DEBUG", "INFO", "WARNING", "ERROR"], max_files=2)) == [
+        [
+            "`Unable to charge {}`",
+            "4",
+            "WARNING, ERROR",
+            "payments/card.py:12,40, payments/refund.py:8 and 1 more files",
+        ],
+        ["`Starting`", "1", "INFO", "main.py:3"],
+    ]
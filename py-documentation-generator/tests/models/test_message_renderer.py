@@ -0,0 +1,55 @@
+import ast
+import pytest
+from src.models.message_renderer import MessageRenderer
+
+
+@pytest.mark.parametrize(
+    ("arguments", "expected"),
+    [
+        ('"Starting"', "Starting"),
+        ("'Starting'", "Starting"),
+        ('f"Value: {value!r:>4}"', "Value: {value!r:>4}"),
+        ('"Value: %s", value', "Value: %s value"),
+        ('"Response has \\"Vary\\" header"', 'Response has \\"Vary\\" header'),
+        ("'It is \"quoted\"'", 'It is "quoted"'),
+        ('(\n    "Implicitly "  # comment with a \' quote\n    f"concatenated {value}"\n)', "Implicitly concatenated {value}"),
+        ('f"""Multi-line\n    {value}\n"""', "Multi-line {value}"),
+        ('"Found: %s" % ", ".join(names)', '"Found: %s" % ", ".join(names)'),
+        ("\"Version: %s\", content.get('version')", "Version: %s content.get('version')"),
+        ('"Items: %s", [\n    item,  # comment\n    "  spaced  "\n]', 'Items: %s [ item, "  spaced  " ]'),
+        ('"Café: %s", "crème"', "Café: %s crème"),
+    ],
+)
+def test_render(arguments, expected):
+    # Arrange
+    source_code = f"logger.info({arguments})\n"
+    node = ast.parse(source_code).body[0].value
+
+    # Act
+    sut = MessageRenderer(source_code).render(node.args)
+
+    # Assert
+    assert sut == expected
+
+
+def test_render_without_source_code():
+    # Arrange
+    node = ast.parse('logger.info(f"Value: {value}", other)').body[0].value
+
+    # Act
+    sut = MessageRenderer().render(node.args)
+
+    # Assert
+    assert sut == "Value: {value} other"
+
+
+def test_segment_non_ascii_offsets():
+    # Arrange
+    source_code = 'names = ["é", "ü"]; logger.info("Value: %s", names)\n'
+    node = ast.parse(source_code).body[1].value
+
+    # Act
+    sut = MessageRenderer(source_code).segment(node.args[1])
+
+    # Assert
+    assert sut == "names"
@@ -0,0 +1,193 @@
+import os
+from pathlib import Path
+import pytest
+from benchmarks.syscalls import count_syscalls
+from src.models.local_modules import LocalModule
+from src.models import MissingModuleFilesException
+from src.models.module_data_provider import ModuleDataProvider
+from src.models.module_manifest import ModuleManifest
+from src.models.package_selection import PackageSelection
+from src.models.tracer import tracer
+
+
+def make_package(path, *files):
+    path.mkdir()
+    for name in ("__init__.py",) + files:
+        (path / name).write_text("def main():\n    pass\n")
+
+
+def test_serialize_lists_each_directory_once(tmp_path, monkeypatch):
+    # Arrange
+    monkeypatch.chdir(tmp_path)
+    make_package(tmp_path / "src", "main.py")
+    make_package(tmp_path / "src" / "models", "user.py")
+    make_package(tmp_path / "src" / "commands", "run.py")
+    (tmp_path / "src" / "__pycache__").mkdir()
+
+    # Act
+    with count_syscalls() as counter:
+        sut = ModuleDataProvider().serialize(tmp_path / "src")
+
+    # Assert
+    assert counter["os.scandir"] == 3
+    assert list(sut["src"]["data"]) == ["__init__.py", "commands", "main.py", "models"]
+    assert list(sut["src"]["data"]["models"]["data"]) == ["__init__.py", "user.py"]
+
+
+def test_serialize_checks_the_packages(tmp_path, monkeypatch):
+    # Arrange
+    monkeypatch.chdir(tmp_path)
+    make_package(tmp_path / "src", "main.py")
+    (tmp_path / "src" / "scripts").mkdir()
+    (tmp_path / "src" / "scripts" / "run.py").write_text("")
+
+    # Act
+    with pytest.raises(MissingModuleFilesException) as exc_info:
+        ModuleDataProvider().serialize(tmp_path / "src")
+
+    # Assert
+    assert "No __init__.py found" in str(exc_info.value)
+
+
+def test_serialize_jobs_same_as_serial(tmp_path, monkeypatch):
+    # Arrange
+    monkeypatch.chdir(tmp_path)
+    make_package(tmp_path / "src", "main.py", "user.py")
+    make_package(tmp_path / "src" / "models", "user.py", "account.py")
+    tracer.reset(enabled=True)
+
+    # Act
+    serial = ModuleDataProvider().serialize(tmp_path / "src")
+    tracer.reset(enabled=True)
+    sut = ModuleDataProvider().serialize(tmp_path / "src", jobs=2)
+    events = tracer.events
+    tracer.reset()
+
+    # Assert
+    assert sut == serial
+    assert list(sut["src"]["data"]["models"]["data"]) == ["__init__.py", "account.py", "user.py"]
+    modules = {event["args"]["file"] for event in events if event["name"] == "module"}
+    assert len(modules) == 6
+
+
+def test_serialize_manifest_analyses_changed_modules(tmp_path, monkeypatch, mocker):
+    # Arrange
+    monkeypatch.chdir(tmp_path)
+    make_package(tmp_path / "src", "main.py", "touched.py", "user.py")
+    manifest = ModuleManifest(tmp_path / "manifest.json")
+    ModuleDataProvider().serialize(tmp_path / "src", manifest=manifest)
+    manifest.save()
+    expected = ModuleDataProvider().serialize(tmp_path / "src")
+    os.utime(tmp_path / "src" / "touched.py", ns=(0, 0))
+    (tmp_path / "src" / "user.py").write_text("class User:\n    pass\n")
+    expected["src"]["data"]["user.py"]["data"] = LocalModule("user.py", "src", "src", [], ["User"])
+    from_path = mocker.spy(LocalModule, "from_path")
+    manifest = ModuleManifest(tmp_path / "manifest.json")
+
+    # Act
+    sut = ModuleDataProvider().serialize(tmp_path / "src", manifest=manifest)
+
+    # Assert
+    assert sut == expected
+    assert [call.args[0].name for call in from_path.call_args_list] == ["user.py"]
+    assert manifest.hits == 3
+    assert manifest.diff()["changed"] == [
+        {
+            "module": "src/user.py",
+            "_functions": {"added": [], "removed": ["main"]},
+            "_classes": {"added": ["User"], "removed": []},
+        }
+    ]
+
+
+def test_serialize_manifest_jobs_hash_in_the_workers(tmp_path, monkeypatch, mocker):
+    # Arrange
+    monkeypatch.chdir(tmp_path)
+    make_package(tmp_path / "src", "main.py", "touched.py", "user.py")
+    manifest = ModuleManifest(tmp_path / "manifest.json")
+    ModuleDataProvider().serialize(tmp_path / "src", manifest=manifest)
+    manifest.save()
+    os.utime(tmp_path / "src" / "touched.py", ns=(0, 0))
+    (tmp_path / "src" / "user.py").write_text("class User:\n    pass\n")
+    expected = ModuleDataProvider().serialize(tmp_path / "src")
+    read_bytes = mocker.spy(Path, "read_bytes")
+    manifest = ModuleManifest(tmp_path / "manifest.json")
+
+    # Act
+    sut = ModuleDataProvider().serialize(tmp_path / "src", jobs=2, manifest=manifest)
+
+    # Assert
+    assert sut == expected
+    # the touched modules are read by the workers only
+    assert read_bytes.call_count == 0
+    assert manifest.hits == 3
+    assert [change["module"] for change in manifest.diff()["changed"]] == ["src/user.py"]
+
+
+def test_iter_serialize_same_as_serialize(tmp_path, monkeypatch):
+    # Arrange
+    monkeypatch.chdir(tmp_path)
+    make_package(tmp_path / "src", "main.py")
+    make_package(tmp_path / "src" / "models", "user.py")
+    make_package(tmp_path / "src" / "models" / "payments", "card.py")
+
+    def materialize(nodes):
+        return {
+            name: {**node, "data": materialize(node["data"])} if node["type"] == "package" else node
+            for name, node in nodes
+        }
+
+    # Act
+    sut = ModuleDataProvider().iter_serialize(tmp_path / "src")
+
+    # Assert
+    assert materialize(sut.items()) == ModuleDataProvider().serialize(tmp_path / "src")
+
+
+def test_serialize_prunes_the_walk(tmp_path, monkeypatch):
+    # Arrange
+    monkeypatch.chdir(tmp_path)
+    make_package(tmp_path / "src", "main.py")
+    make_package(tmp_path / "src" / "models", "user.py")
+    make_package(tmp_path / "src" / "models" / "payments", "card.py")
+    make_package(tmp_path / "src" / "models" / "payments" / "providers", "stripe.py")
+    make_package(tmp_path / "src" / "commands", "run.py")
+    # not a package, it would fail the walk if it was listed
+    (tmp_path / "src" / "models" / "scripts").mkdir()
+    selection = PackageSelection(include=["models.payments", "models.scripts"], exclude=["*.scripts"], max_depth=2)
+
+    # Act
+    with count_syscalls() as counter:
+        sut = ModuleDataProvider().serialize(tmp_path / "src", selection=selection)
+
+    # Assert
+    assert counter["os.scandir"] == 3
+    assert list(sut["src"]["data"]) == ["models"]
+    assert list(sut["src"]["data"]["models"]["data"]) == ["payments"]
+    assert list(sut["src"]["data"]["models"]["data"]["payments"]["data"]) == ["__init__.py", "card.py"]
+
+
+def test_serialize_manifest_keeps_the_unselected_packages(tmp_path, monkeypatch):
+    # Arrange
+    monkeypatch.chdir(tmp_path)
+    make_package(tmp_path / "src", "main.py")
+    make_package(tmp_path / "src" / "models", "user.py")
+    make_package(tmp_path / "src" / "commands", "run.py")
+    manifest = ModuleManifest(tmp_path / "manifest.json")
+    ModuleDataProvider().serialize(tmp_path / "src", manifest=manifest)
+    manifest.save()
+    (tmp_path / "src" / "models" / "account.py").write_text("class Account:\n    pass\n")
+    (tmp_path / "src" / "commands" / "run.py").unlink()
+    manifest = ModuleManifest(tmp_path / "manifest.json")
+
+    # Act
+    ModuleDataProvider().serialize(tmp_path / "src", manifest=manifest, selection=PackageSelection(include=["models"]))
+    diff = manifest.diff()
+    manifest.save()
+    sut = ModuleManifest(tmp_path / "manifest.json")
+    ModuleDataProvider().serialize(tmp_path / "src", manifest=sut)
+
+    # Assert
+    assert diff == {"added": ["src/models/account.py"], "removed": [], "changed": []}
+    assert sut.diff() == {"added": [], "removed": ["src/commands/run.py"], "changed": []}
+    assert sut.hits == 6
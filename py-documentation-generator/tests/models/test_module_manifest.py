@@ -0,0 +1,91 @@
+import os
+from src.models.local_modules import LocalModule
+from src.models.module_manifest import ModuleManifest
+
+
+def test_get_unchanged_modules(tmp_path):
+    # Arrange
+    file = tmp_path / "main.py"
+    file.write_text("def main():\n    pass\n")
+    module = LocalModule("main.py", ".", "src", ["main"], [])
+    manifest = ModuleManifest(tmp_path / "MODULES.manifest.json")
+    manifest.put("main.py", file.stat(), "hash", module)
+    manifest.save()
+
+    # Act
+    sut = ModuleManifest(tmp_path / "MODULES.manifest.json")
+    unchanged = sut.get("main.py", file.stat())
+    os.utime(file, ns=(0, 0))
+    touched = sut.get("main.py", file.stat())
+
+    # Assert
+    assert unchanged == module
+    assert touched is None
+    assert sut.get_hash("main.py") == "hash"
+    assert sut.refresh("main.py", file.stat()) == module
+    assert sut.hits == 2
+
+
+def test_diff(tmp_path):
+    # Arrange
+    file = tmp_path / "main.py"
+    file.write_text("")
+    manifest = ModuleManifest(tmp_path / "MODULES.manifest.json")
+    manifest.put("src/main.py", file.stat(), "1", LocalModule("main.py", "src", "src", ["main", "run"], ["App"]))
+    manifest.put("src/removed.py", file.stat(), "1", LocalModule("removed.py", "src", "src", [], []))
+    manifest.put("src/same.py", file.stat(), "1", LocalModule("same.py", "src", "src", [], []))
+    manifest.save()
+    sut = ModuleManifest(tmp_path / "MODULES.manifest.json")
+
+    # Act
+    sut.put("src/main.py", file.stat(), "2", LocalModule("main.py", "src", "src", ["main", "stop"], ["App"]))
+    sut.put("src/added.py", file.stat(), "1", LocalModule("added.py", "src", "src", [], []))
+    sut.get("src/same.py", file.stat())
+
+    # Assert
+    assert sut.diff() == {
+        "added": ["src/added.py"],
+        "removed": ["src/removed.py"],
+        "changed": [
+            {
+                "module": "src/main.py",
+                "_functions": {"added": ["stop"], "removed": ["run"]},
+                "_classes": {"added": [], "removed": []},
+            }
+        ],
+    }
+
+
+def test_ignore_other_version(tmp_path):
+    # Arrange
+    file = tmp_path / "main.py"
+    file.write_text("")
+    manifest = ModuleManifest(tmp_path / "MODULES.manifest.json", version=1)
+    manifest.put("main.py", file.stat(), "hash", LocalModule("main.py", ".", "src", [], []))
+    manifest.save()
+
+    # Act
+    sut = ModuleManifest(tmp_path / "MODULES.manifest.json", version=2)
+
+    # Assert
+    assert sut.get("main.py", file.stat()) is None
+    assert sut.diff()["removed"] == []
+
+
+def test_carry_over(tmp_path):
+    # Arrange
+    file = tmp_path / "main.py"
+    file.write_text("")
+    manifest = ModuleManifest(tmp_path / "MODULES.manifest.json")
+    manifest.put("src/main.py", file.stat(), "1", LocalModule("main.py", "src", "src", [], []))
+    manifest.put("src/models/user.py", file.stat(), "1", LocalModule("user.py", "src/models", "models", [], []))
+    manifest.save()
+    sut = ModuleManifest(tmp_path / "MODULES.manifest.json")
+
+    # Act
+    sut.carry_over(lambda key: key.startswith("src/models/"))
+    sut.save()
+
+    # Assert
+    assert sut.diff() == {"added": [], "removed": ["src/main.py"], "changed": []}
+    assert ModuleManifest(tmp_path / "MODULES.manifest.json").get_hash("src/models/user.py") == "1"
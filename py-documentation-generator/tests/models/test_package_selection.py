@@ -0,0 +1,41 @@
+import pytest
+from src.models.package_selection import PackageSelection
+
+
+@pytest.mark.parametrize(
+    ("package", "walks", "selects"),
+    [
+        ((), True, False),
+        (("models",), True, True),
+        (("models", "payments"), True, True),
+        (("models", "legacy"), False, False),
+        (("models", "payments", "cards", "visa"), False, False),
+        (("commands",), False, False),
+    ],
+)
+def test_include_exclude_max_depth(package, walks, selects):
+    # Arrange
+    sut = PackageSelection(include=["models"], exclude=["models.legacy"], max_depth=3)
+
+    # Act / Assert
+    assert sut.walks(package) == walks
+    assert sut.selects(package) == selects
+
+
+@pytest.mark.parametrize(
+    ("package", "walks", "selects"),
+    [
+        (("models",), True, False),
+        (("models", "payments"), True, True),
+        (("models", "payments", "cards"), True, True),
+        (("models", "users"), False, False),
+        (("payments",), True, False),
+    ],
+)
+def test_glob_does_not_cross_dots(package, walks, selects):
+    # Arrange
+    sut = PackageSelection(include=["*.payments"])
+
+    # Act / Assert
+    assert sut.walks(package) == walks
+    assert sut.selects(package) == selects
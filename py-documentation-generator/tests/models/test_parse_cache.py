@@ -0,0 +1,69 @@
+from src.models.parse_cache import ParseCache
+
+
+def test_get_unchanged_file(tmp_path):
+    # Arrange
+    source_file = tmp_path / "main.py"
+    source_file.write_text("logger.info('Starting')\n")
+    cache = ParseCache(tmp_path / "cache.json")
+    cache.put("logger", source_file, source_file.stat(), "hash", {"INFO": {1: "Starting"}})
+    cache.save()
+
+    # Act
+    sut = ParseCache(tmp_path / "cache.json").get("logger", source_file, source_file.stat())
+
+    # Assert
+    assert sut == {"INFO": {1: "Starting"}}
+
+
+def test_get_modified_file(tmp_path):
+    # Arrange
+    source_file = tmp_path / "main.py"
+    source_file.write_text("logger.info('Starting')\n")
+    cache = ParseCache(tmp_path / "cache.json")
+    cache.put("logger", source_file, source_file.stat(), "hash", {"INFO": {1: "Starting"}})
+
+    # Act
+    source_file.write_text("logger.info('Starting again')\n")
+    sut = cache.get("logger", source_file, source_file.stat())
+
+    # Assert
+    assert sut is None
+    assert cache.get_hash("logger", source_file) == "hash"
+    assert cache.get_hash("log", source_file) is None
+
+
+def test_version_mismatch(tmp_path):
+    # Arrange
+    source_file = tmp_path / "main.py"
+    source_file.write_text("logger.info('Starting')\n")
+    cache = ParseCache(tmp_path / "cache.json", version=1)
+    cache.put("logger", source_file, source_file.stat(), "hash", {"INFO": {1: "Starting"}})
+    cache.save()
+
+    # Act
+    sut = ParseCache(tmp_path / "cache.json", version=2).get("logger", source_file, source_file.stat())
+
+    # Assert
+    assert sut is None
+
+
+def test_lru_eviction(tmp_path):
+    # Arrange
+    files = []
+    for index in range(3):
+        source_file = tmp_path / f"module_{index}.py"
+        source_file.write_text("")
+        files.append(source_file)
+    cache = ParseCache(tmp_path / "cache.json", max_entries=2)
+
+    # Act
+    cache.put("logger", files[0], files[0].stat(), "hash", {})
+    cache.put("logger", files[1], files[1].stat(), "hash", {})
+    cache.get("logger", files[0], files[0].stat())
+    cache.put("logger", files[2], files[2].stat(), "hash", {})
+
+    # Assert
+    assert cache.get_hash("logger", files[0]) == "hash"
+    assert cache.get_hash("logger", files[1]) is None
+    assert cache.get_hash("logger", files[2]) == "hash"
@@ -0,0 +1,25 @@
+from src.models.source_changes import SourceChanges
+
+
+def test_from_git(faker, tmp_path):
+    # Arrange
+    repo = faker.repository(dir_path=tmp_path)
+    source_dir = tmp_path / "src"
+    source_dir.mkdir()
+    for name in ["modified.py", "renamed.py", "deleted.py", "unchanged.py", "notes.txt"]:
+        (source_dir / name).write_text(f"# {name}\\n")
+    repo.git.add(str(source_dir))
+    repo.git.commit("-m", "add sources", author="test-bot <test-bot@example.com>")
+
+    # Act
+    (source_dir / "modified.py").write_text("# modified\n")
+    repo.git.mv(str(source_dir / "renamed.py"), str(source_dir / "moved.py"))
+    repo.git.rm(str(source_dir / "deleted.py"))
+    (source_dir / "untracked.py").write_text("# untracked\n")
+    (source_dir / "notes.txt").write_text("modified\n")
+    sut = SourceChanges.from_git(source_dir, "HEAD")
+
+    # Assert
+    source_dir = source_dir.resolve()
+    assert sut.modified == [source_dir / "modified.py", source_dir / "moved.py", source_dir / "untracked.py"]
+    assert sut.deleted == [source_dir / "deleted.py", source_dir / "renamed.py"]
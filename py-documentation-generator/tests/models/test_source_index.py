@@ -0,0 +1,100 @@
+import ast
+import hashlib
+import pytest
+from src.models.source_index import SourceIndex
+
+
+def test_get_parses_once(tmp_path, mocker):
+    # Arrange
+    file = tmp_path / "main.py"
+    file.write_text("def main():\n    pass\n")
+    parse = mocker.spy(ast, "parse")
+    sut = SourceIndex()
+
+    # Act
+    first = sut.get(file)
+    second = sut.get(tmp_path / "." / "main.py")
+
+    # Assert
+    assert first is second
+    assert parse.call_count == 1
+    assert sut.file_count == 1
+    assert first.source_code == "def main():\n    pass\n"
+    assert first.content_hash == hashlib.sha256(file.read_bytes()).hexdigest()
+    assert [node.name for node in first.tree.body] == ["main"]
+
+
+def test_get_raises_the_same_error(tmp_path, mocker):
+    # Arrange
+    file = tmp_path / "broken.py"
+    file.write_text("def broken(:\n")
+    parse = mocker.spy(ast, "parse")
+    sut = SourceIndex()
+
+    # Act
+    with pytest.raises(SyntaxError):
+        sut.get(file)
+    with pytest.raises(SyntaxError):
+        sut.get(file)
+
+    # Assert
+    assert parse.call_count == 1
+
+
+def test_get_resolves_symbolic_links(tmp_path):
+    # Arrange
+    (tmp_path / "package").mkdir()
+    file = tmp_path / "package" / "main.py"
+    file.write_text("")
+    (tmp_path / "link").symlink_to(tmp_path / "package")
+    (tmp_path / "package" / "alias.py").symlink_to(file)
+    sut = SourceIndex()
+
+    # Act
+    first = sut.get(file)
+    second = sut.get(tmp_path / "link" / "main.py")
+    third = sut.get(tmp_path / "package" / "alias.py")
+
+    # Assert
+    assert first is second is third
+    assert sut.file_count == 1
+
+
+def test_read_does_not_parse(tmp_path, mocker):
+    # Arrange
+    file = tmp_path / "main.py"
+    file.write_text("def main():\n    pass\n")
+    parse = mocker.spy(ast, "parse")
+    read_bytes = mocker.spy(type(file), "read_bytes")
+    sut = SourceIndex()
+
+    # Act
+    content, content_hash = sut.read(file)
+    source = sut.get(file)
+
+    # Assert
+    assert content == source.content
+    assert content_hash == source.content_hash
+    assert parse.call_count == 1
+    assert read_bytes.call_count == 1
+    assert sut.file_count == 1
+
+
+def test_release_drops_the_file_once_all_consumers_are_done(tmp_path, mocker):
+    # Arrange
+    file = tmp_path / "main.py"
+    file.write_text("def main():\n    pass\n")
+    parse = mocker.spy(ast, "parse")
+    sut = SourceIndex(consumers=2)
+
+    # Act
+    first = sut.get(file)
+    sut.release(file)
+    second = sut.get(file)
+    sut.release(file)
+    third = sut.get(file)
+
+    # Assert
+    assert first is second
+    assert third is not first
+    assert parse.call_count == 2
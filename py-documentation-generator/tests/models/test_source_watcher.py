@@ -0,0 +1,58 @@
+import os
+from src.models.source_watcher import SourceWatcher
+
+
+def touch(file, content):
+    file.write_text(content)
+    # the modification time may not change within the resolution of the file system
+    stat = file.stat()
+    os.utime(file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_poll(tmp_path):
+    # Arrange
+    (tmp_path / "kept.py").write_text("a = 1")
+    (tmp_path / "modified.py").write_text("a = 1")
+    (tmp_path / "deleted.py").write_text("a = 1")
+    (tmp_path / "notes.txt").write_text("ignored")
+    sut = SourceWatcher(tmp_path)
+
+    touch(tmp_path / "modified.py", "a = 2")
+    (tmp_path / "deleted.py").unlink()
+    (tmp_path / "package").mkdir()
+    (tmp_path / "package" / "added.py").write_text("a = 1")
+    touch(tmp_path / "notes.txt", "still ignored")
+
+    # Act
+    changes = sut.poll()
+
+    # Assert
+    assert changes.modified == [tmp_path / "modified.py", tmp_path / "package" / "added.py"]
+    assert changes.deleted == [tmp_path / "deleted.py"]
+    assert not sut.poll().modified
+
+
+def test_wait_debounces_changes(tmp_path, mocker):
+    # Arrange
+    (tmp_path / "first.py").write_text("a = 1")
+    (tmp_path / "second.py").write_text("a = 1")
+    sut = SourceWatcher(tmp_path, interval=1, debounce=0.5)
+    # each sleep is a poll interval with the changes made meanwhile
+    burst = iter(
+        [
+            lambda: None,
+            lambda: touch(tmp_path / "first.py", "a = 2"),
+            lambda: (tmp_path / "second.py").unlink(),
+            lambda: (tmp_path / "second.py").write_text("a = 3"),
+            lambda: None,
+        ]
+    )
+    sleep = mocker.patch("src.models.source_watcher.time.sleep", side_effect=lambda delay: next(burst)())
+
+    # Act
+    changes = sut.wait()
+
+    # Assert
+    assert changes.modified == [tmp_path / "first.py", tmp_path / "second.py"]
+    assert changes.deleted == []
+    assert [call.args[0] for call in sleep.call_args_list] == [1, 1, 0.5, 0.5, 0.5]
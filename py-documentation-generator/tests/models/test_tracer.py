@@ -0,0 +1,60 @@
+import json
+from src.models.tracer import Tracer
+
+
+def test_disabled_tracer_records_nothing():
+    # Arrange
+    tracer = Tracer()
+
+    # Act
+    with tracer.span("walk"):
+        with tracer.span("parse", "file", file="main.py"):
+            pass
+
+    # Assert
+    assert tracer.events == []
+
+
+def test_span_events(tmp_path):
+    # Arrange
+    tracer = Tracer(enabled=True)
+
+    # Act
+    with tracer.span("walk"):
+        with tracer.span("parse", "file", file="main.py"):
+            pass
+    tracer.save(tmp_path / "trace.json")
+
+    # Assert
+    parse, walk = tracer.events
+    assert walk["name"] == "walk" and walk["cat"] == "phase" and walk["ph"] == "X"
+    assert parse["args"] == {"file": "main.py"}
+    assert walk["ts"] <= parse["ts"]
+    assert parse["ts"] + parse["dur"] <= walk["ts"] + walk["dur"]
+    assert json.loads((tmp_path / "trace.json").read_text())["traceEvents"] == tracer.events
+
+
+def test_summary():
+    # Arrange
+    tracer = Tracer(enabled=True)
+    tracer.extend(
+        [
+            {"name": "parse", "cat": "file", "ts": 0, "dur": 3000, "args": {"file": "a.py"}},
+            {"name": "parse", "cat": "file", "ts": 0, "dur": 1000, "args": {"file": "b.py"}},
+            {"name": "read", "cat": "file", "ts": 0, "dur": 2500, "args": {"file": "b.py"}},
+            {"name": "walk", "cat": "phase", "ts": 0, "dur": 500, "args": {}},
+        ]
+    )
+
+    # Act
+    summary = tracer.summary(top=1)
+
+    # Assert
+    assert tracer.totals() == {
+        "parse": {"calls": 2, "duration": 4000},
+        "read": {"calls": 1, "duration": 2500},
+        "walk": {"calls": 1, "duration": 500},
+    }
+    assert tracer.slowest(top=1) == [("file", "b.py", 3500)]
+    assert summary.splitlines()[2] == "| parse   |       2 |          4   |"
+    assert "| file   | b.py   |          3.5 |" in summary
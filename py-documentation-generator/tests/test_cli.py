@@ -0,0 +1,60 @@
+import importlib
+import subprocess
+import sys
+from pathlib import Path
+from click.testing import CliRunner
+import pytest
+from src.cli import COMMANDS, main
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+
+@pytest.mark.parametrize("name", sorted(COMMANDS))
+def test_short_help_matches_command(name):
+    # Arrange
+    module_name, function_name = COMMANDS[name][0].split(":")
+    command = getattr(importlib.import_module(module_name), function_name)
+
+    # Act
+    short_help = command.get_short_help_str(limit=1000)
+
+    # Assert
+    assert command.name == name
+    assert short_help == COMMANDS[name][1]
+
+
+def test_help_does_not_import_commands():
+    # Arrange
+    script = (
+        "import sys\n"
+        "from src.cli import main\n"
+        "main(['--help'], standalone_mode=False)\n"
+        "print(sorted(name for name in sys.modules if name.startswith(('src.commands', 'pandas', 'git'))))\n"
+    )
+
+    # Act
+    result = subprocess.run(
+        [sys.executable, "-W", "error", "-c", script], cwd=ROOT_DIR, capture_output=True, text=True, check=True
+    )
+
+    # Assert
+    assert "generate-logged-messages-listing" in result.stdout
+    assert result.stdout.splitlines()[-1] == "[]"
+
+
+def test_command_imported_on_use():
+    # Act
+    result = CliRunner().invoke(main, ["generate-mailmap", "--help"])
+
+    # Assert
+    assert result.exit_code == 0
+    assert "--exclude" in result.output
+
+
+def test_short_help_truncated():
+    # Act
+    result = CliRunner().invoke(main, ["--help"], terminal_width=60)
+
+    # Assert
+    assert result.exit_code == 0
+    assert "  query                           Print the log...\n" in result.output